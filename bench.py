@@ -0,0 +1,321 @@
+"""
+문제 생성/채점/렌더링 벤치마크.
+
+합성 코퍼스(1k~100k 구절)와 짧은~아주 긴 구절로
+norm_token, mask_len_keep_punct, create_problem(모드1~4), submit, 채점 단계별 비용, 빈칸 채우기(렌더링),
+코퍼스 컴파일/열기를 재고 처리량, p50/p99 지연, 최대 메모리를 보고한다.
+
+    python bench.py                      # 실행 + bench_baseline.json 과 비교
+    python bench.py --save-baseline      # 기준선 저장
+    python bench.py --quick --check      # 빠르게, 기준선보다 느려지면 종료 코드 1
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from corpus import compile_verse, norm_token, mask_len_keep_punct
+from corpus_cache import open_corpus
+from grading import EXACT, LOOSE, FUZZY, Grader, answer_key
+from instrument import Instrument
+from quiz_engine import QuizEngine, create_problem
+from verse_index import VerseIndex
+from verse_stats import VerseStats
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+BOOKS = ["창", "출", "요", "롬", "히", "요일", "계", "딤후", "벧전", "사"]
+PASSAGE_WORDS = {"short": 8, "medium": 30, "long": 120, "very_long": 500}
+
+
+# ---- 합성 데이터 ----
+def synth_word(rng):
+    """한글 1~5글자 + 가끔 문장부호."""
+    w = "".join(chr(0xAC00 + rng.randrange(11172)) for _ in range(rng.randint(1, 5)))
+    r = rng.random()
+    if r < 0.08:
+        w += ","
+    elif r < 0.1:
+        w += "-" + chr(0xAC00 + rng.randrange(11172))
+    return w
+
+def synth_line(rng, n_words, i=0):
+    chap = 1 + i // 30
+    verse = 1 + i % 30
+    ref = f"({rng.choice(BOOKS)} {chap}:{verse}-{verse + 1})" if rng.random() < 0.3 else f"({rng.choice(BOOKS)} {chap}:{verse})"
+    return ref + "^" + " ".join(synth_word(rng) for _ in range(n_words))
+
+def synth_lines(n, seed=0, min_words=8, max_words=40):
+    rng = random.Random(seed)
+    return [synth_line(rng, rng.randint(min_words, max_words), i) for i in range(n)]
+
+
+# ---- 측정 ----
+def percentile(sorted_vals, q):
+    if not sorted_vals:
+        return 0.0
+    k = min(len(sorted_vals) - 1, max(0, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[k]
+
+def measure(fn, n, inner=1):
+    """
+    fn() 을 n 번 불러 호출당 지연(inner 번 묶음이면 나눠서)과 처리량을 잰다.
+    메모리는 따로 tracemalloc 으로 한 번 더 돌려서 잰다(시간 측정에 영향이 없도록).
+    """
+    gc.collect()
+    lat = []
+    t_all = time.perf_counter()
+    for _ in range(n):
+        t0 = time.perf_counter_ns()
+        fn()
+        lat.append((time.perf_counter_ns() - t0) / inner)
+    elapsed = time.perf_counter() - t_all
+    lat.sort()
+
+    tracemalloc.start()
+    for _ in range(max(1, n // 10)):
+        fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": round(n * inner / elapsed, 1) if elapsed else 0.0,
+        "p50_us": round(percentile(lat, 0.50) / 1000, 3),
+        "p99_us": round(percentile(lat, 0.99) / 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+# ---- 벤치마크들 ----
+def bench_tokens(results, quick):
+    rng = random.Random(1)
+    words = [synth_word(rng) for _ in range(1000)]
+    n = 50 if quick else 500
+    results["norm_token"] = measure(lambda: [norm_token(w) for w in words], n, inner=len(words))
+    results["mask_len_keep_punct"] = measure(lambda: [mask_len_keep_punct(w) for w in words], n, inner=len(words))
+
+def bench_generation(results, sizes, quick):
+    n = 500 if quick else 5000
+    for size in sizes:
+        verses = [compile_verse(line) for line in synth_lines(size, seed=size)]
+        rng = random.Random(2)
+        for mode in (1, 2, 3, 4):
+            results[f"create_problem/m{mode}/{size}"] = measure(
+                lambda: create_problem(verses[rng.randrange(size)], mode, 5, 2, rng), n)
+    for name, words in PASSAGE_WORDS.items():
+        v = compile_verse(synth_line(random.Random(3), words))
+        rng = random.Random(4)
+        for mode in (1, 2, 3, 4):
+            results[f"create_problem/m{mode}/{name}"] = measure(
+                lambda: create_problem(v, mode, 5, 2, rng), max(50, n // 5))
+        # 모드1 적응형: 통계가 쌓인 구절에서 가중 추첨으로 빈칸 고르기
+        stats = VerseStats()
+        for i in v.maskable:
+            stats.record(v, i, 'wrong' if i % 3 == 0 else 'correct', 1000.0 + i)
+        results[f"create_problem/m1-adaptive/{name}"] = measure(
+            lambda: create_problem(v, 1, 5, 2, rng, stats), max(50, n // 5))
+
+def bench_submit(results, quick):
+    """정답만 내면서 구절을 끝까지 채우는 submit 호출당 비용 (구절 길이별)."""
+    n = 200 if quick else 2000
+    for name, words in PASSAGE_WORDS.items():
+        lines = [synth_line(random.Random(i), words, i) for i in range(20)]
+        for mode in (1, 2):
+            engine = QuizEngine(mode=mode, seed=5)
+            engine.load(lines)
+            engine.next_problem()
+
+            def step():
+                if engine.left_verse == 0:
+                    engine.load(lines)
+                    engine.next_problem()
+                engine.submit(engine.current_answers[0] if engine.current_answers else "")
+            results[f"submit/m{mode}/{name}"] = measure(step, n)
+
+        # 구절 전체를 한 번에 붙여넣어 제출 (submit_many), 문제 하나당
+        engine = QuizEngine(mode=2, seed=5)
+        engine.load(lines)
+
+        def paste():
+            if engine.left_verse == 0:
+                engine.load(lines)
+            engine.next_problem()
+            engine.submit_many(" ".join(engine.current_answers))
+        results[f"submit_many/m2/{name}"] = measure(paste, max(20, n // 10))
+
+def bench_grading(results, quick):
+    """채점 단계별 오답(한 글자 틀림) 판정 비용. 오답은 모든 단계를 다 거친다."""
+    rng = random.Random(8)
+    keys = [answer_key(synth_word(rng)) for _ in range(1000)]
+    typos = [k.loose[:-1] + "가" for k in keys]
+    n = 50 if quick else 500
+    for name, level in (("exact", EXACT), ("loose", LOOSE), ("fuzzy", FUZZY)):
+        g = Grader(level)
+        results[f"grade/{name}"] = measure(
+            lambda: [g.match(t, k) for t, k in zip(typos, keys)], n, inner=len(keys))
+
+def bench_instrument(results, quick):
+    """계측 데코레이터가 붙은 빈 함수 호출 비용 (꺼짐 / 히스토그램 / 히스토그램 + 트레이스)."""
+    n = 2000 if quick else 20000
+    inner = 100
+    for name, probe in (("off", Instrument()), ("on", Instrument(True)), ("trace", Instrument(True, trace=True))):
+        noop = probe.timed("noop")(lambda: None)
+
+        def calls():
+            for _ in range(inner):
+                noop()
+        results[f"instrument/{name}"] = measure(calls, n // inner * 10, inner=inner)
+
+def bench_render(results, quick):
+    """
+    답 하나를 화면에 반영하는 비용: 엔진 쪽 빈칸 채우기(Problem.fill),
+    디스플레이가 있으면 Tk Text 위젯의 구간 교체까지.
+    """
+    n = 200 if quick else 2000
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        box = tk.Text(root)
+    except Exception:
+        root = box = None
+
+    for name, words in PASSAGE_WORDS.items():
+        v = compile_verse(synth_line(random.Random(6), words))
+        state = {}
+
+        def new_problem():
+            state["p"] = create_problem(v, 2, rng=random.Random(7))
+            state["i"] = 0
+            if box is not None:
+                box.delete("1.0", "end")
+                box.insert("end", state["p"].text)
+
+        new_problem()
+
+        def step():
+            p = state["p"]
+            if state["i"] >= len(p.answers):
+                new_problem()
+                p = state["p"]
+            ans = p.answers[state["i"]]
+            index, blank_len = p.fill(ans)
+            state["i"] += 1
+            if box is not None:
+                box.delete(f"1.{index}", f"1.{index + blank_len}")
+                box.insert(f"1.{index}", ans, "correct")
+        key = "render/tk" if box is not None else "render/engine"
+        results[f"{key}/{name}"] = measure(step, n)
+
+    if root is not None:
+        root.destroy()
+
+def bench_corpus(results, sizes):
+    """txt -> .bvc 컴파일, 그리고 캐시가 있을 때 여는 시간 (시작 시간)."""
+    with tempfile.TemporaryDirectory() as d:
+        for size in sizes:
+            src = os.path.join(d, f"bench{size}.txt")
+            with open(src, "w", encoding="utf-8") as f:
+                f.write("\n".join(synth_lines(size, seed=size)) + "\n")
+            t0 = time.perf_counter()
+            open_corpus(src)
+            compile_s = time.perf_counter() - t0
+            results[f"corpus/compile/{size}"] = {"seconds": round(compile_s, 4)}
+            results[f"corpus/open/{size}"] = measure(lambda: open_corpus(src), 20)
+
+            # 검색 색인 만들기, 그리고 단어 두 개(접두어) / 장절 + 단어 검색
+            corpus = open_corpus(src)
+            t0 = time.perf_counter()
+            index = VerseIndex(corpus)
+            results[f"search/index/{size}"] = {"seconds": round(time.perf_counter() - t0, 4)}
+            rng = random.Random(size)
+
+            def query():
+                words = corpus[rng.randrange(size)].words
+                return index.search(f"{words[0][:2]} {words[1][:1]}")
+            results[f"search/words/{size}"] = measure(query, 200)
+            results[f"search/reference/{size}"] = measure(lambda: index.search(f"{BOOKS[0]} 3:* {chr(0xAC00)}"), 200)
+
+
+# ---- 기준선 비교 ----
+def compare(results, baseline, threshold):
+    """p50 이 기준선보다 threshold 넘게 느려진 항목 목록."""
+    regressions = []
+    for name, cur in sorted(results.items()):
+        base = baseline.get(name)
+        if not base or "p50_us" not in cur or not base.get("p50_us"):
+            continue
+        ratio = cur["p50_us"] / base["p50_us"]
+        mark = "  <-- 느려짐" if ratio > 1 + threshold else ""
+        print(f"  {name:40s} p50 {base['p50_us']:>10.3f} -> {cur['p50_us']:>10.3f} us  x{ratio:.2f}{mark}")
+        if mark:
+            regressions.append(name)
+    return regressions
+
+def print_results(results):
+    for name, r in sorted(results.items()):
+        if "p50_us" in r:
+            print(f"  {name:40s} {r['ops_per_sec']:>12.1f}/s  p50 {r['p50_us']:>10.3f} us"
+                  f"  p99 {r['p99_us']:>10.3f} us  peak {r['peak_kb']:>9.1f} KB")
+        else:
+            print(f"  {name:40s} {r['seconds']:.4f} s")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="암송 엔진 벤치마크")
+    ap.add_argument("--sizes", default="1000,10000,100000", help="코퍼스 크기들 (쉼표 구분)")
+    ap.add_argument("--quick", action="store_true", help="반복 수를 줄여 빠르게")
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE)
+    ap.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준선으로 저장")
+    ap.add_argument("--json", help="결과를 이 파일에도 저장")
+    ap.add_argument("--check", action="store_true", help="기준선보다 느려진 항목이 있으면 종료 코드 1")
+    ap.add_argument("--threshold", type=float, default=0.25, help="느려짐 허용 비율 (기본 0.25)")
+    args = ap.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    results = {}
+    bench_tokens(results, args.quick)
+    bench_generation(results, sizes, args.quick)
+    bench_submit(results, args.quick)
+    bench_grading(results, args.quick)
+    bench_instrument(results, args.quick)
+    bench_render(results, args.quick)
+    bench_corpus(results, sizes)
+
+    report = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    print_results(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        print(f"기준선 저장: {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        print(f"기준선 비교 ({args.baseline}):")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions and args.check:
+            print(f"느려진 항목 {len(regressions)}개")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,21 @@
 # noinspection PyInterpreter
+import time
+_startup_t0 = time.perf_counter()
+
 import tkinter as tk
-import random
-import re
 from tkinter import font as tkFont
 from tkinter import ttk
-import sys, os
+import os
+import sys
+import threading
 from pathlib import Path
 from tkinter import messagebox
 
+from startup_profile import StartupProfile
+
+# --startup-profile[=파일] : 시작 단계별 시간 보고
+startup = StartupProfile.from_argv(sys.argv, t0=_startup_t0)
+
 if sys.platform == "win32":
     import ctypes
     try:
@@ -23,161 +31,17 @@ if sys.platform == "win32":
                 ctypes.windll.user32.SetProcessDPIAware()
             except Exception:
                 pass
+startup.mark("dpi")
+
+from quiz_engine import QuizEngine
+from grading import LEVEL_NAMES
+from font_index import FontIndex
+from font_cache import FontCache
+from instrument import Instrument
+
+# 핫 패스 계측: BIBLE_INSTRUMENT=1 (또는 '측정' 메뉴)로 켜고, BIBLE_TRACE=파일 이면 끝날 때 트레이스를 쓴다
+probe = Instrument.from_env()
 
-PUNCT_RE = re.compile(r'[,\-]')  # 쉼표/하이픈 무시용
-
-WORD_TOKEN_RE = re.compile(r'[0-9A-Za-z가-힣]')   # 글자가 하나라도 있는지
-PUNCT_RE = re.compile(r'[,\-/]')                 # ← 슬래시도 무시 대상에 포함
-
-def norm_token(s: str) -> str:
-    return PUNCT_RE.sub('', s).strip()
-
-def norm_token(s: str) -> str:
-    """채점 및 정답 저장용: 쉼표/하이픈 제거."""
-    return PUNCT_RE.sub('', s).strip()
-
-def mask_len_keep_punct(tok: str) -> str:
-    """모드1: 길이 힌트 O, 문장부호는 그대로."""
-    return re.sub(r'[0-9A-Za-z가-힣]+', lambda m: '_' * len(m.group(0)), tok)
-
-def mask_one_keep_punct(tok: str) -> str:
-    """모드2/4: 길이 힌트 X, 문장부호는 그대로."""
-    return re.sub(r'[0-9A-Za-z가-힣]+', '_', tok)
-
-def parse_ref_parts(ref: str):
-    """
-    '(요 5:38-39)' -> ('요','5','38-39')
-    항상 괄호로 들어온다고 가정.
-    """
-    s = ref.strip()[1:-1]  # 괄호 제거
-    book, chap_verse = s.split()
-    chap, verse = chap_verse.split(':', 1)
-    return book, chap, verse
-
-def split_verse_parts(verse: str):
-    """
-    '38-39' -> ('_-_', ['38','39'])
-    '37,39' -> ('_,_', ['37','39'])
-    '39'    -> ('_',   ['39'])
-    """
-    if '-' in verse:
-        a, b = verse.split('-', 1)
-        return '_-_', [a, b]
-    if ',' in verse:
-        parts = [p.strip() for p in verse.split(',') if p.strip()]
-        # 파트 개수만큼 '_'와 ','를 섞어 마스크 문자열 생성 (예: '_,_,_' 등)
-        mask = ','.join(['_'] * len(parts))
-        return mask, parts
-    return '_', [verse]
-
-def ref_masked(ref: str, masked: bool) -> str:
-    """
-    masked=False: 원문 장절 그대로 (괄호 유지)
-    masked=True : 책/장 가리고 절은 split 규칙에 맞춘 마스크, (괄호 유지)
-                  예: (요 5:38-39) -> (_ _:_-_)
-                      (요 5:37,39) -> (_ _:_,_)
-                      (요 5:39)    -> (_ _:_)
-    """
-    book, chap, verse = parse_ref_parts(ref)
-    if not masked:
-        return f"({book} {chap}:{verse})"
-    verse_mask, _ = split_verse_parts(verse)
-    return f"(_ _:{verse_mask})"
-
-# 문제를 생성하는 함수
-def create_blank_problem(scripture, mode):
-    global blank_num, whole_level_num
-    reference, verse = scripture.split('^')
-    words = verse.split()
-    num_words = len(words)
-    answers = []
-    print(reference, verse, "\n")
-    
-    if mode == 1:
-        num_words = len(words)
-        num_blanks = int(num_words * max(blank_num, 0) * 0.1)
-        num_blanks = max(0, min(num_blanks, num_words))
-        maskable_idx = [i for i, w in enumerate(words) if WORD_TOKEN_RE.search(w)]
-        num_blanks = min(num_blanks, len(maskable_idx))
-        blank_indices = sorted(random.sample(maskable_idx, num_blanks)) if num_blanks else []
-
-        # 정답은 문장부호 제거본으로 저장(중복 쉼표 방지)
-        answers = [norm_token(words[i]) for i in blank_indices]
-
-        # 화면은 길이 힌트 O + 문장부호 보존
-        problem_words = [
-            (mask_len_keep_punct(w) if i in blank_indices else w)
-            for i, w in enumerate(words)
-        ]
-
-        # 장절 공개(괄호 유지)
-        ref_view = ref_masked(reference, masked=False)
-        problem_text = ref_view + " " + " ".join(problem_words)
-        return problem_text, answers, reference
-
-    elif mode == 2:
-        answers = [norm_token(w) for w in words if WORD_TOKEN_RE.search(w)]
-        problem_words = [
-            (mask_one_keep_punct(w) if WORD_TOKEN_RE.search(w) else w)
-            for w in words
-        ]
-        ref_view = ref_masked(reference, masked=False)
-        problem_text = ref_view + " " + " ".join(problem_words)
-        return problem_text, answers, reference
-
-    elif mode == 3:
-        book, chap, verse = parse_ref_parts(reference)
-        verse_mask, verse_parts = split_verse_parts(verse)
-
-        # 장절은 마스크로, 본문은 공개
-        ref_view = ref_masked(reference, masked=True)
-        problem_text = ref_view + " " + " ".join(words)
-
-        # 정답 순서: 책, 장, 절의 각 파트  (예: 38-39 -> ['38','39'])
-        answers = [book, chap] + verse_parts
-        return problem_text, answers, reference
-
-    elif mode == 4:
-        n = min(whole_level_num, len(words))
-        rand_index = random.randint(0, len(words) - n)
-        visible_words = words[rand_index:rand_index + n]
-
-        first_occurrence = True
-        problem_words = []
-        i = 0
-        while i < len(words):
-            if first_occurrence and i <= len(words) - n and words[i:i+n] == visible_words:
-                problem_words.extend(visible_words)      # 이 블록 공개
-                first_occurrence = False
-                i += n
-            else:
-                w = words[i]
-                problem_words.append(mask_one_keep_punct(w))  # 힌트 X
-                i += 1
-
-        # 장절 마스킹
-        book, chap, verse = parse_ref_parts(reference)
-        verse_mask, verse_parts = split_verse_parts(verse)
-        ref_view = ref_masked(reference, masked=True)
-
-        problem_text = ref_view + " " + " ".join(problem_words)
-
-        answers = [book, chap] + verse_parts
-
-        i = 0
-        skipped_once = False
-        while i < len(words):
-            if (not skipped_once) and i <= len(words) - n and words[i:i+n] == visible_words:
-                skipped_once = True
-                i += n
-                continue
-            w = words[i]
-            if WORD_TOKEN_RE.search(w):
-                answers.append(norm_token(w))
-            i += 1
-
-        return problem_text, answers, reference
-    
 def blank_level():
     blank_level_window = tk.Toplevel()
     blank_level_window.title("빈칸 난이도 선택")
@@ -187,8 +51,7 @@ def blank_level():
         tk.Button(blank_level_window, text=str(i + 1)+"0%", width=10, command=lambda num=i: (level_num(num), blank_level_window.destroy())).pack()
 
 def level_num(num):
-    global blank_num
-    blank_num = num + 1
+    engine.blank_num = num + 1
     set_mode(1)
     
 def whole_level():
@@ -200,200 +63,385 @@ def whole_level():
         tk.Button(whole_level_window, text=str(i) + "어절", width=10, command=lambda num=i: (whole_num(num), whole_level_window.destroy())).pack()    
 
 def whole_num(num):
-    global whole_level_num
-    whole_level_num = num
+    engine.whole_level_num = num
     set_mode(4)
 
 # 문제를 텍스트 박스에 표시
+@probe.timed("display_problem")
 def display_problem(mode):
-    global current_problem, current_answers, current_reference, attempts, problem_completed, scripture, problem_num
-    if len(scripture)-1 == 0:
-        problem_num = 0
-    elif len(scripture)-1 < 0:
+    with probe.span("create_problem"):
+        problem = engine.next_problem(mode)
+    if problem is None:
         return
-    else:
-        problem_num = random.randint(0, len(scripture)-1)
-    current_problem, current_answers, current_reference = create_blank_problem(scripture[problem_num], mode)
-    attempts = 0
-    problem_completed = False
+    show_problem_text()
+
+def show_problem_text():
     problem_text_box.config(state=tk.NORMAL)
     problem_text_box.delete(1.0, tk.END)
-    problem_text_box.insert(tk.END, current_problem)
+    problem_text_box.insert(tk.END, engine.current_problem)
     problem_text_box.config(state=tk.DISABLED)
     answer_text_box.delete(1.0, tk.END)
 
-# 답안 제출 함수
+def clear_problem_text():
+    problem_text_box.config(state=tk.NORMAL)
+    problem_text_box.delete(1.0, tk.END)
+    problem_text_box.config(state=tk.DISABLED)
+
+# 답안 제출 함수: 띄어 쓴 여러 어절도 한 번에 채점하고 화면은 한 번만 고친다
+@probe.timed("submit_answer")
 def submit_answer(event=None):
-    global attempts, problem_completed, scripture, problem_num, left_verse, fail_num, wrong_verses
     user_answer = answer_text_box.get(1.0, tk.END).strip()
+    results, rest = engine.submit_many(user_answer)
+    probe.count("answers", len(results))
+    answer_text_box.delete(1.0, tk.END)
+    if rest:
+        # 틀린 어절부터는 입력창에 남겨 고쳐서 다시 내게 한다
+        answer_text_box.insert(1.0, rest)
 
-    if left_verse:
-        if problem_completed or not current_answers:
-            # 완료/소진 시 다음 문제로 (기존 semantics 유지)
-            try:
-                scripture.pop(problem_num)
-                left_verse -= 1
-            except Exception:
-                pass
-            reload_texts()
-            display_problem(current_mode)
-            answer_text_box.delete(1.0, tk.END)
-            return "break" if event else None
-
-        # if user_answer == current_answers[0]:
-        if norm_token(user_answer) == norm_token(current_answers[0]):
-            replace_blank_with_answer(current_answers[0], 1)
-            current_answers.pop(0)
-            answer_text_box.delete(1.0, tk.END)
-            attempts = 0
-            if not current_answers:
-                problem_completed = True
-        else:
-            attempts += 1
-            answer_text_box.delete(1.0, tk.END)
-            # 틀렸을 때 처리 부분에서 (attempts >= 3일 때)
-            if attempts >= 3:
-                try:
-                    # 틀린 구절 저장
-                    wrong_verse = {
-                        'reference': current_reference,
-                        'verse': scripture[problem_num].split('^')[1],
-                        'full_text': scripture[problem_num]  # 전체 텍스트 저장
-                    }
-                except:
-                    pass
-                # 중복 방지 체크
-                if not any(w['full_text'] == wrong_verse['full_text'] for w in wrong_verses):
-                    wrong_verses.append(wrong_verse)
-                
-                replace_blank_with_answer(current_answers[0], 0)
-                current_answers.pop(0)
-                fail_num += 1
-                reload_texts()
-                attempts = 0
-                if not current_answers:
-                    problem_completed = True
-    else:
-        answer_text_box.delete(1.0, tk.END)
+    if any(r.status == 'next' for r in results):
+        # 완료/소진 시 다음 문제로
+        reload_texts()
+        show_problem_text()
+        return
+    # 맞힘(초록)/세 번 틀려 공개(빨강)
+    filled = [(r.answer, r.status == 'correct', r.index, r.blank_len)
+              for r in results if r.status in ('correct', 'revealed')]
+    replace_blanks_with_answers(filled)
+    if any(r.status == 'revealed' for r in results):
+        # 틀린 갯수 갱신
+        reload_texts()
 
     return "break" if event else None 
 
+WRONG_PAGE_ROWS = 40  # 틀린 구절 창에 한 번에 붙이는 줄 수
+
+# 틀린 구절 창 (창, 새로고침 함수). 닫으면 숨기기만 하고 다음에 다시 쓴다
+wrong_popup = None
+
 # 틀린 구절 팝업
+@probe.timed("wrong_popup")
 def show_wrong_verses():
-    if not wrong_verses:
+    global wrong_popup
+    due_count = review_store.due_count() if review_store else len(engine.wrong_verses)
+    if not engine.wrong_verses and not due_count:
         messagebox.showinfo("알림", "틀린 구절이 없습니다.")
         return
-    
+
+    if wrong_popup is None or not wrong_popup[0].winfo_exists():
+        wrong_popup = build_wrong_popup()
+    popup, refresh = wrong_popup
+    refresh(due_count)
+    popup.deiconify()
+    popup.lift()
+
+def build_wrong_popup():
     popup = tk.Toplevel(root)
     popup.title("틀린 구절 모음")
-    popup.geometry("600x400")
-    popup.grid_rowconfigure(0, weight=1)
+    popup.geometry("600x450")
+    popup.grid_rowconfigure(1, weight=1)
     popup.grid_columnconfigure(0, weight=1)
-    
+    popup.protocol("WM_DELETE_WINDOW", popup.withdraw)
+
+    # 거르기: 책 / 모드 / 실패 횟수
+    filters = tk.Frame(popup)
+    filters.grid(row=0, column=0, sticky="we", padx=10, pady=(10, 0))
+    book_var = tk.StringVar(value="전체")
+    mode_var = tk.StringVar(value="전체")
+    fails_var = tk.StringVar(value="1")
+
+    tk.Label(filters, text="책:").pack(side="left")
+    book_box = ttk.Combobox(filters, textvariable=book_var, state="readonly", width=8)
+    book_box.pack(side="left", padx=(2, 8))
+    tk.Label(filters, text="모드:").pack(side="left")
+    mode_box = ttk.Combobox(filters, textvariable=mode_var, state="readonly", width=5,
+                            values=["전체", "1", "2", "3", "4"])
+    mode_box.pack(side="left", padx=(2, 8))
+    tk.Label(filters, text="실패 횟수 ≥").pack(side="left")
+    fails_spin = ttk.Spinbox(filters, from_=1, to=99, width=4, textvariable=fails_var)
+    fails_spin.pack(side="left", padx=(2, 8))
+    status_label = tk.Label(filters, text="")
+    status_label.pack(side="right")
+
     # 스크롤 가능한 텍스트 박스
     frame = tk.Frame(popup)
-    frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+    frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
     frame.grid_rowconfigure(0, weight=1)
     frame.grid_columnconfigure(0, weight=1)
-    
-    current_font = (font_style_var.get(), 25, 'bold' if bold_var.get() else 'normal')
-    
-    text_box = tk.Text(frame, wrap=tk.WORD, font=current_font)
+
+    text_box = tk.Text(frame, wrap=tk.WORD, state=tk.DISABLED)
     scrollbar = ttk.Scrollbar(frame, orient="vertical", command=text_box.yview)
-    text_box.config(yscrollcommand=scrollbar.set)
-    
     text_box.grid(row=0, column=0, sticky="nsew")
     scrollbar.grid(row=0, column=1, sticky="ns")
-    
-    # 틀린 구절들 표시
-    for i, wrong in enumerate(wrong_verses, 1):
-        text_box.insert(tk.END, f"{i}. {wrong['reference']} {wrong['verse']}\n\n")
-    
-    text_box.config(state=tk.DISABLED)
-    
+
+    # 걸러진 목록 전체(rows) 중 앞에서 shown 줄만 그려 두고, 끝 근처로 스크롤하면 다음 쪽을 붙인다
+    state = {"rows": [], "shown": 0, "due": 0, "pending": False}
+
+    def load_more():
+        state["pending"] = False
+        rows = state["rows"]
+        start = state["shown"]
+        if start >= len(rows):
+            return
+        end = min(len(rows), start + WRONG_PAGE_ROWS)
+        chunk = "".join(
+            f"{i}. {w['reference']} {w['verse']}\n\n"
+            for i, w in enumerate(rows[start:end], start + 1)
+        )
+        state["shown"] = end
+        text_box.config(state=tk.NORMAL)
+        text_box.insert(tk.END, chunk)
+        text_box.config(state=tk.DISABLED)
+
+    def on_yscroll(first, last):
+        scrollbar.set(first, last)
+        if float(last) > 0.9 and state["shown"] < len(state["rows"]) and not state["pending"]:
+            state["pending"] = True
+            text_box.after_idle(load_more)
+
+    text_box.config(yscrollcommand=on_yscroll)
+
+    def refresh(due_count=None):
+        if due_count is not None:
+            state["due"] = due_count
+        book = None if book_var.get() == "전체" else book_var.get()
+        mode = None if mode_var.get() == "전체" else int(mode_var.get())
+        try:
+            min_fails = max(1, int(fails_var.get()))
+        except ValueError:
+            min_fails = 1
+
+        state["rows"] = engine.filter_wrong_verses(book, mode, min_fails)
+        state["shown"] = 0
+        book_box.config(values=["전체"] + engine.wrong_books())
+        status_label.config(text=f"복습할 구절 : {state['due']}   틀린 구절 : {len(state['rows'])}")
+        text_box.config(font=font_cache.get(font_style_var.get(), 25,
+                                            'bold' if bold_var.get() else 'normal', role="popup"))
+        text_box.config(state=tk.NORMAL)
+        text_box.delete("1.0", tk.END)
+        text_box.config(state=tk.DISABLED)
+        text_box.yview_moveto(0)
+        load_more()
+
+    book_box.bind("<<ComboboxSelected>>", lambda e: refresh())
+    mode_box.bind("<<ComboboxSelected>>", lambda e: refresh())
+    fails_spin.config(command=refresh)
+    fails_spin.bind("<KeyRelease>", lambda e: refresh())
+
     # 암송 리스트에 추가 버튼
     def add_to_memorization():
-        global scripture, left_verse, fail_num, wrong_verses
-        scripture = [w['full_text'] for w in wrong_verses]
-        left_verse = len(scripture)
-        fail_num = 0  # 틀린 갯수 초기화
-        wrong_verses = []  # 틀린 구절 목록 초기화
+        engine.review_wrong_verses()  # 복습할 구절 로드 + 틀린 구절 목록/틀린 갯수 초기화
         reload_texts()
         
         # 현재 보여주고 있는 문제 지우기
-        problem_text_box.config(state=tk.NORMAL)
-        problem_text_box.delete(1.0, tk.END)
-        problem_text_box.config(state=tk.DISABLED)
+        clear_problem_text()
         answer_text_box.delete(1.0, tk.END)
         
-        popup.destroy()
-        display_problem(current_mode)
+        popup.withdraw()
+        display_problem(engine.mode)
         messagebox.showinfo("완료", f"틀린 구절들이 암송 리스트에 추가되었습니다.\n틀린 구절 목록이 초기화되었습니다.")
 
     # 틀린 구절 초기화 버튼
     def reset_wrong_verses():
-        global wrong_verses
-        wrong_verses = []  # 틀린 구절 목록 초기화
+        engine.clear_wrong_verses()  # 틀린 구절 목록 초기화
         
-        popup.destroy()
+        popup.withdraw()
         messagebox.showinfo("완료", "틀린 구절 목록이 초기화되었습니다.")
     
     button = tk.Button(popup, text="틀린 구절 복습", command=add_to_memorization)
-    button.grid(row=1, column=0, pady=10)
+    button.grid(row=2, column=0, pady=10)
     button = tk.Button(popup, text="틀린 구절 초기화", command=reset_wrong_verses)
-    button.grid(row=2, column=0)
+    button.grid(row=3, column=0, pady=(0, 10))
+
+    return popup, refresh
+
+SEARCH_DELAY_MS = 150    # 구절 검색 입력 디바운스
+SEARCH_LIST_ROWS = 500   # 검색 결과 목록에 보여 주는 최대 줄 수 (암송 목록에는 전부 넣는다)
+
+# 구절 검색 색인 (verse_index.VerseIndex). 검색 창을 처음 열 때 작업 스레드에서 만든다
+search_index = None
+search_index_ready = threading.Event()
+search_index_thread = None
 
-# 빈칸을 정답으로 대체하는 함수
-def replace_blank_with_answer(answer, correct):
-    global current_problem
+def build_search_index():
+    global search_index
     try:
-        test_index = current_problem.index('_')
-    except ValueError:
+        from corpus_library import ChainedCorpus
+        from verse_index import VerseIndex
+        # 일차 LRU 캐시 밖에서 연다: 색인이 모든 코퍼스를 들고 있어도 일차 캐시 예산은 그대로
+        parts = [corpus_library.open_uncached(e.name) for e in corpus_library.entries]
+        search_index = VerseIndex(ChainedCorpus(parts))
+    except Exception:
+        search_index = None
+    finally:
+        search_index_ready.set()
+
+def start_search_index():
+    global search_index_thread
+    if search_index_thread is None:
+        search_index_thread = threading.Thread(target=build_search_index, name="search-index", daemon=True)
+        search_index_thread.start()
+
+# 구절 검색 창. 닫으면 숨기기만 하고 다음에 다시 쓴다
+search_popup = None
+
+def open_search_popup():
+    global search_popup
+    if corpus_library is None:
         return
+    start_search_index()
+    if search_popup is None or not search_popup.winfo_exists():
+        search_popup = build_search_popup()
+    search_popup.deiconify()
+    search_popup.lift()
 
-    current_problem = re.sub(r'(_+)', answer, current_problem, count=1)
+def build_search_popup():
+    popup = tk.Toplevel(root)
+    popup.title("구절 검색")
+    popup.geometry("600x450")
+    popup.grid_rowconfigure(2, weight=1)
+    popup.grid_columnconfigure(0, weight=1)
+    popup.protocol("WM_DELETE_WINDOW", popup.withdraw)
 
-    problem_text_box.config(state=tk.NORMAL)
-    problem_text_box.delete(1.0, tk.END)
+    qvar = tk.StringVar(value="")
+    entry = ttk.Entry(popup, textvariable=qvar)
+    entry.grid(row=0, column=0, sticky="we", padx=10, pady=(10, 0))
+    status_label = tk.Label(popup, text="예: 하나님 창조 / 요 5:* / 요 5:38-40 / 요 3:* 사랑", anchor="w")
+    status_label.grid(row=1, column=0, sticky="we", padx=10)
 
-    problem_text_box.tag_configure("highlight", foreground=("green" if correct else "red"))
-    problem_text_box.insert(tk.END, current_problem)
+    frame = tk.Frame(popup)
+    frame.grid(row=2, column=0, sticky="nsew", padx=10, pady=10)
+    frame.grid_rowconfigure(0, weight=1)
+    frame.grid_columnconfigure(0, weight=1)
+    lst = tk.Listbox(frame, activestyle="none")
+    sb = ttk.Scrollbar(frame, orient="vertical", command=lst.yview)
+    lst.grid(row=0, column=0, sticky="nsew")
+    sb.grid(row=0, column=1, sticky="ns")
+    lst.config(yscrollcommand=sb.set)
+
+    state = {"ids": [], "job": None}
+
+    @probe.timed("verse_search")
+    def run_search():
+        state["job"] = None
+        if not search_index_ready.is_set():
+            status_label.config(text="검색 색인을 만드는 중입니다...")
+            state["job"] = popup.after(200, run_search)
+            return
+        if search_index is None:
+            status_label.config(text="검색 색인을 만들지 못했습니다.")
+            return
+        query = qvar.get().strip()
+        t0 = time.perf_counter()
+        ids = search_index.search(query) if query else []
+        ms = (time.perf_counter() - t0) * 1000.0
+        state["ids"] = ids
+        source = search_index.source
+        lst.delete(0, tk.END)
+        lst.insert(tk.END, *(f"{source[i].reference} {source[i].text}" for i in ids[:SEARCH_LIST_ROWS]))
+        more = f" (앞 {SEARCH_LIST_ROWS}개만 표시)" if len(ids) > SEARCH_LIST_ROWS else ""
+        status_label.config(text=f"{len(ids)}구절{more}  {ms:.1f} ms" if query else "")
+
+    def on_change(*_):
+        if state["job"] is not None:
+            popup.after_cancel(state["job"])
+        state["job"] = popup.after(SEARCH_DELAY_MS, run_search)
+
+    qvar.trace_add("write", on_change)
+
+    # 검색 결과를 그대로 암송 목록으로
+    def practice_results():
+        global day_num
+        if not state["ids"]:
+            messagebox.showinfo("알림", "검색된 구절이 없습니다.")
+            return
+        day_num = None
+        engine.load(search_index.select(state["ids"]))
+        reload_texts()
+        clear_problem_text()
+        answer_text_box.delete(1.0, tk.END)
+        popup.withdraw()
+        display_problem(engine.mode)
+
+    entry.bind("<Return>", lambda e: practice_results())
+    tk.Button(popup, text="검색 결과 암송", command=practice_results).grid(row=3, column=0, pady=(0, 10))
+    entry.focus_set()
+    return popup
+
+# 빈칸을 정답으로 대체하는 함수: 그 빈칸 구간만 바꾸고 이전 색 표시는 그대로 둔다
+@probe.timed("replace_blanks")
+def replace_blanks_with_answers(filled):
+    """(정답, 맞힘 여부, 위치, 빈칸 길이) 들을 순서대로 반영 (위젯 상태는 한 번만 바꾼다)."""
+    filled = [f for f in filled if f[2] >= 0]
+    if not filled:
+        return
 
-    start_index = f"1.0 + {test_index} chars"
-    end_index   = f"1.0 + {test_index + len(answer)} chars"
-    problem_text_box.tag_add("highlight", start_index, end_index)
+    problem_text_box.config(state=tk.NORMAL)
+    for answer, correct, index, blank_len in filled:
+        # 문제 텍스트는 한 줄이라 글자 위치가 곧 Tk 인덱스 '1.<위치>'
+        start_index = f"1.{index}"
+        end_index   = f"1.{index + blank_len}"
+        problem_text_box.delete(start_index, end_index)
+        problem_text_box.insert(start_index, answer, "correct" if correct else "wrong")
     problem_text_box.config(state=tk.DISABLED)
 
 # 모드 선택에 따라 문제를 표시하는 함수
 def set_mode(mode):
-    global current_mode
-    current_mode = mode
+    engine.mode = mode
     display_problem(mode)
 
 def select_day(num):
-    global day_num, scripture, left_verse
-    day_num = 1
-    scripture.clear()
-    scripture.extend(original_scriptures[0])  # day1.txt 데이터만 사용
-    left_verse = len(scripture)
+    """num 일차 구절을 암송 목록으로. num 이 None 이면 전체 일차."""
+    global day_num
+    day_num = num
+    if num is None:
+        if course_num is not None:
+            from corpus_library import ChainedCorpus
+            engine.load(ChainedCorpus(selected_scriptures))
+        else:
+            engine.load(corpus_library.load_all())
+        warn_dropped_lines(corpus_library.days())
+    else:
+        entry = corpus_library.day_entry(num)
+        if entry is None:
+            return
+        if course_num is not None:
+            engine.load(corpus_library.course_selection(entry.name, course_num))
+        else:
+            engine.load(corpus_library.load(entry.name))  # 처음 선택할 때 로드
+        warn_dropped_lines([entry])
     reload_texts()
 
+# 형식 오류 줄을 이미 알린 코퍼스 (세션마다 한 번만 알린다)
+warned_corpora = set()
+DROPPED_LINES_SHOWN = 5
+
+def warn_dropped_lines(entries):
+    """열어 본 코퍼스에서 형식 오류로 뺀 줄이 있으면 알린다."""
+    lines = []
+    for e in entries:
+        if not e.dropped or e.name in warned_corpora:
+            continue
+        warned_corpora.add(e.name)
+        lines.append(f"{os.path.basename(e.path)}: {e.dropped}줄")
+        for no, line, reason in e.errors[:DROPPED_LINES_SHOWN]:
+            lines.append(f"  {no}번째 줄: {reason}")
+    if lines:
+        messagebox.showwarning(
+            "코퍼스 형식 오류",
+            "형식이 맞지 않는 줄은 암송 목록에서 뺐습니다.\n\n" + "\n".join(lines)
+            + "\n\n자세한 내용은 corpus_tool.py --check 로 확인하세요.")
+
 def reload_texts():
-    left_verse_label.config(text="남은 구절 : "+str(left_verse))
-    fail_num_label.config(text="틀린 갯수 : "+str(fail_num))
+    left_verse_label.config(text="남은 구절 : "+str(engine.left_verse))
+    fail_num_label.config(text="틀린 갯수 : "+str(engine.fail_num))
 
 def day_reset():
-    global scripture, left_verse, problem_text_box, fail_num, wrong_verses
-    scripture = []
-    left_verse = 0
-    fail_num = 0
-    wrong_verses = []
+    engine.reset()
     reload_texts()
-    problem_text_box.config(state=tk.NORMAL)
-    problem_text_box.delete(1.0, tk.END)
-    problem_text_box.config(state=tk.DISABLED)
+    clear_problem_text()
 
 # GUI 설정
+startup.mark("imports")
 root = tk.Tk()
 root.tk.call('tk', 'scaling', 1.0)
 root.geometry("900x600")               # 기본 창 크기
@@ -407,46 +455,86 @@ def resource_path(rel: str) -> str:
     base = getattr(sys, "_MEIPASS", Path(__file__).parent)
     return str(Path(base, rel))
 
-# 1) 우선 Windows에서는 .ico 시도
-try:
-    if sys.platform == "win32":
-        ico = resource_path("samuel_icon.ico")
-        if Path(ico).exists():
-            root.iconbitmap(ico)   # 파일 경로 반드시 절대/정규화
-        else:
-            raise FileNotFoundError(ico)
-    else:
-        raise OSError("iconbitmap not reliable on this platform")
-except Exception:
-    # 2) 모든 OS에서 동작하는 대안: PNG로 창 아이콘 설정 (Tk 8.6+)
+def load_icon():
+    # 1) 우선 Windows에서는 .ico 시도
     try:
-        png = resource_path("samuel_icon.png")  # 같은 폴더에 PNG도 준비
-        if Path(png).exists():
-            img = tk.PhotoImage(file=png)
-            root.wm_iconphoto(True, img)
+        if sys.platform == "win32":
+            ico = resource_path("samuel_icon.ico")
+            if Path(ico).exists():
+                root.iconbitmap(ico)   # 파일 경로 반드시 절대/정규화
+            else:
+                raise FileNotFoundError(ico)
+        else:
+            raise OSError("iconbitmap not reliable on this platform")
     except Exception:
-        pass  # 아이콘 설정 실패해도 앱은 계속 뜨게
+        # 2) 모든 OS에서 동작하는 대안: PNG로 창 아이콘 설정 (Tk 8.6+)
+        try:
+            png = resource_path("samuel_icon.png")  # 같은 폴더에 PNG도 준비
+            if Path(png).exists():
+                img = tk.PhotoImage(file=png)
+                root.wm_iconphoto(True, img)
+        except Exception:
+            pass  # 아이콘 설정 실패해도 앱은 계속 뜨게
+
+# 열어 둔 일차 코퍼스들의 메모리 상한
+CORPUS_CACHE_BUDGET = 64 * 1024 * 1024
 
-def load_original_scriptures_txt():
-    days = []
-    # day1.txt만 불러옴
-    p = resource_path(os.path.join("data", "day1.txt"))
-    with open(p, "r", encoding="utf-8") as f:
-        items = [line.strip() for line in f.readlines() if line.strip()]
-    days.append(items)
-    return days
+def load_corpus_library():
+    # data/*.txt 의 이름/구절 수만 색인하고, 내용은 일차를 선택할 때 연다
+    from corpus_library import CorpusLibrary
+    return CorpusLibrary(resource_path("data"), budget_bytes=CORPUS_CACHE_BUDGET)
 
 
 # 일차 번호
 day_num = 1
-# 일차가 선택된 구절들
-scripture = []
-# 과정이 선택된 구절들
-selected_scriptures = [[], [], [], [], [], []]
-# 원본 구절
-original_scriptures = load_original_scriptures_txt()
-# 틀린 구절들을 저장할 리스트 (existing globals 근처에 추가)
-wrong_verses = []  # 각 항목: {'reference': str, 'verse': str, 'mode': int, 'blanks': list}
+# 원본 구절 색인 (일차별 지연 로딩). 창이 뜬 뒤 load_startup_data 에서 연다
+corpus_library = None
+# 과정이 선택된 구절들 (일차별). course_num 이 있으면 일차를 고를 때 이 구절들만 암송
+selected_scriptures = []
+course_num = None
+def open_review_store():
+    # 복습 일정(SQLite). 열 수 없으면 이번 세션의 틀린 구절만으로 복습
+    try:
+        from review_store import ReviewStore
+        return ReviewStore()
+    except Exception:
+        return None
+
+# 복습 일정 저장소 (load_startup_data 에서 연다)
+review_store = None
+
+def open_event_log():
+    # 세션 이벤트 로그: 복습 저장소와 같은 폴더의 events.jsonl (쓰기는 작업 스레드가 묶어서)
+    try:
+        import atexit
+        from event_log import EventLog
+        from review_store import default_store_path
+        log = EventLog(os.path.join(os.path.dirname(default_store_path()), "events.jsonl"))
+        atexit.register(log.close)
+        return log
+    except Exception:
+        return None
+
+def open_verse_stats():
+    # 구절/어절별 통계(모드1 적응형 빈칸): 복습 저장소와 같은 폴더의 verse_stats.bin, 끝날 때 저장
+    try:
+        import atexit
+        from verse_stats import VerseStats
+        from review_store import default_store_path
+        path = os.path.join(os.path.dirname(default_store_path()), "verse_stats.bin")
+        stats = VerseStats.load(path)
+
+        def save():
+            try:
+                stats.save(path)
+            except Exception:
+                pass
+        atexit.register(save)
+        return stats
+    except Exception:
+        return None
+# 암송 세션 (구절 목록/현재 문제/틀린 구절 등 상태는 엔진이 보관)
+engine = QuizEngine()
 
 def init_ui_fonts(root, family="맑은 고딕", size=13):
     import tkinter.ttk as ttk
@@ -469,6 +557,7 @@ def init_ui_fonts(root, family="맑은 고딕", size=13):
         pass
 
 init_ui_fonts(root, family="맑은 고딕", size=13)
+startup.mark("ui fonts")
 
 font_size = 30
 font_form = "맑은 고딕"
@@ -477,20 +566,22 @@ font_style_var = tk.StringVar(value="맑은 고딕")
 # 볼드체 상태 변수
 bold_var = tk.BooleanVar(value=False)
 
+# 글꼴 객체 캐시 (슬라이더를 움직일 때마다 Tk 글꼴을 새로 만들지 않도록)
+font_cache = FontCache(root)
+
 def update_font():
     selected_font = font_style_var.get()
     selected_size = font_size_var.get()
     is_bold = bold_var.get()
-    f = tkFont.Font(
-        family=selected_font,
-        size=selected_size,
-        weight='bold' if is_bold else 'normal',
-        slant='roman'
-    )
+    f = font_cache.get(selected_font, selected_size, 'bold' if is_bold else 'normal', role="text")
     answer_text_box.config(font=f)
     problem_text_box.config(font=f)
 
+FONT_SEARCH_DELAY_MS = 150  # 검색 입력 디바운스
+FONT_LIST_CHUNK = 300       # Listbox 에 한 번에 넣는 행 수
+
 # ADD: 글꼴/크기/진하게/초기화 통합 팝업
+@probe.timed("font_popup/open")
 def open_font_popup():
     win = tk.Toplevel(root)
     win.title("글꼴 설정")
@@ -552,18 +643,46 @@ def open_font_popup():
     win.grid_rowconfigure(1, weight=1)
 
     # 내부 상태
-    all_fonts = get_all_fonts(root, include_vertical.get())
-    filtered = all_fonts[:]
+    filtered = get_all_fonts(root, include_vertical.get())
+    shown = []          # 지금 Listbox 에 들어 있는 항목
+    fill_job = None     # 나눠 넣기 예약 (after id)
+    search_job = None   # 검색 디바운스 예약 (after id)
 
     def populate(items, keep_current=True):
-        lst.delete(0, tk.END)
-        for f in items:
-            lst.insert(tk.END, f)
-        if keep_current and font_style_var.get() in items:
-            idx = items.index(font_style_var.get())
-            lst.selection_set(idx); lst.see(idx)
-        elif items:
-            lst.selection_set(0)
+        """앞부분이 같은 행은 그대로 두고, 나머지만 FONT_LIST_CHUNK 개씩 나눠 넣는다."""
+        nonlocal shown, fill_job
+        if fill_job is not None:
+            win.after_cancel(fill_job)
+            fill_job = None
+        common = 0
+        limit = min(len(shown), len(items))
+        while common < limit and shown[common] == items[common]:
+            common += 1
+        if common < len(shown):
+            lst.delete(common, tk.END)
+        shown = items
+        rest = items[common:]
+
+        def select_current():
+            lst.selection_clear(0, tk.END)
+            if keep_current and font_style_var.get() in items:
+                idx = items.index(font_style_var.get())
+                lst.selection_set(idx); lst.see(idx)
+            elif items:
+                lst.selection_set(0)
+
+        def fill(start):
+            nonlocal fill_job
+            chunk = rest[start:start + FONT_LIST_CHUNK]
+            if chunk:
+                lst.insert(tk.END, *chunk)
+            if start + FONT_LIST_CHUNK < len(rest):
+                fill_job = win.after(1, fill, start + FONT_LIST_CHUNK)
+            else:
+                fill_job = None
+                select_current()
+
+        fill(0)
 
     def current_family():
         sel = lst.curselection()
@@ -572,21 +691,19 @@ def open_font_popup():
         # 선택 없으면 현재 전역값
         return font_style_var.get()
 
+    @probe.timed("font_popup/preview")
     def apply_preview():
         fam = current_family()
         size = int(round(float(size_scale.get())))
-        f = tkFont.Font(
-            family=fam, size=size,
-            weight='bold' if bold_var.get() else 'normal',
-            slant='roman'
-        )
+        f = font_cache.get(fam, size, 'bold' if bold_var.get() else 'normal', role="preview")
         sample.config(font=f)
 
+    @probe.timed("font_popup/search")
     def refresh():
-        nonlocal all_fonts, filtered
-        all_fonts = get_all_fonts(root, include_vertical.get())
-        q = qvar.get().lower()
-        filtered = [f for f in all_fonts if q in f.lower()]
+        nonlocal filtered, search_job
+        search_job = None
+        # 색인 검색 (앞 검색어를 포함하면 앞 결과 안에서만 거름)
+        filtered = get_font_index().search(qvar.get(), include_vertical.get())
         populate(filtered)
         apply_preview()
 
@@ -594,7 +711,18 @@ def open_font_popup():
         apply_preview()
 
     def on_search(_=None):
-        refresh()
+        # 입력이 멈출 때까지 기다렸다가 한 번만 검색
+        nonlocal search_job
+        if search_job is not None:
+            win.after_cancel(search_job)
+        search_job = win.after(FONT_SEARCH_DELAY_MS, refresh)
+
+    def on_destroy(event):
+        if event.widget is not win:
+            return
+        for job in (fill_job, search_job):
+            if job is not None:
+                win.after_cancel(job)
 
     def on_toggle_vertical():
         refresh()
@@ -613,28 +741,48 @@ def open_font_popup():
     lst.bind("<<ListboxSelect>>", on_select)
     entry.bind("<KeyRelease>", on_search)
     chk.config(command=on_toggle_vertical)
+    win.bind("<Destroy>", on_destroy)
     size_scale.bind("<ButtonRelease-1>", lambda e: apply_preview())
 
     # 초기 채움
     populate(filtered)
     apply_preview()
 
-def get_all_fonts(root, include_vertical=False):
-    fams = sorted(tkFont.families(root))
-    return fams if include_vertical else [f for f in fams if not f.startswith('@')]
+# 글꼴 목록은 프로세스당 한 번만 Tk 에서 읽어 색인해 둔다
+_font_index = None
 
+def get_font_index():
+    global _font_index
+    if _font_index is None:
+        _font_index = FontIndex(tkFont.families(root))
+    return _font_index
 
-    # 확인 버튼
-    ok_btn = ttk.Button(win, text="확인", command=win.destroy)
-    ok_btn.pack(pady=(0, 8))
+def get_all_fonts(root, include_vertical=False):
+    return get_font_index().search("", include_vertical)
+
+# 여러 어절 입력: 켜면 Space 는 띄어쓰기로 들어가고 Enter 로 한꺼번에 제출
+stream_input_var = tk.BooleanVar(value=False)
 
 def on_space_key(event):
     if event.keycode == 229:  # Windows IME 조합 처리키
         return
+    if stream_input_var.get():
+        return
     if event.char == " ":
-        root.after_idle(submit_answer)
+        queue_submit()
         return "break"  # space 입력 자체는 막고, 제출로만 처리
 
+def queue_submit():
+    """키 입력으로 제출을 예약한다. 계측 중이면 키 입력부터 바뀐 화면을 그린 뒤까지(submit_to_render)를 잰다."""
+    t0 = time.perf_counter_ns()
+
+    def run():
+        submit_answer()
+        if probe.enabled:
+            # 제출하면서 예약된 다시 그리기(idle) 다음 차례에 돌도록 한 번 더 미룬다
+            root.after_idle(lambda: probe.record("submit_to_render", (time.perf_counter_ns() - t0) / 1e9, t0))
+    root.after_idle(run)
+
 
 # 문제 텍스트박스 + 스크롤
 problem_frame = tk.Frame(root)
@@ -644,39 +792,43 @@ problem_frame.grid_columnconfigure(0, weight=1)
 
 problem_text_box = tk.Text(
     problem_frame,
-    font=(font_form, font_size),
+    font=font_cache.get(font_form, font_size, role="text"),
     wrap=tk.WORD,
     state=tk.DISABLED
 )
 problem_text_box.grid(row=0, column=0, sticky="nsew")
+problem_text_box.tag_configure("correct", foreground="green")
+problem_text_box.tag_configure("wrong", foreground="red")
 
 problem_scroll = ttk.Scrollbar(problem_frame, orient="vertical", command=problem_text_box.yview)
 problem_scroll.grid(row=0, column=1, sticky="ns")
 problem_text_box.config(yscrollcommand=problem_scroll.set)
 
 # 답안 텍스트박스
-answer_text_box = tk.Text(root, height=1, width=30, font=(font_form, font_size), wrap=tk.WORD)
+answer_text_box = tk.Text(root, height=1, width=30, font=font_cache.get(font_form, font_size, role="text"), wrap=tk.WORD)
 answer_text_box.grid(row=2, column=0, sticky="we", padx=12, pady=(0, 10))
 answer_text_box.unbind("<space>")
 answer_text_box.bind("<space>", on_space_key)
-answer_text_box.bind("<Return>", lambda e: (root.after_idle(submit_answer), "break")[1])
-answer_text_box.bind("<KP_Enter>", lambda e: (root.after_idle(submit_answer), "break")[1])
+answer_text_box.bind("<Return>", lambda e: (queue_submit(), "break")[1])
+answer_text_box.bind("<KP_Enter>", lambda e: (queue_submit(), "break")[1])
 
 def select_course(course_number):
-    global selected_scriptures
-    selected_scriptures = [[], [], [], [], [], []]
+    """course_number 과정까지의 구절을 일차별로 고른다 (과정 색인에서 앞부분만 잘라 온다)."""
+    global selected_scriptures, course_num
+    days = corpus_library.days()
+    course_num = course_number or None
 
     # 과정을 인자로 받았을 경우 (팝업 없이 처리)
     if course_number :
-        for i, scripture_list in enumerate(original_scriptures):
-            for scripture in scripture_list:
-                split_data = scripture.split("\\", 1)
-                if len(split_data) == 2:
-                    number, content = split_data
-                    if int(number) <= course_number:
-                        selected_scriptures[i].append(content)
+        selected_scriptures = [corpus_library.course_selection(entry.name, course_number) for entry in days]
         course = str(course_number) + "과정"
         course_label.config(text = course, padx = 18)
+    else:
+        selected_scriptures = [[] for _ in days]
+        course_label.config(text = "", padx = 0)
+    # 이미 고른 일차가 있으면 바뀐 과정으로 다시 불러온다
+    if engine.source:
+        select_day(day_num)
 
 def create_slider_window(title, min_value, max_value, update_func):
     """슬라이더를 표시하는 새 창을 생성."""
@@ -694,15 +846,18 @@ def create_slider_window(title, min_value, max_value, update_func):
     slider.pack(padx=10, pady=10)
 
 def skip_problem():
-    display_problem(current_mode)
+    if engine.skip() is not None:
+        show_problem_text()
 
 def mode_info():
     messagebox.showinfo("도움말",
-                        "시작하는 방법 : 일차를 선택하여 목록에 추가 -> 모드 선택\n\n"
+                        "시작하는 방법 : 일차를 선택하여 목록에 추가 -> 모드 선택\n"
+                        "(검색 메뉴 [ Ctrl+F ] 에서 단어/장절로 찾은 구절만 암송할 수도 있습니다.)\n\n"
                         "구절이 표시되는 텍스트박스에는 답을 입력할 수 없습니다.\n"
                         "구절 텍스트박스 아래에 있는 답안 텍스트박스에 입력해 주세요.\n\n"
                         "제출 : [ Space / Enter ]\n"
                         "문자 그대로 일치해야 정답이 인정됩니다.\n"
+                        "(채점 메뉴에서 띄어쓰기/문장부호 무시, 오타 허용을 고를 수 있습니다.)\n"
                         "세 번 틀린 후에 정답이 공개됩니다.\n\n"
                         "한 어절 이상 공개된 구절은 틀린 구절 목록에 저장되며,\n"
                         "틀린 구절만 복습할 수 있습니다.\n\n"
@@ -718,17 +873,80 @@ def show_about():
 # 메뉴바 생성
 menu_bar = tk.Menu(root)
 
-# '일차' 메뉴 생성
+# '일차' 메뉴 생성 (항목은 코퍼스 색인을 연 뒤 build_day_menu 에서 채운다)
 day_menu = tk.Menu(menu_bar, tearoff=0)
 
-day_menu.add_command(label="1일차 하나님 성경", command=lambda: select_day(1))
+def build_day_menu():
+    day_menu.delete(0, tk.END)
+    for entry in corpus_library.days():
+        day_menu.add_command(label=entry.label, command=lambda num=entry.day: select_day(num))
 
-day_menu.add_command(label="전체", command=lambda : select_day(1))  # 전체도 1일차
-day_menu.add_separator()
-day_menu.add_command(label="초기화", command=lambda : day_reset())
+    day_menu.add_command(label="전체", command=lambda : select_day(None))
+    day_menu.add_separator()
+    day_menu.add_command(label="초기화", command=lambda : day_reset())
 
 menu_bar.add_cascade(label="일차", menu=day_menu)
 
+# '과정' 메뉴: 열 때마다 일차 코퍼스들의 과정 색인에서 과정 번호를 모은다
+def build_course_menu():
+    course_menu.delete(0, tk.END)
+    course_menu.add_command(label="전체 구절", command=lambda : select_course(0))
+    if corpus_library is None:
+        return
+    levels = sorted({c for e in corpus_library.days() for c in corpus_library.course_index(e.name).levels})
+    if levels:
+        course_menu.add_separator()
+    for c in levels:
+        course_menu.add_command(label=f"{c}과정까지", command=lambda num=c: select_course(num))
+
+course_menu = tk.Menu(menu_bar, tearoff=0, postcommand=build_course_menu)
+menu_bar.add_cascade(label="과정", menu=course_menu)
+menu_bar.add_command(label="검색", command=open_search_popup)
+root.bind("<Control-f>", lambda e: open_search_popup())
+
+# '채점' 메뉴: 얼마나 너그럽게 채점할지
+grading_level_var = tk.IntVar(value=engine.grader.level)
+grading_menu = tk.Menu(menu_bar, tearoff=0)
+for level, label in LEVEL_NAMES.items():
+    grading_menu.add_radiobutton(label=label, value=level, variable=grading_level_var,
+                                 command=lambda: setattr(engine.grader, "level", grading_level_var.get()))
+grading_menu.add_separator()
+grading_menu.add_checkbutton(label="여러 어절 한 번에 입력 (Enter 로 제출)", variable=stream_input_var)
+menu_bar.add_cascade(label="채점", menu=grading_menu)
+
+# '측정' 메뉴: 지연 시간 계측 켜기/끄기, 트레이스 기록/저장 (측정 창은 Ctrl+Shift+D)
+instrument_var = tk.BooleanVar(value=probe.enabled)
+trace_var = tk.BooleanVar(value=probe.trace)
+
+def set_instrument():
+    probe.enabled = instrument_var.get() or trace_var.get()
+
+def set_trace():
+    probe.trace = trace_var.get()
+    if probe.trace:
+        instrument_var.set(True)
+    set_instrument()
+
+def save_trace():
+    from tkinter import filedialog
+    path = filedialog.asksaveasfilename(parent=root, title="트레이스 저장", defaultextension=".json",
+                                        initialfile="bible-trace.json", filetypes=[("Chrome trace", "*.json")])
+    if not path:
+        return
+    try:
+        n = probe.export_trace(path)
+    except OSError as e:
+        messagebox.showerror("오류", f"트레이스를 저장하지 못했습니다.\n{e}")
+        return
+    messagebox.showinfo("완료", f"이벤트 {n}개를 저장했습니다.\nchrome://tracing 또는 Perfetto 에서 열 수 있습니다.")
+
+instrument_menu = tk.Menu(menu_bar, tearoff=0)
+instrument_menu.add_checkbutton(label="지연 시간 측정", variable=instrument_var, command=set_instrument)
+instrument_menu.add_checkbutton(label="트레이스 기록", variable=trace_var, command=set_trace)
+instrument_menu.add_command(label="트레이스 저장...", command=save_trace)
+instrument_menu.add_command(label="측정 초기화", command=probe.reset)
+menu_bar.add_cascade(label="측정", menu=instrument_menu)
+
 menu_bar.add_command(label="정보", command=show_about)
 root.bind("<F1>", lambda e: show_about())
 
@@ -742,7 +960,6 @@ root.config(menu=menu_bar)
 mode_buttons_frame = tk.Frame(root)
 mode_buttons_frame.grid(row=0, column=0, sticky="we", padx=12, pady=(8, 4))
 
-blank_num = 5
 blank_mode_button = tk.Button(mode_buttons_frame, text="빈칸 모드", command=lambda: blank_level())
 blank_mode_button.pack(side=tk.LEFT, padx=5)
 
@@ -761,14 +978,16 @@ info_button.pack(side=tk.LEFT, padx=5)
 text_frame = tk.Frame(root)
 text_frame.grid(row=3, column=0, sticky="we", padx=12, pady=(0, 8))
 
-left_verse = 0
-left_verse_label = tk.Label(text_frame, text="남은 구절 : "+str(left_verse))
+left_verse_label = tk.Label(text_frame, text="남은 구절 : "+str(engine.left_verse))
 left_verse_label.pack(side=tk.LEFT, padx=5)
 
-fail_num = 0
-fail_num_label = tk.Label(text_frame, text="틀린 갯수 : "+str(fail_num))
+fail_num_label = tk.Label(text_frame, text="틀린 갯수 : "+str(engine.fail_num))
 fail_num_label.pack(side=tk.LEFT)
 
+# 고른 과정 (과정 메뉴에서 고르면 'N과정')
+course_label = tk.Label(text_frame, text="")
+course_label.pack(side=tk.LEFT)
+
 reset_button = tk.Button(text_frame, text="초기화", command=day_reset)
 reset_button.pack(side=tk.LEFT, padx=5)
 
@@ -778,8 +997,92 @@ skip_button.pack(side=tk.LEFT, padx=5)
 wrong_verses_button = tk.Button(text_frame, text="틀린 구절", command=show_wrong_verses)
 wrong_verses_button.pack(side=tk.RIGHT, padx=5)
 
-current_mode = 1
-problem_num = 0
-problem_completed = False
-display_problem(current_mode)
+# 측정 창 (숨김, Ctrl+Shift+D): 제출 -> 화면 반영 지연 등을 OVERLAY_REFRESH_MS 마다 갱신
+OVERLAY_REFRESH_MS = 500
+OVERLAY_ROWS = ("submit_to_render", "submit_answer", "replace_blanks", "display_problem", "create_problem")
+debug_overlay = tk.Label(root, bg="#202020", fg="#7CFC00", font=("Consolas", 10), justify=tk.LEFT)
+overlay_job = None
+
+def update_overlay():
+    global overlay_job
+    rows = []
+    for name in OVERLAY_ROWS:
+        s = probe.summary(name)
+        if s is not None:
+            rows.append(f"{name:<17} p50 {s['p50_ms']:7.2f}  p99 {s['p99_ms']:7.2f} ms  ({s['count']})")
+    debug_overlay.config(text="\n".join(rows) or "측정 중... (답을 제출해 보세요)")
+    overlay_job = root.after(OVERLAY_REFRESH_MS, update_overlay)
+
+def toggle_overlay(event=None):
+    global overlay_job
+    if overlay_job is not None:
+        root.after_cancel(overlay_job)
+        overlay_job = None
+        debug_overlay.place_forget()
+        return
+    instrument_var.set(True)
+    set_instrument()
+    debug_overlay.place(relx=1.0, y=0, anchor="ne")
+    debug_overlay.lift()
+    update_overlay()
+
+root.bind("<Control-D>", toggle_overlay)  # Shift 를 누르면 keysym 이 대문자
+
+if probe.trace_path:
+    import atexit
+
+    def export_trace_at_exit():
+        try:
+            probe.export_trace(probe.trace_path)
+        except Exception:
+            pass
+    atexit.register(export_trace_at_exit)
+
+startup.mark("widgets")
+
+def load_startup_data():
+    """창이 뜬 뒤에 하는 시작 작업: 아이콘, 코퍼스 색인, 일차 메뉴, 복습 저장소."""
+    global corpus_library, selected_scriptures, review_store
+    load_icon()
+    startup.mark("icon")
+    corpus_library = load_corpus_library()
+    selected_scriptures = [[] for _ in corpus_library.days()]
+    build_day_menu()
+    startup.mark("corpus")
+    review_store = open_review_store()
+    engine.review = review_store
+    event_log = open_event_log()
+    if event_log is not None:
+        engine.set_event_log(event_log)
+    engine.stats = open_verse_stats()
+    startup.mark("review store")
+    # 사용자가 답을 입력하는 동안 다음 문제를 미리 만들어 둔다
+    engine.enable_prefetch()
+    startup.mark("engine")
+    try:
+        if startup.enabled and corpus_library.days():
+            # 측정: 첫 일차를 골라 첫 문제까지
+            select_day(corpus_library.days()[0].day)
+            display_problem(engine.mode)
+            startup.mark("first problem")
+        else:
+            display_problem(engine.mode)
+    finally:
+        startup.finish()
+        exit_if_profiled()
+
+def on_first_map(event):
+    if event.widget is root:
+        root.unbind("<Map>")
+        startup.window_shown()
+        exit_if_profiled()
+
+def exit_if_profiled():
+    # --startup-exit: 보고를 마치면 바로 종료
+    if startup.exit_when_done and startup.reported:
+        root.after(0, root.destroy)
+
+root.bind("<Map>", on_first_map)
+# 창을 먼저 그리고(idle), 그다음 이벤트 차례에 나머지를 읽는다
+root.after_idle(lambda: root.after(0, load_startup_data))
 root.mainloop()
@@ -0,0 +1,68 @@
+# -*- mode: python ; coding: utf-8 -*-
+# onedir + 바이트코드 최적화 빌드:  pyinstaller bible_onedir.spec
+# 실행할 때마다 임시 폴더에 압축을 풀지 않고(UPX 도 끔), 구절 데이터는 미리 컴파일한 .bvc 만 싣는다.
+# 어느 빌드가 빠른지는 measure_launch.py 로 잰다.
+import glob
+import os
+import sys
+
+sys.path.insert(0, SPECPATH)
+from corpus_cache import CACHE_SUFFIX, compile_corpus
+
+# data/*.txt -> build/corpus/*.bvc
+corpus_dir = os.path.join(SPECPATH, 'build', 'corpus')
+os.makedirs(corpus_dir, exist_ok=True)
+corpus_datas = []
+for src in sorted(glob.glob(os.path.join(SPECPATH, 'data', '*.txt'))):
+    out = os.path.join(corpus_dir, os.path.splitext(os.path.basename(src))[0] + CACHE_SUFFIX)
+    compile_corpus(src, out)
+    corpus_datas.append((out, 'data'))
+
+# GUI 에서 쓰지 않는 표준 라이브러리
+excludes = [
+    'unittest', 'doctest', 'pydoc', 'pdb', 'test', 'tkinter.test', 'lib2to3', 'distutils',
+    'xmlrpc', 'ftplib', 'smtplib', 'imaplib', 'poplib', 'asyncio', 'multiprocessing',
+    'tracemalloc', 'bench',
+]
+
+a = Analysis(
+    ['bible.py'],
+    pathex=[],
+    binaries=[],
+    datas=corpus_datas,
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=excludes,
+    noarchive=False,
+    optimize=2,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='bible_onedir',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='bible_onedir',
+)
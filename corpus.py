@@ -0,0 +1,216 @@
+"""
+암송 구절 코퍼스: '(ref)^본문' 줄을 읽어 미리 토큰화/정규화한 Verse 로 만든다.
+
+문제를 만들 때마다 split/정규식을 다시 돌리지 않도록,
+마스크 렌더링과 정답 토큰, 장절 파싱 결과를 로드 시점에 한 번만 계산한다.
+"""
+import re
+from functools import lru_cache
+
+WORD_TOKEN_RE = re.compile(r'[0-9A-Za-z가-힣]')   # 글자가 하나라도 있는지
+WORD_RUN_RE = re.compile(r'[0-9A-Za-z가-힣]+')
+PUNCT_RE = re.compile(r'[,\-/]')                 # 쉼표/하이픈/슬래시 무시
+COURSE_SEP = "\\"                                 # 'N\(ref)^본문': N과정부터 외우는 구절
+# 코퍼스 장절 형식: (책 장:절), 절은 '38' / '38-39' / '37,39,41'
+REF_RE = re.compile(r'^\((\S+) (\d+):(\d+(?:-\d+|(?:,\d+)+)?)\)$')
+
+def norm_token(s: str) -> str:
+    """채점 및 정답 저장용: 쉼표/하이픈/슬래시 제거."""
+    return PUNCT_RE.sub('', s).strip()
+
+def mask_len_keep_punct(tok: str) -> str:
+    """모드1: 길이 힌트 O, 문장부호는 그대로."""
+    return WORD_RUN_RE.sub(lambda m: '_' * len(m.group(0)), tok)
+
+def mask_one_keep_punct(tok: str) -> str:
+    """모드2/4: 길이 힌트 X, 문장부호는 그대로."""
+    return WORD_RUN_RE.sub('_', tok)
+
+def parse_ref_parts(ref: str):
+    """
+    '(요 5:38-39)' -> ('요','5','38-39')
+    항상 괄호로 들어온다고 가정.
+    """
+    s = ref.strip()[1:-1]  # 괄호 제거
+    book, chap_verse = s.split()
+    chap, verse = chap_verse.split(':', 1)
+    return book, chap, verse
+
+def split_verse_parts(verse: str):
+    """
+    '38-39' -> ('_-_', ['38','39'])
+    '37,39' -> ('_,_', ['37','39'])
+    '39'    -> ('_',   ['39'])
+    """
+    if '-' in verse:
+        a, b = verse.split('-', 1)
+        return '_-_', [a, b]
+    if ',' in verse:
+        parts = [p.strip() for p in verse.split(',') if p.strip()]
+        # 파트 개수만큼 '_'와 ','를 섞어 마스크 문자열 생성 (예: '_,_,_' 등)
+        mask = ','.join(['_'] * len(parts))
+        return mask, parts
+    return '_', [verse]
+
+def ref_masked(ref: str, masked: bool) -> str:
+    """
+    masked=False: 원문 장절 그대로 (괄호 유지)
+    masked=True : 책/장 가리고 절은 split 규칙에 맞춘 마스크, (괄호 유지)
+                  예: (요 5:38-39) -> (_ _:_-_)
+                      (요 5:37,39) -> (_ _:_,_)
+                      (요 5:39)    -> (_ _:_)
+    """
+    book, chap, verse = parse_ref_parts(ref)
+    if not masked:
+        return f"({book} {chap}:{verse})"
+    verse_mask, _ = split_verse_parts(verse)
+    return f"(_ _:{verse_mask})"
+
+
+class Verse:
+    """
+    미리 컴파일된 구절 하나.
+
+    words      : 본문 어절 (verse.split())
+    maskable   : 글자가 있어 빈칸이 될 수 있는 어절 인덱스
+    norms      : 어절별 채점용 정규화 토큰 (norm_token)
+    answers    : maskable 순서대로의 정답 토큰 (모드2 정답)
+    len_masks  : 어절별 모드1 빈칸 (mask_len_keep_punct)
+    one_masks  : 어절별 모드2/4 빈칸 (mask_one_keep_punct, 문장부호만 있는 어절은 그대로)
+    book/chap/verse_no/verse_mask/verse_parts : 장절 파싱 결과
+    ref_view / ref_view_masked : 화면용 장절 (공개/마스크)
+    course     : 'N\\' 접두어의 과정 번호 (없으면 0, line 에는 접두어를 뺀 줄)
+    장절 형식이 잘못된 줄은 ref_error 에 사유를 담고 book 이 None 이다 (ref_view 는 적힌 장절 그대로, 모드1/2 만 가능).
+    """
+    __slots__ = (
+        "line", "reference", "text", "words", "maskable", "norms", "answers",
+        "len_masks", "one_masks", "book", "chap", "verse_no", "verse_mask",
+        "verse_parts", "ref_view", "ref_view_masked", "ref_error", "course",
+    )
+
+    def __init__(self, line, reference, text, words, maskable, norms, answers,
+                 len_masks, one_masks, book, chap, verse_no, verse_mask,
+                 verse_parts, ref_view, ref_view_masked, ref_error=None, course=0):
+        self.line = line
+        self.reference = reference
+        self.text = text
+        self.words = words
+        self.maskable = maskable
+        self.norms = norms
+        self.answers = answers
+        self.len_masks = len_masks
+        self.one_masks = one_masks
+        self.book = book
+        self.chap = chap
+        self.verse_no = verse_no
+        self.verse_mask = verse_mask
+        self.verse_parts = verse_parts
+        self.ref_view = ref_view
+        self.ref_view_masked = ref_view_masked
+        self.ref_error = ref_error
+        self.course = course
+
+    def __repr__(self):
+        return f"Verse({self.line!r})"
+
+    def check_reference(self):
+        """장절 파싱에 실패한 구절이면 ValueError."""
+        if self.book is None:
+            raise ValueError(f"장절 형식 오류: {self.reference} ({self.ref_error})")
+
+@lru_cache(maxsize=1 << 16)
+def token_info(w: str):
+    """어절 하나의 (정규화 토큰, 모드1 빈칸, 모드2/4 빈칸, 빈칸 가능 여부). 같은 어절은 한 번만 계산."""
+    return norm_token(w), mask_len_keep_punct(w), mask_one_keep_punct(w), WORD_TOKEN_RE.search(w) is not None
+
+def split_course(line: str):
+    """'3\\(요 4:24)^...' -> (3, '(요 4:24)^...'). 접두어가 없거나 숫자가 아니면 (0, line)."""
+    number, sep, rest = line.partition(COURSE_SEP)
+    if sep and number.strip().isdigit():
+        return int(number), rest
+    return 0, line
+
+def reference_error(reference: str):
+    """장절이 '(책 장:절)' 형식이 아니면 그 사유, 맞으면 None."""
+    if REF_RE.match(reference):
+        return None
+    return "'(책 장:절)' 형식이어야 합니다"
+
+def build_verse(reference: str, words, text=None, course=0) -> Verse:
+    """
+    장절과 어절 목록으로 Verse 를 만든다. text 가 없으면 어절을 공백으로 이어 붙인다.
+    line 은 text 와 상관없이 어절을 공백 하나로 이어 만든다: 복습/통계가 line 을 키로 쓰므로
+    txt 에서 읽든 .bvc 에서 읽든 같은 구절이면 같은 line 이어야 한다.
+    """
+    words = tuple(words)
+    joined = " ".join(words)
+    if text is None:
+        text = joined
+    infos = [token_info(w) for w in words]
+
+    maskable = tuple(i for i, info in enumerate(infos) if info[3])
+    norms = tuple(info[0] for info in infos)
+    answers = tuple(norms[i] for i in maskable)
+    len_masks = tuple(info[1] for info in infos)
+    one_masks = tuple(info[2] for info in infos)
+    line = reference + "^" + joined
+
+    ref_error = reference_error(reference)
+    if ref_error is not None:
+        return Verse(line, reference, text, words, maskable, norms, answers,
+                     len_masks, one_masks, None, None, None, None, (), reference, None,
+                     ref_error=ref_error, course=course)
+    book, chap, verse_no = parse_ref_parts(reference)
+    verse_mask, verse_parts = split_verse_parts(verse_no)
+    return Verse(
+        line, reference, text, words, maskable, norms, answers,
+        len_masks, one_masks, book, chap, verse_no, verse_mask, tuple(verse_parts),
+        f"({book} {chap}:{verse_no})", f"(_ _:{verse_mask})", course=course,
+    )
+
+def compile_verse(line: str) -> Verse:
+    """'(ref)^본문' 또는 'N\\(ref)^본문' 한 줄을 Verse 로 컴파일한다."""
+    course, line = split_course(line.strip())
+    reference, text = line.split('^')
+    return build_verse(reference, text.split(), text, course)
+
+def as_verse(item) -> Verse:
+    """문자열이면 컴파일, 이미 Verse 면 그대로."""
+    return item if isinstance(item, Verse) else compile_verse(item)
+
+def parse_line(line: str):
+    """
+    코퍼스 한 줄 -> (과정 번호, 장절, 본문). '^' 나 본문이 틀리면 사유를 담은 ValueError.
+    장절 형식은 여기서 보지 않는다 (build_verse 가 ref_error 로 표시하고, 장절 모드에서만 뺀다).
+    """
+    course, rest = split_course(line.strip())
+    carets = rest.count('^')
+    if carets != 1:
+        raise ValueError("'^' 가 없습니다" if not carets else f"'^' 가 {carets}개입니다")
+    reference, text = rest.split('^')
+    if not text.split():
+        raise ValueError("본문이 비어 있습니다")
+    return course, reference, text
+
+def read_corpus_lines(lines, errors=None):
+    """
+    코퍼스 줄들 중 올바른 줄마다 (줄 번호, 과정 번호, 장절, 본문). 빈 줄은 건너뛴다.
+    '^' 나 본문이 틀린 줄은 세션 도중에 문제를 만들다 멈추지 않도록 빼고, errors 가 있으면 (줄 번호, 줄, 사유)를 담는다.
+    장절만 틀린 줄은 빼지 않는다 (모드1/2 로는 풀 수 있다).
+    """
+    for no, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            course, reference, text = parse_line(line)
+        except ValueError as e:
+            if errors is not None:
+                errors.append((no, line.rstrip("\r\n"), str(e)))
+            continue
+        yield no, course, reference, text
+
+def load_verses(path, errors=None):
+    """txt 코퍼스 파일 하나를 읽어 Verse 리스트로 (틀린 줄은 뺀다)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [build_verse(reference, text.split(), text, course)
+                for _, course, reference, text in read_corpus_lines(f, errors)]
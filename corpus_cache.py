@@ -0,0 +1,282 @@
+"""
+컴파일된 코퍼스 캐시 (.bvc): '(ref)^본문' txt 를 바이너리로 한 번 변환해 두고 mmap 으로 연다.
+
+파일 구조 (little-endian)
+  헤더       : magic, 버전, 원본 mtime/크기/sha256, 구절/문자열/토큰 수, 형식 오류로 뺀 줄 수, 각 구역 오프셋
+  문자열 표  : (n_strings + 1) x u32, 문자열 풀 안의 시작 위치
+  문자열 풀  : 중복 제거(intern)된 어절/장절 utf-8 바이트
+  구절 표    : n_verses x (장절 문자열 id u32, 토큰 시작 u32, 토큰 수 u32, 과정 번호 u32)
+  토큰 표    : n_tokens x u32 (문자열 id)
+
+열 때는 헤더만 읽고, 구절은 뽑힐 때(__getitem__) 필요한 부분만 디코드한다.
+그래서 코퍼스가 커져도 시작 시간과 메모리가 거의 늘지 않는다.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from itertools import accumulate
+
+from corpus import build_verse, load_verses, read_corpus_lines
+
+MAGIC = b"BVC1"
+VERSION = 4  # 2: 구절 표에 과정 번호, 3: 뺀 줄 수, 4: 장절만 틀린 줄은 빼지 않음
+CACHE_SUFFIX = ".bvc"
+
+# magic, version, flags, src_mtime_ns, src_size, src_sha256,
+# n_verses, n_strings, n_tokens, n_dropped, off_stroffs, off_pool, off_verses, off_tokens
+HEADER = struct.Struct("<4sHHQQ32sIIIIQQQQ")
+VERSE_ENTRY = struct.Struct("<4I")
+VERSE_ENTRY_WORDS = 4  # 구절 표 한 항목의 u32 수
+
+
+def cache_path_for(src_path):
+    """data/day1.txt -> data/day1.bvc"""
+    return os.path.splitext(src_path)[0] + CACHE_SUFFIX
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.digest()
+
+def _read_header(cache_path):
+    try:
+        with open(cache_path, "rb") as f:
+            raw = f.read(HEADER.size)
+    except OSError:
+        return None
+    if len(raw) != HEADER.size:
+        return None
+    header = HEADER.unpack(raw)
+    if header[0] != MAGIC or header[1] != VERSION:
+        return None
+    return header
+
+def is_cache_valid(src_path, cache_path):
+    """
+    캐시가 원본과 일치하는지.
+    mtime/크기가 같으면 바로 통과, mtime 만 다르면(복사/압축 해제 등) sha256 으로 확인하고,
+    내용이 같으면 헤더의 mtime 을 새로 써서 다음부터는 다시 해시하지 않는다.
+    """
+    header = _read_header(cache_path)
+    if header is None:
+        return False
+    st = os.stat(src_path)
+    _, _, _, mtime_ns, size, sha, *_ = header
+    if size != st.st_size:
+        return False
+    if mtime_ns == st.st_mtime_ns:
+        return True
+    if sha != _file_sha256(src_path):
+        return False
+    _touch_header(cache_path, header, st)
+    return True
+
+def _touch_header(cache_path, header, st):
+    """헤더의 원본 mtime/크기만 st 로 바꿔 쓴다 (나머지는 그대로). 쓸 수 없으면 그냥 둔다."""
+    fields = list(header)
+    fields[3] = st.st_mtime_ns
+    fields[4] = st.st_size
+    try:
+        with open(cache_path, "r+b") as f:
+            f.write(HEADER.pack(*fields))
+    except OSError:
+        pass
+
+def cached_verse_count(src_path, cache_path=None):
+    """캐시가 원본과 mtime/크기까지 같으면 헤더의 구절 수, 아니면 None (해시는 계산하지 않음)."""
+    header = _read_header(cache_path or cache_path_for(src_path))
+    if header is None:
+        return None
+    try:
+        st = os.stat(src_path)
+    except OSError:
+        return header[6]  # 컴파일본만 있는 경우
+    if header[3] != st.st_mtime_ns or header[4] != st.st_size:
+        return None
+    return header[6]
+
+
+def read_source(src_path):
+    """txt 코퍼스의 (stat, 내용 바이트, sha256) (컴파일본 헤더에 원본 정보를 남기기 위해)."""
+    st = os.stat(src_path)
+    with open(src_path, "rb") as f:
+        data = f.read()
+    return st, data, hashlib.sha256(data).digest()
+
+def compile_corpus(src_path, cache_path=None, errors=None):
+    """
+    txt 코퍼스를 .bvc 로 컴파일한다(임시 파일에 쓴 뒤 교체). 쓴 경로를 돌려준다.
+    형식이 틀린 줄은 빼고 컴파일하며, errors 가 있으면 (줄 번호, 줄, 사유)를 담는다.
+    """
+    cache_path = cache_path or cache_path_for(src_path)
+    errors = [] if errors is None else errors
+    st, data, sha = read_source(src_path)
+    rows = ((course, reference, text.split())
+            for _, course, reference, text in read_corpus_lines(data.decode("utf-8").splitlines(), errors))
+    return write_compiled(cache_path, rows, st, sha, errors)
+
+def write_compiled(cache_path, rows, st, sha, errors=None):
+    """
+    (과정 번호, 장절, 어절 목록) 들을 .bvc 로 쓴다. st/sha 는 원본 txt 의 stat 과 sha256.
+    errors 는 rows 를 만들며 채운 형식 오류 목록으로, 그 수를 헤더에 남긴다 (열 때마다 알릴 수 있게).
+    """
+    strings = {}          # 문자열 -> id (intern, 넣은 순서가 곧 id)
+    verse_table = array("I")
+    tokens = array("I")
+    get = strings.get
+
+    def intern(s):
+        sid = get(s)
+        if sid is None:
+            sid = strings[s] = len(strings)
+        return sid
+
+    for course, reference, words in rows:
+        verse_table.extend((intern(reference), len(tokens), len(words), course))
+        tokens.extend(map(intern, words))
+
+    # 문자열 풀은 마지막에 한 번에 인코딩해 이어 붙인다
+    encoded = [s.encode("utf-8") for s in strings]
+    str_offsets = array("I", accumulate(map(len, encoded), initial=0))
+    pool = b"".join(encoded)
+
+    if sys.byteorder == "big":
+        for arr in (str_offsets, verse_table, tokens):
+            arr.byteswap()
+
+    off_stroffs = HEADER.size
+    off_pool = off_stroffs + 4 * len(str_offsets)
+    off_verses = off_pool + len(pool)
+    off_verses += -off_verses % 4  # u32 정렬
+    off_tokens = off_verses + 4 * len(verse_table)
+
+    header = HEADER.pack(
+        MAGIC, VERSION, 0, st.st_mtime_ns, st.st_size, sha,
+        len(verse_table) // VERSE_ENTRY_WORDS, len(strings), len(tokens), len(errors) if errors else 0,
+        off_stroffs, off_pool, off_verses, off_tokens,
+    )
+    # 같은 코퍼스를 여러 프로세스/스레드가 동시에 컴파일해도 서로의 임시 파일을 덮지 않게
+    tmp_path = f"{cache_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(str_offsets.tobytes())
+        f.write(pool)
+        f.write(b"\0" * (off_verses - off_pool - len(pool)))
+        f.write(verse_table.tobytes())
+        f.write(tokens.tobytes())
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+
+class CompiledCorpus:
+    """
+    mmap 으로 연 .bvc 코퍼스. list 처럼 len()/인덱싱을 지원하고,
+    인덱싱할 때마다 그 구절만 디코드해서 Verse 를 만든다.
+    """
+
+    def __init__(self, cache_path):
+        self.path = cache_path
+        self._file = open(cache_path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        header = HEADER.unpack_from(self._mm, 0)
+        if header[0] != MAGIC or header[1] != VERSION:
+            self.close()
+            raise ValueError(f"올바른 코퍼스 캐시가 아닙니다: {cache_path}")
+        (_, _, _, _, _, _, self.n_verses, self.n_strings, self.n_tokens, self.dropped,
+         self._off_stroffs, self._off_pool, self._off_verses, self._off_tokens) = header
+        self._strings = {}  # 디코드한 문자열 캐시 (id -> str)
+
+    def __len__(self):
+        return self.n_verses
+
+    def strings(self):
+        """문자열 표 전체 (id 순서의 리스트). 풀을 한 번에 읽어 자른다."""
+        offsets = self._table(self._off_stroffs, self.n_strings + 1)
+        pool = self._mm[self._off_pool:self._off_pool + offsets[-1]]
+        return [pool[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+    def raw_verses(self):
+        """
+        모든 구절의 (장절 문자열 id, 어절 문자열 id 들)을 차례로. Verse 를 만들지 않으므로
+        같은 어절은 한 번만 디코드하면 된다 (검색 색인 만들기용).
+        """
+        table = self._table(self._off_verses, VERSE_ENTRY_WORDS * self.n_verses)
+        tokens = self._table(self._off_tokens, self.n_tokens)
+        for k in range(0, len(table), VERSE_ENTRY_WORDS):
+            yield table[k], tokens[table[k + 1]:table[k + 1] + table[k + 2]]
+
+    def courses(self):
+        """구절별 과정 번호 (array, 접두어가 없던 구절은 0). 구절을 디코드하지 않는다."""
+        return self._table(self._off_verses, VERSE_ENTRY_WORDS * self.n_verses)[3::VERSE_ENTRY_WORDS]
+
+    def _table(self, offset, count):
+        """offset 부터 u32 count 개를 array 로."""
+        table = array("I")
+        table.frombytes(self._mm[offset:offset + 4 * count])
+        if sys.byteorder == "big":
+            table.byteswap()
+        return table
+
+    def _string(self, sid):
+        s = self._strings.get(sid)
+        if s is None:
+            start, end = struct.unpack_from("<2I", self._mm, self._off_stroffs + 4 * sid)
+            s = self._strings[sid] = self._mm[self._off_pool + start:self._off_pool + end].decode("utf-8")
+        return s
+
+    def _entry(self, i):
+        if i < 0:
+            i += self.n_verses
+        if not 0 <= i < self.n_verses:
+            raise IndexError("verse index out of range")
+        return VERSE_ENTRY.unpack_from(self._mm, self._off_verses + VERSE_ENTRY.size * i)
+
+    def reference(self, i):
+        """구절 전체를 디코드하지 않고 장절 문자열만."""
+        return self._string(self._entry(i)[0])
+
+    def words(self, i):
+        _, start, count, _ = self._entry(i)
+        ids = struct.unpack_from(f"<{count}I", self._mm, self._off_tokens + 4 * start)
+        return tuple(self._string(sid) for sid in ids)
+
+    def __getitem__(self, i):
+        ref_id, start, count, course = self._entry(i)
+        ids = struct.unpack_from(f"<{count}I", self._mm, self._off_tokens + 4 * start)
+        return build_verse(self._string(ref_id), (self._string(sid) for sid in ids), course=course)
+
+    def close(self):
+        mm, self._mm = getattr(self, "_mm", None), None
+        if mm is not None:
+            mm.close()
+        self._file.close()
+
+
+def open_corpus(src_path, cache_path=None, errors=None):
+    """
+    txt 코퍼스를 연다. 캐시가 없거나 낡았으면 다시 컴파일하고 mmap 으로 연다.
+    캐시를 쓸 수 없는 곳(읽기 전용 폴더 등)이면 txt 를 바로 읽은 Verse 리스트를 돌려준다.
+    errors 가 있으면 원본을 다시 읽을 때 형식 오류 (줄 번호, 줄, 사유)를 담는다.
+    유효한 캐시를 열면 비어 있고, 뺀 줄 수는 CompiledCorpus.dropped 로 안다.
+    """
+    cache_path = cache_path or cache_path_for(src_path)
+    if not os.path.exists(src_path) and _read_header(cache_path) is not None:
+        return CompiledCorpus(cache_path)  # 컴파일본만 배포된 경우
+    try:
+        if not is_cache_valid(src_path, cache_path):
+            compile_corpus(src_path, cache_path, errors)
+        return CompiledCorpus(cache_path)
+    except OSError:
+        if errors is not None:
+            del errors[:]  # 컴파일하다 실패했으면 txt 를 다시 읽으며 새로 채운다
+        return load_verses(src_path, errors)
@@ -0,0 +1,283 @@
+"""
+data/ 폴더의 코퍼스 목록과 일차별 지연 로딩.
+
+시작할 때는 파일 이름과 구절 수만 읽어 색인을 만들고 (컴파일본이 없거나 낡았으면 그때 컴파일해 둔다),
+각 일차의 내용은 처음 선택될 때 열어서 메모리 예산이 있는 LRU 캐시에 둔다.
+열기/컴파일과 캐시 갱신은 잠금 하나로 묶어 작업 스레드(검색 색인)에서 열어도 안전하다.
+"""
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+
+from corpus import read_corpus_lines
+from corpus_cache import (
+    CACHE_SUFFIX, cache_path_for, cached_verse_count, compile_corpus, is_cache_valid, open_corpus, CompiledCorpus,
+)
+
+DAY_FILE_RE = re.compile(r'^day(\d+)$', re.IGNORECASE)
+CORPUS_EXT = ".txt"
+DEFAULT_CACHE_BUDGET = 64 * 1024 * 1024  # 64MB
+
+# 메뉴에 붙는 일차 제목
+DAY_TITLES = {
+    1: "하나님 성경",
+}
+
+
+class CorpusEntry:
+    """
+    색인 한 줄: 코퍼스 이름, 파일 경로, 일차 번호(dayN 이 아니면 None), 구절 수.
+    dropped/errors 는 열어 본 뒤에 채운다: 형식 오류로 뺀 줄 수와 (다시 컴파일했으면) 그 줄들.
+    """
+    __slots__ = ("name", "path", "day", "count", "dropped", "errors")
+
+    def __init__(self, name, path, day, count):
+        self.name = name
+        self.path = path
+        self.day = day
+        self.count = count
+        self.dropped = 0
+        self.errors = []
+
+    @property
+    def label(self):
+        if self.day is None:
+            return self.name
+        title = DAY_TITLES.get(self.day)
+        return f"{self.day}일차 {title}" if title else f"{self.day}일차"
+
+    def __repr__(self):
+        return f"CorpusEntry({self.name!r}, day={self.day}, count={self.count})"
+
+
+def count_verses(path):
+    """
+    구절 수: 유효한 캐시가 있으면 헤더에서 읽는다.
+    없거나 낡았으면 여기서 컴파일해 두어 다음 시작부터는 헤더만 읽는다 (처음 열 때도 다시 컴파일하지 않는다).
+    컴파일할 수 없으면(읽기 전용 폴더 등) 로딩과 같은 규칙으로 올바른 줄만 센다.
+    """
+    n = cached_verse_count(path)
+    if n is not None:
+        return n
+    cache_path = cache_path_for(path)
+    try:
+        if not is_cache_valid(path, cache_path):
+            compile_corpus(path, cache_path)
+        n = cached_verse_count(path, cache_path)
+    except (OSError, ValueError):
+        n = None
+    if n is not None:
+        return n
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return sum(1 for _ in read_corpus_lines(f))
+
+def discover_corpora(data_dir):
+    """
+    data_dir 의 *.txt 를 찾아 색인(CorpusEntry 리스트)을 만든다. dayN 먼저, 번호 순.
+    txt 없이 컴파일본(.bvc)만 배포된 코퍼스도 같은 이름의 txt 경로로 색인한다.
+    """
+    entries = []
+    try:
+        names = os.listdir(data_dir)
+    except OSError:
+        return entries
+    stems = {}
+    for fname in names:
+        stem, ext = os.path.splitext(fname)
+        if ext.lower() == CORPUS_EXT:
+            stems[stem] = fname
+        elif ext.lower() == CACHE_SUFFIX:
+            stems.setdefault(stem, stem + CORPUS_EXT)
+    for stem, fname in stems.items():
+        path = os.path.join(data_dir, fname)
+        m = DAY_FILE_RE.match(stem)
+        entries.append(CorpusEntry(stem, path, int(m.group(1)) if m else None, count_verses(path)))
+    entries.sort(key=lambda e: (e.day is None, e.day or 0, e.name))
+    return entries
+
+
+class ChainedCorpus:
+    """여러 코퍼스를 하나처럼 인덱싱 ('전체' 선택용). 각 구절은 접근할 때 디코드된다."""
+
+    def __init__(self, parts):
+        self.parts = list(parts)
+        self._starts = []
+        total = 0
+        for p in self.parts:
+            self._starts.append(total)
+            total += len(p)
+        self._len = total
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("verse index out of range")
+        k = bisect_right(self._starts, i) - 1
+        return self.parts[k][i - self._starts[k]]
+
+
+class Selection:
+    """원본 시퀀스의 일부(구절 번호 목록)를 시퀀스처럼. 구절은 꺼낼 때 디코드된다."""
+
+    def __init__(self, source, ids):
+        self.source = source
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        return self.source[self.ids[i]]
+
+
+class CourseIndex:
+    """
+    코퍼스 하나의 과정 색인. 'N\\' 접두어가 있는 구절 번호를 과정 순(같은 과정 안에서는 원래 순서)으로
+    order 에 모아 두고, ends[k] 는 levels[k] 과정까지의 구절 수다.
+    N과정까지의 구절 = order 의 앞 부분이므로 과정을 바꿀 때 코퍼스를 다시 훑지 않는다.
+    """
+
+    def __init__(self, courses):
+        counts = {}
+        for c in courses:
+            if c:
+                counts[c] = counts.get(c, 0) + 1
+        self.levels = sorted(counts)
+        self.ends = []
+        starts = {}
+        total = 0
+        for c in self.levels:
+            starts[c] = total
+            total += counts[c]
+            self.ends.append(total)
+        # 과정별 시작 위치에 채워 넣는 카운팅 정렬: O(n)
+        order = array('I', bytes(4 * total))
+        for i, c in enumerate(courses):
+            if c:
+                order[starts[c]] = i
+                starts[c] += 1
+        self.order = order
+
+    def upto(self, course):
+        """course 과정까지의 구절 번호들 (복사 없는 memoryview)."""
+        k = bisect_right(self.levels, course)
+        return memoryview(self.order)[:self.ends[k - 1] if k else 0]
+
+
+def course_index(corpus):
+    """CompiledCorpus 는 구절 표의 과정 열만 읽고, Verse 리스트는 course 속성으로."""
+    if isinstance(corpus, CompiledCorpus):
+        return CourseIndex(corpus.courses())
+    return CourseIndex([v.course for v in corpus])
+
+
+class CorpusLibrary:
+    """
+    코퍼스 색인 + 지연 로딩 LRU 캐시.
+    budget_bytes 는 열어 둔 코퍼스들의 대략적인 크기 합 상한(컴파일본 파일 크기 기준).
+    예산을 넘으면 가장 오래 안 쓴 코퍼스부터 캐시에서 뺀다(사용 중인 세션은 계속 참조 가능).
+    """
+
+    def __init__(self, data_dir, budget_bytes=DEFAULT_CACHE_BUDGET):
+        self.data_dir = data_dir
+        self.budget_bytes = budget_bytes
+        self.entries = discover_corpora(data_dir)
+        self._by_name = {e.name: e for e in self.entries}
+        self._cache = OrderedDict()  # name -> (corpus, cost)
+        self._cached_bytes = 0
+        self._courses = {}           # name -> (corpus, CourseIndex)
+        self._lock = threading.RLock()  # _cache / _courses / 컴파일
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def entry(self, name):
+        return self._by_name[name]
+
+    def day_entry(self, day):
+        """일차 번호로 색인 찾기 (없으면 None)."""
+        for e in self.entries:
+            if e.day == day:
+                return e
+        return None
+
+    def days(self):
+        return [e for e in self.entries if e.day is not None]
+
+    def load(self, name):
+        """코퍼스 하나를 (처음이면 열어서) 돌려준다."""
+        with self._lock:
+            hit = self._cache.get(name)
+            if hit is not None:
+                self._cache.move_to_end(name)
+                return hit[0]
+            e = self._by_name[name]
+            errors = []
+            corpus = open_corpus(e.path, errors=errors)
+            e.count = len(corpus)
+            e.dropped = corpus.dropped if isinstance(corpus, CompiledCorpus) else len(errors)
+            e.errors = errors
+            cost = self._cost(e, corpus)
+            self._cache[name] = (corpus, cost)
+            self._cached_bytes += cost
+            self._evict()
+            return corpus
+
+    def open_uncached(self, name):
+        """
+        코퍼스 하나를 LRU 캐시에 넣지 않고 연다 (이미 캐시에 있으면 그것을 쓰되 순서는 그대로).
+        검색 색인처럼 오래 들고 있는 쪽이 일차 캐시를 밀어내거나 예산 계산에 끼지 않게 한다.
+        """
+        with self._lock:
+            hit = self._cache.get(name)
+            if hit is not None:
+                return hit[0]
+            return open_corpus(self._by_name[name].path)
+
+    def course_index(self, name):
+        """코퍼스 하나의 과정 색인 (처음 한 번 만들고, 그 코퍼스를 다시 열기 전까지 재사용)."""
+        with self._lock:
+            corpus = self.load(name)
+            hit = self._courses.get(name)
+            if hit is None or hit[0] is not corpus:
+                hit = self._courses[name] = (corpus, course_index(corpus))
+            return hit[1]
+
+    def course_selection(self, name, course):
+        """name 코퍼스에서 course 과정까지의 구절들 (QuizEngine.load 에 바로 넣을 수 있는 시퀀스)."""
+        return Selection(self.load(name), self.course_index(name).upto(course))
+
+    def load_all(self, entries=None):
+        """여러 코퍼스(기본: 모든 일차)를 이어 붙인 시퀀스."""
+        entries = self.days() if entries is None else entries
+        return ChainedCorpus(self.load(e.name) for e in entries)
+
+    def _cost(self, e, corpus):
+        if isinstance(corpus, CompiledCorpus):
+            return os.path.getsize(corpus.path)
+        # txt 를 바로 읽은 경우: 원본 크기의 몇 배를 Python 객체로 잡는다고 본다
+        try:
+            return 8 * os.path.getsize(e.path)
+        except OSError:
+            return 0
+
+    def _evict(self):
+        # 방금 넣은 것 하나는 예산을 넘어도 남긴다
+        while self._cached_bytes > self.budget_bytes and len(self._cache) > 1:
+            name, (_, cost) = self._cache.popitem(last=False)
+            self._cached_bytes -= cost
+            self._courses.pop(name, None)
+
+    def cached_names(self):
+        with self._lock:
+            return list(self._cache)
@@ -0,0 +1,198 @@
+"""
+코퍼스 검사/컴파일 도구: data/ 의 txt 코퍼스를 프로세스 풀로 한꺼번에 검사하고 .bvc 로 컴파일한다.
+
+    python corpus_tool.py                      # data/ 전체 검사 + 원본 옆에 .bvc
+    python corpus_tool.py data other/ -j 8     # 여러 폴더/파일, 작업 프로세스 8개
+    python corpus_tool.py --check --strict     # 쓰지 않고 검사만, 오류가 있으면 종료 코드 1
+    python corpus_tool.py --out build/corpus   # 컴파일본을 다른 폴더에 (폴더 구조 유지)
+    python corpus_tool.py --json report.json   # 결과를 JSON 으로도
+
+파일마다 줄 단위 오류('^' 개수, 빈 본문), 장절 형식 오류, 같은 장절이 두 번 나오는 곳(파일 안/파일 사이),
+구절/어절/고유 어절/과정별 구절 수를 보고한다. 틀린 줄은 빼고 컴파일하므로 앱이 세션 도중에 멈추지 않는다.
+장절만 틀린 줄은 컴파일에 넣는다 (앱은 모드1/2 로만 내고 장절 모드에서는 건너뛴다).
+파일 하나는 한 프로세스가 읽고 검사하고 바로 컴파일한다 (원본은 한 번만 읽는다).
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus import parse_ref_parts, read_corpus_lines, reference_error
+from corpus_cache import CACHE_SUFFIX, cache_path_for, read_source, write_compiled
+
+CORPUS_EXT = ".txt"
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def find_sources(paths, recursive=True):
+    """
+    검사할 txt 파일들 (base, 경로). 폴더면 그 안의 *.txt (recursive 면 하위 폴더까지).
+    base 는 --out 에서 폴더 구조를 유지할 기준 폴더.
+    """
+    found = []
+    for p in paths:
+        if os.path.isdir(p):
+            pattern = os.path.join(glob.escape(p), "**" if recursive else "", "*" + CORPUS_EXT)
+            found += [(p, f) for f in sorted(glob.glob(pattern, recursive=recursive))]
+        else:
+            found.append((os.path.dirname(p), p))
+    return found
+
+def out_path_for(base, src, out_dir):
+    if out_dir is None:
+        return cache_path_for(src)
+    rel = os.path.relpath(os.path.splitext(src)[0] + CACHE_SUFFIX, base)
+    return os.path.join(out_dir, rel)
+
+
+def check_file(job):
+    """
+    작업 프로세스에서: 파일 하나를 검사하고 (write 면) 컴파일한다.
+    (src, out, write, max_errors) -> 보고 dict (refs 는 파일 사이 중복 확인용 (장절, 줄 번호)).
+    """
+    src, out, write, max_errors = job
+    t0 = time.perf_counter()
+    report = {"path": src, "out": None, "verses": 0, "tokens": 0, "unique_tokens": 0,
+              "max_words": 0, "courses": {}, "errors": [], "error_count": 0,
+              "ref_errors": [], "ref_error_count": 0, "duplicates": [], "refs": []}
+    try:
+        st, data, sha = read_source(src)
+        lines = data.decode("utf-8").splitlines()
+    except (OSError, UnicodeDecodeError) as e:
+        report["errors"].append((0, "", f"읽을 수 없습니다: {e}"))
+        report["error_count"] = 1
+        return report
+
+    errors = []
+    ref_errors = []
+    vocab = set()
+    courses = Counter()
+    first_line = {}  # (책, 장, 절) -> 처음 나온 줄
+    refs = report["refs"]
+    duplicates = report["duplicates"]
+    stats = {"verses": 0, "tokens": 0, "max_words": 0}
+
+    def rows():
+        for no, course, reference, text in read_corpus_lines(lines, errors):
+            words = text.split()
+            stats["verses"] += 1
+            stats["tokens"] += len(words)
+            if len(words) > stats["max_words"]:
+                stats["max_words"] = len(words)
+            vocab.update(words)
+            courses[course] += 1
+            reason = reference_error(reference)
+            if reason is not None:
+                ref_errors.append((no, lines[no - 1], f"장절 형식 오류 {reference}: {reason}"))
+                yield course, reference, words
+                continue
+            key = parse_ref_parts(reference)
+            if key in first_line:
+                duplicates.append((no, reference, first_line[key]))
+            else:
+                first_line[key] = no
+            refs.append((key, no))
+            yield course, reference, words
+
+    if write:
+        os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+        write_compiled(out, rows(), st, sha, errors)
+        report["out"] = out
+    else:
+        for _ in rows():
+            pass
+
+    report.update(
+        verses=stats["verses"], tokens=stats["tokens"], unique_tokens=len(vocab), max_words=stats["max_words"],
+        courses={str(c): n for c, n in sorted(courses.items())},
+        errors=errors[:max_errors], error_count=len(errors),
+        ref_errors=ref_errors[:max_errors], ref_error_count=len(ref_errors), seconds=round(time.perf_counter() - t0, 4),
+    )
+    return report
+
+def run(sources, out_dir=None, write=True, jobs=None, max_errors=20):
+    """sources 를 검사/컴파일한 보고 리스트 (sources 순서). jobs=1 이면 이 프로세스에서."""
+    jobs = jobs or os.cpu_count() or 1
+    work = [(src, out_path_for(base, src, out_dir), write, max_errors) for base, src in sources]
+    if jobs == 1 or len(work) <= 1:
+        return [check_file(w) for w in work]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(work))) as pool:
+        # 작은 파일이 수백 개여도 작업 전달 비용이 크지 않게 묶어서 보낸다
+        return list(pool.map(check_file, work, chunksize=max(1, len(work) // (jobs * 4))))
+
+def cross_duplicates(reports):
+    """파일 사이에 같은 장절: ((책, 장, 절), [(파일, 줄 번호), ...]) 들."""
+    seen = {}
+    for r in reports:
+        for key, no in r["refs"]:
+            seen.setdefault(tuple(key), {}).setdefault(r["path"], no)
+    return [(key, sorted(files.items())) for key, files in seen.items() if len(files) > 1]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="코퍼스 검사/컴파일")
+    ap.add_argument("paths", nargs="*", default=[os.path.join(HERE, "data")], help="txt 파일 또는 폴더 (기본 data/)")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="작업 프로세스 수 (기본 CPU 수)")
+    ap.add_argument("--out", help="컴파일본을 쓸 폴더 (기본: 원본 옆)")
+    ap.add_argument("--check", action="store_true", help="검사만 하고 쓰지 않음")
+    ap.add_argument("--strict", action="store_true", help="오류나 중복 장절이 있으면 종료 코드 1")
+    ap.add_argument("--no-recursive", action="store_true", help="폴더의 하위 폴더는 보지 않음")
+    ap.add_argument("--max-errors", type=int, default=20, help="파일당 보여 줄 오류 줄 수")
+    ap.add_argument("--json", help="결과를 이 파일에도 저장")
+    args = ap.parse_args(argv)
+
+    sources = find_sources(args.paths, recursive=not args.no_recursive)
+    if not sources:
+        print("코퍼스 파일이 없습니다.", file=sys.stderr)
+        return 1
+
+    t0 = time.perf_counter()
+    reports = run(sources, args.out, not args.check, args.jobs, args.max_errors)
+    dups = cross_duplicates(reports)
+    elapsed = time.perf_counter() - t0
+
+    total = Counter()
+    for r in reports:
+        total.update(files=1, verses=r["verses"], tokens=r["tokens"], errors=r["error_count"],
+                     ref_errors=r["ref_error_count"], duplicates=len(r["duplicates"]))
+        print(f"{r['path']}  구절 {r['verses']}  어절 {r['tokens']} (고유 {r['unique_tokens']}, 최대 {r['max_words']}/구절)"
+              f"  오류 {r['error_count']}  장절 오류 {r['ref_error_count']}  중복 {len(r['duplicates'])}"
+              + (f"  과정 {r['courses']}" if any(c != "0" for c in r["courses"]) else ""))
+        for no, line, reason in r["errors"]:
+            print(f"  {r['path']}:{no}: {reason}" + (f"  | {line[:60]}" if line else ""))
+        if r["error_count"] > len(r["errors"]):
+            print(f"  ... 오류 {r['error_count'] - len(r['errors'])}줄 더")
+        for no, line, reason in r["ref_errors"]:
+            print(f"  {r['path']}:{no}: {reason} (모드1/2 로만 나옵니다)")
+        if r["ref_error_count"] > len(r["ref_errors"]):
+            print(f"  ... 장절 오류 {r['ref_error_count'] - len(r['ref_errors'])}줄 더")
+        for no, reference, first in r["duplicates"][:args.max_errors]:
+            print(f"  {r['path']}:{no}: 중복 장절 {reference} (처음: {first}줄)")
+    for key, files in dups[:args.max_errors]:
+        where = ", ".join(f"{os.path.basename(p)}:{no}" for p, no in files)
+        print(f"파일 사이 중복 장절 ({key[0]} {key[1]}:{key[2]}): {where}")
+
+    print(f"파일 {total['files']}  구절 {total['verses']}  어절 {total['tokens']}  오류 {total['errors']}"
+          f"  장절 오류 {total['ref_errors']}"
+          f"  중복 {total['duplicates']} (파일 사이 {len(dups)})  {elapsed:.2f}초"
+          + ("" if args.check else "  (컴파일 완료)"))
+
+    if args.json:
+        for r in reports:
+            del r["refs"]
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"elapsed": elapsed, "files": reports,
+                       "cross_duplicates": [{"reference": list(k), "files": v} for k, v in dups]},
+                      f, ensure_ascii=False, indent=1)
+
+    if args.strict and (total["errors"] or total["ref_errors"] or total["duplicates"] or dups):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
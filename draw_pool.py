@@ -0,0 +1,170 @@
+"""
+암송 대기열용 추첨 풀.
+
+남은 항목 중 하나를 무작위로 뽑고(draw), 끝난 항목은 O(1)로 뺀다(remove, 마지막 항목과 자리 바꾸기).
+시드를 주면 같은 조작 순서에서 항상 같은 구절이 나오므로 세션을 그대로 재현할 수 있다.
+가중치를 주면 Fenwick 트리로 O(log n) 가중 추첨을 한다.
+"""
+import random
+
+
+class FenwickTree:
+    """누적합 트리: 점 갱신/누적합/누적합으로 위치 찾기 모두 O(log n)."""
+
+    def __init__(self, values=()):
+        self.values = [float(v) for v in values]
+        self.n = len(self.values)
+        self.tree = [0.0] * (self.n + 1)
+        # O(n) 초기화
+        for i in range(1, self.n + 1):
+            self.tree[i] += self.values[i - 1]
+            j = i + (i & -i)
+            if j <= self.n:
+                self.tree[j] += self.tree[i]
+
+    def __len__(self):
+        return self.n
+
+    def set(self, i, value):
+        delta = value - self.values[i]
+        self.values[i] = value
+        i += 1
+        while i <= self.n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def total(self):
+        return self.prefix_sum(self.n)
+
+    def prefix_sum(self, k):
+        """앞에서 k 개의 합."""
+        s = 0.0
+        while k > 0:
+            s += self.tree[k]
+            k -= k & -k
+        return s
+
+    def find(self, target):
+        """누적합이 target 을 처음 넘는 위치 (0 <= target < total)."""
+        pos = 0
+        step = 1 << self.n.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self.n and self.tree[nxt] <= target:
+                pos = nxt
+                target -= self.tree[nxt]
+            step >>= 1
+        return min(pos, self.n - 1)
+
+
+class DrawPool:
+    """
+    남은 항목 풀. 항목은 서로 다른 hashable 값(보통 구절 인덱스)이다.
+
+    draw()    : 하나를 무작위로 고른다(빼지 않음)
+    remove(x) : x 를 O(1)로 뺀다 (draw 와 remove 사이에 풀이 바뀌어도 안전)
+    pop()     : draw + remove
+    history   : record_history=True 일 때만 ('draw'|'remove', 항목) / ('weight', (항목, 가중치)) 기록
+                -> replay() 로 같은 세션을 재현. 기본은 남기지 않는다 (긴 세션에서 끝없이 늘어나므로)
+    """
+
+    def __init__(self, items=(), seed=None, weights=None, rng=None, record_history=False):
+        if rng is None:
+            if seed is None:
+                seed = random.randrange(1 << 63)
+            rng = random.Random(seed)
+        self.seed = seed
+        self.rng = rng
+        self._items = list(items)
+        self._pos = {x: i for i, x in enumerate(self._items)}
+        if len(self._pos) != len(self._items):
+            raise ValueError("DrawPool 항목이 중복되었습니다")
+        self._weights = None
+        if weights is not None:
+            weights = list(weights)
+            if len(weights) != len(self._items):
+                raise ValueError("weights 길이가 항목 수와 다릅니다")
+            self._weights = FenwickTree(weights)
+        self.record_history = record_history
+        self.history = []
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __contains__(self, item):
+        return item in self._pos
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def draw(self):
+        """남은 항목 중 하나(가중치가 있으면 가중 추첨). 비어 있으면 IndexError."""
+        if not self._items:
+            raise IndexError("draw from an empty pool")
+        if self._weights is None:
+            i = self.rng.randrange(len(self._items))
+        else:
+            total = self._weights.prefix_sum(len(self._items))
+            if total <= 0:
+                i = self.rng.randrange(len(self._items))
+            else:
+                # 부동소수 오차로 꼬리(가중치 0)를 가리키지 않도록
+                i = min(self._weights.find(self.rng.random() * total), len(self._items) - 1)
+        item = self._items[i]
+        if self.record_history:
+            self.history.append(('draw', item))
+        return item
+
+    def remove(self, item):
+        """item 을 풀에서 뺀다(마지막 항목을 그 자리로). 없으면 False."""
+        i = self._pos.pop(item, None)
+        if i is None:
+            return False
+        last = self._items.pop()
+        if self._weights is not None:
+            last_w = self._weights.values[len(self._items)]
+            self._weights.set(len(self._items), 0.0)
+        if i < len(self._items):
+            self._items[i] = last
+            self._pos[last] = i
+            if self._weights is not None:
+                self._weights.set(i, last_w)
+        if self.record_history:
+            self.history.append(('remove', item))
+        return True
+
+    def pop(self):
+        item = self.draw()
+        self.remove(item)
+        return item
+
+    def weight(self, item):
+        if self._weights is None:
+            return 1.0
+        return self._weights.values[self._pos[item]]
+
+    def set_weight(self, item, weight):
+        """가중치 변경 O(log n). 가중치가 없던 풀이면 모두 1.0 으로 시작한다."""
+        if self._weights is None:
+            self._weights = FenwickTree([1.0] * len(self._items))
+        self._weights.set(self._pos[item], float(weight))
+        if self.record_history:
+            self.history.append(('weight', (item, float(weight))))
+
+    @classmethod
+    def replay(cls, items, seed, history, weights=None):
+        """같은 시드/항목으로 history 를 다시 실행한다. 뽑힌 항목이 다르면 ValueError."""
+        pool = cls(items, seed=seed, weights=weights)
+        for op, item in history:
+            if op == 'draw':
+                got = pool.draw()
+                if got != item:
+                    raise ValueError(f"replay 불일치: {item!r} 대신 {got!r}")
+            elif op == 'remove':
+                pool.remove(item)
+            else:
+                pool.set_weight(*item)
+        return pool
@@ -0,0 +1,235 @@
+"""
+암송 세션 이벤트 로그 (추가만 하는 JSON Lines).
+
+한 줄에 이벤트 하나: {"t": 시각, "s": 세션 ID, "e": 종류, ...}
+    session : 세션 시작 (seed, mode)
+    load    : 구절 목록 교체 (count)
+    shown   : 문제 표시 (reference, line, mode, blanks)
+    submit  : 답 채점 (answer, status=correct|wrong|revealed, ms=앞 이벤트 이후 걸린 시간)
+    skip / reset / review / clear_wrong
+
+log() 는 메모리 버퍼에 넣기만 하고, 작업 스레드가 batch 개 또는 interval 초마다
+한꺼번에 쓰고 fsync 한다(이벤트마다 fsync 하지 않음). 파일이 max_bytes 를 넘으면
+'<이름>-<시각>-<번호>.jsonl.gz' 로 압축해 돌리고 keep 개까지만 남긴다.
+
+    python event_log.py replay events.jsonl            # 세션별 상태 복원 요약
+    python event_log.py replay events.jsonl --json     # 복원한 상태를 JSON 으로
+"""
+import argparse
+import glob
+import gzip
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
+
+class EventLog:
+    def __init__(self, path, batch=64, interval=1.0, max_bytes=8 * 1024 * 1024, keep=20, compress=True):
+        self.path = path
+        self.batch = batch
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.compress = compress
+        self.batches = 0  # fsync 횟수
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._buf = []
+        self._lock = threading.Lock()        # _buf
+        self._write_lock = threading.Lock()  # 버퍼 가져오기 ~ 쓰기/fsync/돌리기 (flush() 와 작업 스레드가 겹치지 않게)
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+    def log(self, session, kind, **fields):
+        """이벤트 하나를 버퍼에 넣는다 (디스크 쓰기는 작업 스레드)."""
+        fields["t"] = time.time()
+        fields["s"] = session
+        fields["e"] = kind
+        with self._lock:
+            self._buf.append(fields)
+            full = len(self._buf) >= self.batch
+        if full:
+            self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self._flush()
+            except OSError:
+                pass  # 디스크 문제로 앱이 멈추지 않게: 이번 묶음만 잃는다
+
+    def _flush(self):
+        # 버퍼를 가져오는 것부터 쓰기 잠금 안에서 해야 먼저 가져간 묶음이 먼저 쓰인다
+        with self._write_lock:
+            with self._lock:
+                buf, self._buf = self._buf, []
+            if not buf:
+                return
+            self._file.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in buf))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.batches += 1
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        stem = f"{os.path.splitext(self.path)[0]}-{time.strftime('%Y%m%d-%H%M%S')}"
+        n = 0
+        rotated = f"{stem}-{n:03d}.jsonl"
+        while os.path.exists(rotated) or os.path.exists(rotated + ".gz"):
+            n += 1
+            rotated = f"{stem}-{n:03d}.jsonl"
+        os.replace(self.path, rotated)
+        if self.compress:
+            with open(rotated, "rb") as src, gzip.open(rotated + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(rotated)
+        for old in rotated_files(self.path)[:-self.keep or None]:
+            os.remove(old)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def flush(self):
+        """지금까지의 이벤트를 바로 쓴다 (호출한 스레드에서)."""
+        self._flush()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=5.0)
+        self._flush()
+        self._file.close()
+
+
+def rotated_files(path):
+    """path 에서 돌려 둔 파일들, 오래된 것부터."""
+    stem = os.path.splitext(path)[0]
+    return sorted(glob.glob(glob.escape(stem) + "-*.jsonl*"))
+
+def read_events(path):
+    """돌려 둔 파일(.gz 포함)부터 현재 파일까지 이벤트를 차례로. 깨진 줄(쓰다 끊긴 마지막 줄 등)은 건너뛴다."""
+    for p in rotated_files(path) + ([path] if os.path.exists(path) else []):
+        opener = gzip.open if p.endswith(".gz") else open
+        with opener(p, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+class SessionState:
+    """로그에서 복원한 세션 하나 (QuizEngine 의 fail_num / wrong_verses 와 문제별 기록)."""
+
+    def __init__(self, session):
+        self.session = session
+        self.started = None
+        self.ended = None
+        self.seed = None
+        self.mode = None
+        self.shown = 0
+        self.skipped = 0
+        self.statuses = {"correct": 0, "wrong": 0, "revealed": 0}
+        self.fail_num = 0
+        self.wrong_verses = {}  # line -> {'reference', 'full_text', 'fails'}
+        self.latencies = []     # 채점된 답마다 ms
+        self._current = None    # 지금 문제 (reference, line)
+
+    def apply(self, ev):
+        kind = ev.get("e")
+        t = ev.get("t")
+        if self.started is None:
+            self.started = t
+        self.ended = t
+        if kind == "session":
+            self.seed = ev.get("seed")
+            self.mode = ev.get("mode")
+        elif kind == "shown":
+            self.shown += 1
+            self.mode = ev.get("mode", self.mode)
+            self._current = (ev.get("reference"), ev.get("line"))
+        elif kind == "submit":
+            status = ev.get("status")
+            if status in self.statuses:
+                self.statuses[status] += 1
+            if ev.get("ms") is not None:
+                self.latencies.append(ev["ms"])
+            if status == "revealed":
+                self.fail_num += 1
+                if self._current is not None:
+                    reference, line = self._current
+                    wrong = self.wrong_verses.setdefault(
+                        line, {"reference": reference, "full_text": line, "fails": 0})
+                    wrong["fails"] += 1
+        elif kind == "skip":
+            self.skipped += 1
+        elif kind in ("reset", "review"):
+            self.fail_num = 0
+            self.wrong_verses = {}
+        elif kind == "clear_wrong":
+            self.wrong_verses = {}
+
+    def summary(self):
+        lat = sorted(self.latencies)
+        return {
+            "session": self.session,
+            "started": self.started,
+            "ended": self.ended,
+            "seed": self.seed,
+            "mode": self.mode,
+            "shown": self.shown,
+            "skipped": self.skipped,
+            **self.statuses,
+            "fail_num": self.fail_num,
+            "wrong_verses": list(self.wrong_verses.values()),
+            "p50_ms": lat[len(lat) // 2] if lat else None,
+        }
+
+def replay(events, session=None):
+    """이벤트들로 세션별 SessionState 를 다시 만든다 (세션 ID -> 상태, 처음 나온 순서)."""
+    states = {}
+    for ev in events:
+        sid = ev.get("s")
+        if session is not None and sid != session:
+            continue
+        state = states.get(sid)
+        if state is None:
+            state = states[sid] = SessionState(sid)
+        state.apply(ev)
+    return states
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="암송 이벤트 로그 도구")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    rp = sub.add_parser("replay", help="로그에서 세션 상태 복원")
+    rp.add_argument("path")
+    rp.add_argument("--session", help="이 세션만")
+    rp.add_argument("--json", action="store_true", help="복원한 상태를 JSON 으로 출력")
+    args = ap.parse_args(argv)
+
+    states = replay(read_events(args.path), args.session)
+    if args.json:
+        json.dump([s.summary() for s in states.values()], sys.stdout, ensure_ascii=False, indent=1)
+        print()
+        return 0
+    for s in states.values():
+        d = s.summary()
+        started = time.strftime("%Y-%m-%d %H:%M", time.localtime(d["started"])) if d["started"] else "-"
+        print(f"{d['session']}  {started}  문제 {d['shown']}  맞힘 {d['correct']}  틀림 {d['wrong']}"
+              f"  공개 {d['revealed']}  스킵 {d['skipped']}  틀린 갯수 {d['fail_num']}"
+              f"  틀린 구절 {len(d['wrong_verses'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""
+tkFont.Font 재사용 캐시.
+
+(글꼴, 크기, 굵기)별로 이름 있는 Tk 글꼴을 LRU 로 최대 capacity 개만 둔다.
+가득 차면 새로 만들지 않고 가장 오래 안 쓴 글꼴을 configure 로 고쳐 다시 쓴다.
+role("text", "preview" 등)로 받은 글꼴은 위젯이 쓰고 있으므로 그 역할이 다른 글꼴로 바뀔 때까지 재활용하지 않는다.
+"""
+from collections import OrderedDict
+from tkinter import font as tkFont
+
+
+class FontCache:
+    def __init__(self, root, capacity=16):
+        self.root = root
+        self.capacity = capacity
+        self._fonts = OrderedDict()  # (family, size, weight) -> tkFont.Font
+        self._roles = {}             # role -> key
+        self.created = 0             # 지금까지 새로 만든 Tk 글꼴 수
+
+    def __len__(self):
+        return len(self._fonts)
+
+    def get(self, family, size, weight='normal', role=None):
+        """(family, size, weight) 글꼴. role 을 주면 그 역할이 쓰는 글꼴로 고정한다."""
+        key = (family, int(size), weight)
+        f = self._fonts.get(key)
+        if f is not None:
+            self._fonts.move_to_end(key)
+        else:
+            f = self._recycle(key)
+            if f is None:
+                f = tkFont.Font(root=self.root, family=family, size=int(size), weight=weight, slant='roman')
+                self.created += 1
+            self._fonts[key] = f
+        if role is not None:
+            self._roles[role] = key
+        return f
+
+    def _recycle(self, key):
+        """가득 찼으면 역할에 묶이지 않은 가장 오래된 글꼴을 key 로 바꿔 돌려준다."""
+        if len(self._fonts) < self.capacity:
+            return None
+        pinned = set(self._roles.values())
+        old = next((k for k in self._fonts if k not in pinned), None)
+        if old is None:
+            return None
+        f = self._fonts.pop(old)
+        family, size, weight = key
+        f.configure(family=family, size=size, weight=weight, slant='roman')
+        return f
@@ -0,0 +1,57 @@
+"""
+글꼴 이름 검색 색인 (Tk 없이 동작).
+
+글꼴 목록은 한 번만 정렬/소문자화하고, 글자 하나/두 글자 조각별 위치 목록을 만들어 둔다.
+검색어가 앞 검색어를 포함하면(한 글자 더 친 경우 등) 앞 결과 안에서만 다시 거른다.
+"""
+
+
+class FontIndex:
+    """families 에서 부분 문자열 검색. 결과는 항상 정렬된 원래 순서를 유지한다."""
+
+    def __init__(self, families):
+        self.names = sorted(set(families))
+        self.lower = [f.lower() for f in self.names]
+        self.horizontal = [i for i, f in enumerate(self.names) if not f.startswith('@')]
+
+        # 글자/두 글자 조각 -> 그 조각을 포함하는 글꼴 번호들 (오름차순)
+        self._grams = {}
+        for i, low in enumerate(self.lower):
+            seen = set()
+            for j in range(len(low)):
+                for g in (low[j], low[j:j + 2]):
+                    if g not in seen:
+                        seen.add(g)
+                        self._grams.setdefault(g, []).append(i)
+
+        self._last_query = None
+        self._last_vertical = None
+        self._last_result = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def _candidates(self, q, include_vertical):
+        """q 의 조각 중 가장 짧은 위치 목록 (q 가 비면 전체)."""
+        if not q:
+            return list(range(len(self.names))) if include_vertical else self.horizontal
+        grams = [q[j:j + 2] for j in range(max(1, len(q) - 1))]
+        best = min((self._grams.get(g, ()) for g in grams), key=len)
+        if include_vertical:
+            return best
+        return [i for i in best if not self.names[i].startswith('@')]
+
+    def search(self, query, include_vertical=False):
+        """query 를 (대소문자 무시) 포함하는 글꼴 이름 목록."""
+        q = query.lower()
+        if (self._last_result is not None and self._last_vertical == include_vertical
+                and self._last_query and self._last_query in q):
+            # 좁혀지는 검색: 앞 결과 안에서만
+            base = self._last_result
+        else:
+            base = self._candidates(q, include_vertical)
+        result = [i for i in base if q in self.lower[i]] if q else list(base)
+        self._last_query = q
+        self._last_vertical = include_vertical
+        self._last_result = result
+        return [self.names[i] for i in result]
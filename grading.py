@@ -0,0 +1,105 @@
+"""
+관대한 채점.
+
+정답 토큰마다 문제를 만들 때 비교용 형태(AnswerKey)를 미리 계산해 두고,
+제출한 답은 단계별로만 더 비교한다.
+
+EXACT : norm_token 일치 (쉼표/하이픈/슬래시만 무시, 기존 채점)
+LOOSE : NFC 정규화 후 띄어쓰기와 모든 문장부호 무시
+FUZZY : LOOSE + 자모 단위 편집 거리 max_edits 이내 (짧은 어절은 덜 허용)
+
+편집 거리는 허용치 k 를 넘는지만 알면 되므로 폭 2k+1 띠만 계산하고
+한 행의 최솟값이 k 를 넘으면 바로 멈춘다: 제출당 O(k * 길이).
+"""
+import re
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+from corpus import norm_token
+
+EXACT = 0
+LOOSE = 1
+FUZZY = 2
+
+LEVEL_NAMES = {EXACT: "정확히", LOOSE: "띄어쓰기/문장부호 무시", FUZZY: "오타 허용"}
+
+LOOSE_RE = re.compile(r'[\W_]+')  # 글자/숫자가 아닌 것 전부 (공백 포함)
+JAMO_PER_EDIT = 4                 # 자모 4개당 오타 1개까지 허용
+
+# 정답 하나의 비교용 형태: norm_token / 느슨한 형태 / 느슨한 형태의 자모 분해
+AnswerKey = namedtuple("AnswerKey", ["norm", "loose", "jamo"])
+
+
+def loose_token(s: str) -> str:
+    """NFC 로 맞추고 띄어쓰기와 문장부호를 모두 뺀다."""
+    return LOOSE_RE.sub('', unicodedata.normalize('NFC', s))
+
+def to_jamo(s: str) -> str:
+    """한글 음절을 초성/중성/종성 조합형 자모로 푼다 (NFD)."""
+    return unicodedata.normalize('NFD', s)
+
+@lru_cache(maxsize=65536)
+def answer_key(answer: str) -> AnswerKey:
+    loose = loose_token(answer)
+    return AnswerKey(norm_token(answer), loose, to_jamo(loose))
+
+def bounded_levenshtein(a, b, k):
+    """a, b 의 편집 거리. k 를 넘으면 k + 1."""
+    if a == b:
+        return 0
+    la, lb = len(a), len(b)
+    if abs(la - lb) > k:
+        return k + 1
+    if la > lb:
+        a, b, la, lb = b, a, lb, la
+    big = k + 1
+    # 띠 밖은 big 으로 본다. 각 행은 띠 오른쪽 한 칸을 big 으로 막아 이전 값이 새지 않게 한다
+    prev = [j if j <= k else big for j in range(lb + 1)]
+    cur = [big] * (lb + 1)
+    for i in range(1, la + 1):
+        lo = max(1, i - k)
+        hi = min(lb, i + k)
+        cur[lo - 1] = i if lo == 1 else big
+        row_min = cur[lo - 1]
+        ai = a[i - 1]
+        for j in range(lo, hi + 1):
+            v = prev[j - 1] + (ai != b[j - 1])
+            if prev[j] + 1 < v:
+                v = prev[j] + 1
+            if cur[j - 1] + 1 < v:
+                v = cur[j - 1] + 1
+            cur[j] = v
+            if v < row_min:
+                row_min = v
+        if hi < lb:
+            cur[hi + 1] = big
+        if row_min > k:
+            return big
+        prev, cur = cur, prev
+    return min(prev[lb], big)
+
+
+class Grader:
+    """level 이하의 단계 중 하나라도 맞으면 정답."""
+
+    def __init__(self, level=EXACT, max_edits=2):
+        self.level = level
+        self.max_edits = max_edits
+
+    def allowed_edits(self, key):
+        return min(self.max_edits, len(key.jamo) // JAMO_PER_EDIT)
+
+    def match(self, user_answer, key):
+        """user_answer 가 key(AnswerKey) 에 맞는지."""
+        if norm_token(user_answer) == key.norm:
+            return True
+        if self.level < LOOSE:
+            return False
+        loose = loose_token(user_answer)
+        if loose == key.loose:
+            return True
+        if self.level < FUZZY:
+            return False
+        k = self.allowed_edits(key)
+        return k > 0 and bounded_levenshtein(to_jamo(loose), key.jamo, k) <= k
@@ -0,0 +1,185 @@
+"""
+핫 패스 계측: 호출별 지연 히스토그램/카운터와 Chrome 트레이스 내보내기.
+
+    probe = Instrument.from_env()        # BIBLE_INSTRUMENT=1 이면 켜고, BIBLE_TRACE=파일 이면 트레이스도 남긴다
+
+    @probe.timed("display_problem")      # 꺼져 있으면 속성 하나만 보고 바로 호출한다
+    def display_problem(mode): ...
+
+    with probe.span("create_problem"):   # 함수 일부만 잴 때
+        ...
+    probe.record("submit_to_render", seconds)   # 직접 잰 구간
+
+히스토그램은 옥타브(2배)마다 BUCKETS_PER_OCTAVE 칸인 로그 눈금이라 기록이 O(1)이고 메모리가 고정이다.
+백분위는 칸의 위쪽 경계로 어림한다 (상대 오차 약 9%).
+트레이스는 chrome://tracing / Perfetto 에서 여는 JSON ("X" 이벤트)이고 최근 TRACE_LIMIT 개만 남긴다.
+"""
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+
+BUCKETS_PER_OCTAVE = 8
+MAX_BUCKET = 40 * BUCKETS_PER_OCTAVE   # 2^40 ns (약 18분)까지
+TRACE_LIMIT = 100000
+ENV_ENABLE = "BIBLE_INSTRUMENT"
+ENV_TRACE = "BIBLE_TRACE"
+
+
+class Histogram:
+    """나노초 지연 로그 눈금 히스토그램."""
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (MAX_BUCKET + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, ns):
+        i = int(math.log2(ns) * BUCKETS_PER_OCTAVE) if ns > 1 else 0
+        self.counts[min(i, MAX_BUCKET)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, q):
+        """q(0~1) 백분위 어림값 (ns)."""
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if c and seen >= rank:
+                return min(2 ** ((i + 1) / BUCKETS_PER_OCTAVE), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count / 1e6, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50) / 1e6, 3),
+            "p99_ms": round(self.percentile(0.99) / 1e6, 3),
+            "max_ms": round(self.max / 1e6, 3),
+        }
+
+
+class _Span:
+    __slots__ = ("probe", "name", "t0")
+
+    def __init__(self, probe, name):
+        self.probe = probe
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.probe._add(self.name, self.t0, time.perf_counter_ns())
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+
+class Instrument:
+    def __init__(self, enabled=False, trace=False, trace_path=None):
+        self.enabled = enabled
+        # trace_path 가 있으면 트레이스를 모아 두었다가 끝날 때 그 파일로 (export_trace)
+        self.trace = trace or trace_path is not None
+        self.trace_path = trace_path
+        self.histograms = {}
+        self.counters = {}
+        self.events = deque(maxlen=TRACE_LIMIT)  # (이름, 시작 ns, 길이 ns, 스레드)
+        self._origin = time.perf_counter_ns()
+
+    @classmethod
+    def from_env(cls, environ=None):
+        env = os.environ if environ is None else environ
+        trace_path = env.get(ENV_TRACE) or None
+        enabled = env.get(ENV_ENABLE, "").lower() not in ("", "0", "false", "no") or trace_path is not None
+        return cls(enabled, trace_path=trace_path)
+
+    # ---- 기록 ----
+    def timed(self, name):
+        """함수 호출마다 지연을 name 히스토그램에 남기는 데코레이터."""
+        def wrap(fn):
+            @functools.wraps(fn)
+            def inner(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                t0 = time.perf_counter_ns()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self._add(name, t0, time.perf_counter_ns())
+            return inner
+        return wrap
+
+    def span(self, name):
+        """with 블록의 지연을 name 에 남긴다."""
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def record(self, name, seconds, start_ns=None):
+        """직접 잰 구간(초). start_ns(perf_counter_ns)를 주면 트레이스에도 그 위치로 남는다."""
+        if not self.enabled:
+            return
+        ns = int(seconds * 1e9)
+        t0 = start_ns if start_ns is not None else time.perf_counter_ns() - ns
+        self._add(name, t0, t0 + ns)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def _add(self, name, t0, t1):
+        h = self.histograms.get(name)
+        if h is None:
+            h = self.histograms[name] = Histogram()
+        h.add(t1 - t0)
+        if self.trace:
+            self.events.append((name, t0, t1 - t0, threading.get_ident()))
+
+    # ---- 조회/내보내기 ----
+    def summary(self, name):
+        h = self.histograms.get(name)
+        return h.summary() if h is not None else None
+
+    def snapshot(self):
+        return {
+            "histograms": {name: h.summary() for name, h in sorted(self.histograms.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def reset(self):
+        self.histograms.clear()
+        self.counters.clear()
+        self.events.clear()
+
+    def export_trace(self, path):
+        """Chrome 트레이스 JSON 으로 쓴다 (히스토그램 요약은 metadata 에)."""
+        pid = os.getpid()
+        events = [
+            {"name": name, "ph": "X", "ts": (t0 - self._origin) / 1000.0, "dur": dur / 1000.0,
+             "pid": pid, "tid": tid}
+            for name, t0, dur, tid in list(self.events)
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "metadata": self.snapshot()},
+                      f, ensure_ascii=False)
+        return len(events)
@@ -0,0 +1,214 @@
+"""
+quiz_server 부하 시험: 가상 사용자 여러 명이 동시에 세션을 만들고 답을 낸다.
+
+    python load_test.py --users 300 --duration 20          # 서버를 띄워서 (합성 코퍼스)
+    python load_test.py --url 127.0.0.1:8765 --users 300   # 떠 있는 서버 (--expose-answers 로 띄워야 함)
+
+사용자마다 연결 하나(keep-alive)와 세션 하나를 쓰고, 모드는 --modes 를 돌아가며 나눈다.
+정답 비율(--correct), 여러 어절을 한 번에 내는 비율(--multi)대로 답을 내고
+모드별 요청 처리량과 p50/p99 지연을 보고한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class Connection:
+    """keep-alive HTTP/1.1 JSON 연결 하나."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, body=None):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8") if body is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n")
+        self.writer.write(head.encode("latin-1") + data)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        payload = json.loads(await self.reader.readexactly(length)) if length else {}
+        return status, payload
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                pass
+
+
+class Recorder:
+    """(모드, 요청 종류)별 지연 기록."""
+
+    def __init__(self):
+        self.lat = {}
+        self.errors = 0
+
+    def add(self, mode, kind, seconds):
+        self.lat.setdefault((mode, kind), []).append(seconds)
+
+    def report(self, elapsed):
+        rows = []
+        for mode in sorted({m for m, _ in self.lat}):
+            for kind in ("create", "submit", "next"):
+                vals = sorted(self.lat.get((mode, kind), ()))
+                if not vals:
+                    continue
+                rows.append({
+                    "mode": mode, "kind": kind, "requests": len(vals),
+                    "req_per_sec": round(len(vals) / elapsed, 1),
+                    "p50_ms": round(vals[len(vals) // 2] * 1000, 3),
+                    "p99_ms": round(vals[min(len(vals) - 1, int(len(vals) * 0.99))] * 1000, 3),
+                })
+        return rows
+
+
+async def timed(rec, mode, kind, conn, method, path, body=None):
+    t0 = time.perf_counter()
+    status, payload = await conn.request(method, path, body)
+    rec.add(mode, kind, time.perf_counter() - t0)
+    if status >= 400:
+        rec.errors += 1
+    return status, payload
+
+async def user(host, port, mode, args, deadline, rec, rng):
+    conn = Connection(host, port)
+    await conn.open()
+    try:
+        session = None
+        answers, pos = [], 0
+        while time.perf_counter() < deadline:
+            if session is None:
+                status, p = await timed(rec, mode, "create", conn, "POST", "/sessions",
+                                        {"mode": mode, "day": None, "seed": rng.getrandbits(32)})
+                if status >= 400:
+                    return
+                session, answers, pos = p["session"], p.get("answers", []), 0
+                continue
+
+            if pos >= len(answers):
+                # 다 채웠으면 빈 제출로 다음 문제
+                answer = ""
+            elif rng.random() < args.correct:
+                n = rng.randint(2, 5) if rng.random() < args.multi else 1
+                answer = " ".join(answers[pos:pos + n])
+            else:
+                answer = "틀린답"
+            status, p = await timed(rec, mode, "submit", conn, "POST", f"/sessions/{session}/submit",
+                                    {"answer": answer})
+            if status >= 400:
+                session = None
+                continue
+            pos += sum(1 for r in p["results"] if r["status"] in ("correct", "revealed"))
+            if "problem" in p:
+                answers, pos = p["problem"].get("answers", []), 0
+            if p["left"] == 0 or any(r["status"] == "idle" for r in p["results"]):
+                await conn.request("DELETE", f"/sessions/{session}")
+                session = None
+            elif args.skip and rng.random() < args.skip:
+                status, p = await timed(rec, mode, "next", conn, "POST", f"/sessions/{session}/next", {})
+                answers, pos = p.get("answers", []), 0
+        if session is not None:
+            await conn.request("DELETE", f"/sessions/{session}")
+    finally:
+        await conn.close()
+
+async def run(host, port, args):
+    rec = Recorder()
+    modes = [int(m) for m in args.modes.split(",")]
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    deadline = start + args.duration
+    tasks = [
+        user(host, port, modes[i % len(modes)], args, deadline, rec, random.Random(rng.getrandbits(64)))
+        for i in range(args.users)
+    ]
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    failed = [o for o in outcomes if isinstance(o, BaseException)]
+
+    conn = Connection(host, port)
+    await conn.open()
+    _, stats = await conn.request("GET", "/stats")
+    await conn.close()
+    return rec, elapsed, failed, stats
+
+def spawn_server(args):
+    cmd = [sys.executable, os.path.join(HERE, "quiz_server.py"), "--port", "0", "--expose-answers",
+           "--max-sessions", str(args.users * 2), "--max-connections", str(args.users + 16)]
+    if args.synthetic:
+        cmd += ["--synthetic", str(args.synthetic)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith("listening on "):
+        proc.kill()
+        raise RuntimeError(f"서버를 띄우지 못했습니다: {line!r}")
+    host, port = line.split()[-1].rsplit(":", 1)
+    return proc, host, int(port)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="quiz_server 부하 시험")
+    ap.add_argument("--url", help="host:port (없으면 서버를 직접 띄움)")
+    ap.add_argument("--users", type=int, default=200)
+    ap.add_argument("--duration", type=float, default=10.0, help="초")
+    ap.add_argument("--modes", default="1,2,3,4")
+    ap.add_argument("--correct", type=float, default=0.8, help="정답을 내는 비율")
+    ap.add_argument("--multi", type=float, default=0.2, help="여러 어절을 한 번에 내는 비율")
+    ap.add_argument("--skip", type=float, default=0.02, help="문제를 넘기는 비율")
+    ap.add_argument("--synthetic", type=int, default=10000, help="직접 띄우는 서버의 합성 구절 수 (0 이면 data/)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", help="결과를 이 파일에도 저장")
+    args = ap.parse_args(argv)
+
+    proc = None
+    if args.url:
+        host, port = args.url.rsplit(":", 1)
+        port = int(port)
+    else:
+        proc, host, port = spawn_server(args)
+    try:
+        rec, elapsed, failed, stats = asyncio.run(run(host, port, args))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    rows = rec.report(elapsed)
+    print(f"사용자 {args.users}명, {elapsed:.1f}초, 오류 응답 {rec.errors}, 끊긴 사용자 {len(failed)}")
+    for r in rows:
+        print(f"  모드 {r['mode']} {r['kind']:6s} {r['requests']:>8d}건 {r['req_per_sec']:>9.1f}/s"
+              f"  p50 {r['p50_ms']:>8.3f} ms  p99 {r['p99_ms']:>8.3f} ms")
+    total = sum(r["requests"] for r in rows)
+    print(f"  전체 {total / elapsed:.1f} req/s   서버: {stats}")
+    if failed:
+        print(f"  예: {failed[0]!r}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"users": args.users, "elapsed": elapsed, "errors": rec.errors,
+                       "results": rows, "server": stats}, f, ensure_ascii=False, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+빌드별 실행 -> 첫 문제 표시까지 시간 측정.
+
+각 빌드를 --startup-profile=<파일> --startup-exit 로 실행해서
+프로세스 시작부터 보고 파일이 생길 때까지(= 첫 문제가 뜬 시점)의 벽시계 시간을 잰다.
+onefile 의 압축 풀기처럼 파이썬 밖에서 걸리는 시간도 여기에 들어간다.
+
+cold : 새 임시 폴더로 복사한 빌드를 처음 실행 (이전 실행이 남긴 캐시 없음)
+warm : 같은 자리에서 이어서 --runs 번 실행
+
+    python measure_launch.py                                  # dist/ 의 두 빌드
+    python measure_launch.py --variant src="python bible.py"  # 소스 실행도 같이
+    python measure_launch.py --runs 10 --json launch.json
+"""
+import argparse
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+EXE_SUFFIX = ".exe" if sys.platform == "win32" else ""
+DEFAULT_VARIANTS = {
+    "onefile": os.path.join(HERE, "dist", "bible" + EXE_SUFFIX),
+    "onedir": os.path.join(HERE, "dist", "bible_onedir", "bible_onedir" + EXE_SUFFIX),
+}
+PHASE_RE = re.compile(r"^(\S.*?)\s+([\d.]+) ms$")
+
+
+def parse_report(text):
+    """startup_profile 보고에서 단계별 ms."""
+    phases = {}
+    for line in text.splitlines():
+        m = PHASE_RE.match(line.strip())
+        if m:
+            phases[m.group(1)] = float(m.group(2))
+    return phases
+
+def launch_once(cmd, timeout):
+    """한 번 실행해서 (벽시계 ms, 단계별 ms). 시간 안에 보고가 없으면 None."""
+    fd, report = tempfile.mkstemp(suffix=".txt", prefix="startup-")
+    os.close(fd)
+    os.remove(report)
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd + [f"--startup-profile={report}", "--startup-exit"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wall = None
+    try:
+        deadline = t0 + timeout
+        while time.perf_counter() < deadline:
+            if os.path.exists(report) and os.path.getsize(report) > 0:
+                wall = (time.perf_counter() - t0) * 1000.0
+                break
+            if proc.poll() is not None and not os.path.exists(report):
+                break
+            time.sleep(0.005)
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        if wall is None:
+            return None
+        with open(report, encoding="utf-8") as f:
+            return wall, parse_report(f.read())
+    finally:
+        if os.path.exists(report):
+            os.remove(report)
+
+def fresh_copy(path, tmp):
+    """빌드를 tmp 로 복사한 실행 파일 경로 (onedir 은 폴더째)."""
+    if os.path.isfile(path) and os.path.basename(os.path.dirname(path)) != "dist":
+        src_dir = os.path.dirname(path)
+        dst_dir = os.path.join(tmp, os.path.basename(src_dir))
+        shutil.copytree(src_dir, dst_dir)
+        return os.path.join(dst_dir, os.path.basename(path))
+    dst = os.path.join(tmp, os.path.basename(path))
+    shutil.copy2(path, dst)
+    return dst
+
+def summarize(values):
+    values = sorted(values)
+    if not values:
+        return {}
+    return {
+        "min_ms": round(values[0], 1),
+        "median_ms": round(values[len(values) // 2], 1),
+        "max_ms": round(values[-1], 1),
+    }
+
+def measure_variant(name, target, runs, timeout):
+    """target 은 실행 파일 경로 또는 명령줄 문자열."""
+    result = {"target": target}
+    if os.path.exists(target):
+        with tempfile.TemporaryDirectory() as tmp:
+            cold = launch_once([fresh_copy(target, tmp)], timeout)
+        cmd = [target]
+    else:
+        cmd = shlex.split(target)
+        cold = None
+    if cold is not None:
+        result["cold_ms"] = round(cold[0], 1)
+        result["cold_phases"] = cold[1]
+
+    warm = []
+    for _ in range(runs):
+        r = launch_once(cmd, timeout)
+        if r is None:
+            result["error"] = "시간 안에 보고가 없음"
+            break
+        warm.append(r[0])
+    result["warm"] = summarize(warm)
+    return result
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="빌드별 실행 -> 첫 문제 시간 측정")
+    ap.add_argument("--variant", action="append", default=[],
+                    help="이름=실행파일 또는 명령줄 (여러 번). 없으면 dist/ 의 onefile/onedir")
+    ap.add_argument("--runs", type=int, default=5, help="warm 실행 횟수")
+    ap.add_argument("--timeout", type=float, default=60.0, help="한 번 실행 제한 시간(초)")
+    ap.add_argument("--json", help="결과를 이 파일에도 저장")
+    args = ap.parse_args(argv)
+
+    variants = dict(v.split("=", 1) for v in args.variant) if args.variant else {
+        k: v for k, v in DEFAULT_VARIANTS.items() if os.path.exists(v)
+    }
+    if not variants:
+        print("측정할 빌드가 없습니다. pyinstaller bible.spec / bible_onedir.spec 로 먼저 빌드하세요.")
+        return 1
+
+    results = {}
+    for name, target in variants.items():
+        r = measure_variant(name, target, args.runs, args.timeout)
+        results[name] = r
+        cold = f"{r['cold_ms']:.1f} ms" if "cold_ms" in r else "-"
+        warm = r["warm"]
+        warm_s = f"{warm['median_ms']:.1f} ms (min {warm['min_ms']:.1f}, max {warm['max_ms']:.1f})" if warm else "-"
+        print(f"  {name:10s} cold {cold:>12s}   warm median {warm_s}  {r.get('error', '')}")
+
+    timed = {k: r["warm"]["median_ms"] for k, r in results.items() if r["warm"]}
+    if timed:
+        best = min(timed, key=timed.get)
+        print(f"가장 빠른 빌드(warm median): {best}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
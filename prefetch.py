@@ -0,0 +1,97 @@
+"""
+문제 미리 만들기.
+
+ProblemPrefetcher : 다음에 낼 문제(구절/설정/시드를 미리 정한 요청)를 작업 스레드에서 만들어 둔다.
+                    시드를 요청하는 쪽에서 정하므로 미리 만들든 바로 만들든 같은 문제가 나온다.
+ProblemStream     : 구절 목록에서 문제를 끝없이 만들어 크기 제한 큐에 채운다 (대량 요청/시뮬레이션용).
+"""
+import queue
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from quiz_engine import create_problem, create_problems
+
+
+class ProblemPrefetcher:
+    """크기 제한(depth)이 있는 미리 만들기 큐. put() 한 순서대로 take() 로 꺼낸다."""
+
+    def __init__(self, depth=1):
+        self.depth = depth
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._pending = deque()  # (key, Future)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def full(self):
+        return len(self._pending) >= self.depth
+
+    def put(self, key, verse, mode, blank_num, whole_level_num, seed, stats=None):
+        """key 로 구분되는 문제 하나를 작업 스레드에 맡긴다."""
+        fut = self._executor.submit(
+            create_problem, verse, mode, blank_num, whole_level_num, random.Random(seed), stats
+        )
+        self._pending.append((key, fut))
+
+    def take(self):
+        """가장 먼저 맡긴 문제 (key, Problem). 아직 안 끝났으면 끝날 때까지 기다린다."""
+        key, fut = self._pending.popleft()
+        return key, fut.result()
+
+    def clear(self):
+        while self._pending:
+            _, fut = self._pending.popleft()
+            fut.cancel()
+
+    def close(self):
+        self.clear()
+        self._executor.shutdown(wait=False)
+
+
+class ProblemStream:
+    """
+    작업 스레드가 create_problems 로 batch 개씩 만들어 크기 제한 큐(depth)에 채운다.
+    get() 은 (구절 인덱스, Problem) 하나를 꺼낸다. 다 쓰면 close().
+    """
+
+    def __init__(self, verses, mode, blank_num=5, whole_level_num=1, depth=64, batch=16, seed=None):
+        self.verses = verses
+        self.mode = mode
+        self.blank_num = blank_num
+        self.whole_level_num = whole_level_num
+        self.batch = batch
+        self.rng = random.Random(seed)
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="problem-stream", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            items = create_problems(self.verses, self.mode, self.batch,
+                                    self.blank_num, self.whole_level_num, self.rng)
+            if not items:
+                return
+            for item in items:
+                while not self._stop.is_set():
+                    try:
+                        self._queue.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+
+    def get(self, timeout=None):
+        return self._queue.get(timeout=timeout)
+
+    def take(self, n, timeout=None):
+        """n 개를 한 번에."""
+        return [self._queue.get(timeout=timeout) for _ in range(n)]
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
@@ -0,0 +1,653 @@
+"""
+암송 문제 생성/채점 엔진 (Tk 없이 import 가능).
+
+bible.py 의 전역 상태(scripture, current_answers, attempts, left_verse,
+fail_num, wrong_verses ...)를 QuizEngine 객체 하나로 묶었다.
+Tk 화면은 이 엔진을 호출해서 결과만 그린다.
+구절은 corpus.Verse 로 미리 컴파일되어 있어서 문제 생성은 인덱스만 고른다.
+"""
+import random
+import time
+import uuid
+from bisect import bisect_left
+from collections import Counter, deque, namedtuple
+
+from draw_pool import DrawPool
+from grading import Grader, answer_key
+
+# 텍스트 헬퍼는 corpus 로 옮겼고, 기존 import 경로를 위해 여기서도 노출한다.
+from corpus import (
+    WORD_TOKEN_RE, PUNCT_RE, norm_token, mask_len_keep_punct, mask_one_keep_punct,
+    parse_ref_parts, split_verse_parts, ref_masked, as_verse,
+)
+
+# 장절을 맞히는 모드 (장절 형식이 틀린 구절로는 문제를 만들 수 없다)
+REFERENCE_MODES = (3, 4)
+
+
+class Problem:
+    """
+    문제 하나: 화면 텍스트 조각(parts)과 빈칸 조각 위치(blanks).
+
+    blanks[k] 는 answers[k] 가 들어갈 조각 번호이고 offsets[k] 는 처음 텍스트에서의 글자 위치다.
+    빈칸은 정답 순서대로 채우므로, 앞에서 채운 길이 차이(shift)만 더하면
+    k 번째 빈칸의 현재 위치를 O(1)에 알 수 있다. 텍스트에는 줄바꿈이 없어서 Tk 인덱스는 '1.<위치>'.
+    word_index[k] 는 k 번째 빈칸의 구절 어절 번호 (장절 빈칸은 -1).
+    """
+    __slots__ = ("parts", "blanks", "offsets", "answers", "keys", "word_index", "reference", "filled",
+                 "_shift", "_text")
+
+    def __init__(self, parts, blanks, answers, reference, offsets=None, word_index=None):
+        self.parts = parts
+        self.blanks = blanks
+        self.answers = answers
+        self.word_index = word_index if word_index is not None else (-1,) * len(answers)
+        # 채점용 비교 형태 (grading.AnswerKey), 문제를 만들 때 한 번만
+        self.keys = tuple(answer_key(a) for a in answers)
+        self.reference = reference
+        self.filled = 0
+        self._shift = 0
+        self._text = None
+        if offsets is not None:
+            self.offsets = offsets
+            return
+
+        offsets = []
+        pos = 0
+        k = 0
+        for i, part in enumerate(parts):
+            if k < len(blanks) and blanks[k] == i:
+                offsets.append(pos)
+                k += 1
+            pos += len(part)
+        self.offsets = offsets
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = "".join(self.parts)
+        return self._text
+
+    def blank_span(self, k):
+        """k 번째 빈칸의 현재 (시작 위치, 길이). k 앞의 빈칸은 모두 채워져 있어야 한다."""
+        return self.offsets[k] + self._shift, len(self.parts[self.blanks[k]])
+
+    def fill(self, answer):
+        """다음 빈칸을 answer 로 채우고 (시작 위치, 원래 빈칸 길이)를 돌려준다. 빈칸이 없으면 (-1, 0)."""
+        if self.filled >= len(self.blanks):
+            return -1, 0
+        start, length = self.blank_span(self.filled)
+        self.parts[self.blanks[self.filled]] = answer
+        self._shift += len(answer) - length
+        self.filled += 1
+        self._text = None
+        return start, length
+
+def _assemble(ref_view, ref_blanks, words, blank_words, answers, reference):
+    """
+    장절 + 어절들을 조각으로 나누어 Problem 을 만든다.
+    ref_blanks : 장절 안의 '_' 하나하나가 빈칸인지 (모드3/4)
+    blank_words: 빈칸인 어절 인덱스(오름차순). 어절의 첫 '_'부터 마지막 '_'까지가 빈칸 하나.
+    """
+    parts = []
+    blanks = []
+    word_index = ()
+    if ref_blanks:
+        for ch in ref_view:
+            if ch == '_':
+                blanks.append(len(parts))
+            parts.append(ch)
+        word_index = (-1,) * len(blanks)
+    else:
+        parts.append(ref_view)
+
+    nxt = iter(blank_words)
+    b = next(nxt, -1)
+    for i, w in enumerate(words):
+        parts.append(" ")
+        if i != b:
+            parts.append(w)
+            continue
+        b = next(nxt, -1)
+        s = w.find('_')
+        e = w.rfind('_') + 1
+        if s > 0:
+            parts.append(w[:s])
+        blanks.append(len(parts))
+        parts.append(w[s:e])
+        if e < len(w):
+            parts.append(w[e:])
+    return Problem(parts, blanks, answers, reference, word_index=word_index + tuple(blank_words))
+
+def create_problem(scripture, mode, blank_num=5, whole_level_num=1, rng=random, stats=None):
+    """
+    구절 하나(Verse 또는 '(ref)^본문')로 Problem 을 만든다.
+    blank_num     : 모드1 빈칸 비율 (1 -> 10%, 10 -> 100%)
+    whole_level_num: 모드4 공개 어절 수
+    stats         : verse_stats.VerseStats. 있으면 모드1 빈칸 수/위치를 구절 통계에 맞춘다
+    """
+    v = as_verse(scripture)
+    if mode in REFERENCE_MODES:
+        v.check_reference()
+    words = v.words
+
+    if mode == 1:
+        if stats is not None:
+            blank_indices = stats.pick_blanks(v, stats.blank_count(v, blank_num), rng)
+        else:
+            num_words = len(words)
+            num_blanks = int(num_words * max(blank_num, 0) * 0.1)
+            num_blanks = max(0, min(num_blanks, num_words, len(v.maskable)))
+            blank_indices = sorted(rng.sample(v.maskable, num_blanks)) if num_blanks else []
+
+        # 정답은 문장부호 제거본으로 저장(중복 쉼표 방지)
+        answers = [v.norms[i] for i in blank_indices]
+
+        # 화면은 길이 힌트 O + 문장부호 보존
+        problem_words = list(words)
+        for i in blank_indices:
+            problem_words[i] = v.len_masks[i]
+
+        # 장절 공개(괄호 유지)
+        return _assemble(v.ref_view, False, problem_words, blank_indices, answers, v.reference)
+
+    elif mode == 2:
+        return _assemble(v.ref_view, False, v.one_masks, v.maskable, list(v.answers), v.reference)
+
+    elif mode == 3:
+        # 장절은 마스크로, 본문은 공개
+        # 정답 순서: 책, 장, 절의 각 파트  (예: 38-39 -> ['38','39'])
+        answers = [v.book, v.chap, *v.verse_parts]
+        return _assemble(v.ref_view_masked, True, words, (), answers, v.reference)
+
+    elif mode == 4:
+        # 고른 시작 위치(start)의 n 어절만 공개, 나머지 어절은 힌트 없는 빈칸 (한 번에 훑음)
+        n = min(whole_level_num, len(words))
+        start = rng.randint(0, len(words) - n)
+        end = start + n
+
+        problem_words = list(v.one_masks)
+        problem_words[start:end] = words[start:end]
+
+        # 장절 마스킹 + 공개 구간 밖의 어절들
+        blank_words = [i for i in v.maskable if i < start or i >= end]
+        answers = [v.book, v.chap, *v.verse_parts]
+        answers.extend(v.norms[i] for i in blank_words)
+        return _assemble(v.ref_view_masked, True, problem_words, blank_words, answers, v.reference)
+
+def create_mode4_batch(scripture, count, whole_level_num=1, rng=random):
+    """
+    한 구절로 모드4 문제 count 개를 한 번에 만든다 (미리 만들어 두기/시뮬레이션용).
+    전부 가린 조각 목록과 빈칸 위치는 한 번만 계산하고,
+    문제마다 조각 목록을 복사해 공개 구간만 덮어쓴 뒤 빈칸/정답 목록을 잘라 붙인다.
+    같은 rng 상태면 create_problem(..., 4, ...) 를 count 번 부른 것과 같은 문제가 나온다.
+    """
+    v = as_verse(scripture)
+    v.check_reference()
+    words = v.words
+    nw = len(words)
+    n = min(whole_level_num, nw)
+
+    # 장절: 글자 하나가 조각 하나 -> 조각 번호 == 글자 위치
+    parts = list(v.ref_view_masked)
+    ref_blanks = [i for i, ch in enumerate(parts) if ch == '_']
+    ref_answers = [v.book, v.chap, *v.verse_parts]
+    ref_index = (-1,) * len(ref_blanks)
+    head = len(parts)
+
+    # 어절마다 [" ", 앞 문장부호, 빈칸, 뒤 문장부호] 4조각
+    word_blanks = []      # maskable 어절의 빈칸 조각 번호
+    word_offsets = []     # 그 빈칸의 글자 위치 (전부 가린 텍스트 기준)
+    grow = [0]            # 어절을 공개하면 늘어나는 길이의 누적합
+    pos = head
+    maskable = set(v.maskable)
+    for i, m in enumerate(v.one_masks):
+        if i in maskable:
+            s = m.find('_')
+            e = m.rfind('_') + 1
+            parts += [" ", m[:s], m[s:e], m[e:]]
+            word_blanks.append(len(parts) - 2)
+            word_offsets.append(pos + 1 + s)
+        else:
+            parts += [" ", "", m, ""]
+        pos += 1 + len(m)
+        grow.append(grow[-1] + len(words[i]) - len(m))
+
+    problems = []
+    for _ in range(count):
+        start = rng.randint(0, nw - n)
+        end = start + n
+        p = parts[:]
+        for i in range(start, end):
+            base = head + 4 * i
+            p[base + 1] = ""
+            p[base + 2] = words[i]
+            p[base + 3] = ""
+        ka = bisect_left(v.maskable, start)
+        kb = bisect_left(v.maskable, end)
+        delta = grow[end] - grow[start]
+        blanks = ref_blanks + word_blanks[:ka] + word_blanks[kb:]
+        offsets = ref_blanks + word_offsets[:ka] + list(map(delta.__add__, word_offsets[kb:]))
+        answers = ref_answers + list(v.answers[:ka]) + list(v.answers[kb:])
+        word_index = ref_index + v.maskable[:ka] + v.maskable[kb:]
+        problems.append(Problem(p, blanks, answers, v.reference, offsets, word_index))
+    return problems
+
+def create_problems(verses, mode, count=None, blank_num=5, whole_level_num=1, rng=random, stats=None):
+    """
+    여러 문제를 한 번에 만든다. (구절 인덱스, Problem) 리스트를 돌려준다.
+    count 가 없으면 구절마다 하나씩 순서대로, 있으면 구절을 무작위로(중복 허용) count 번 골라 만든다.
+    모드4는 같은 구절끼리 create_mode4_batch 로 묶어서 만든다.
+    """
+    if count is None:
+        picks = range(len(verses))
+    else:
+        picks = [rng.randrange(len(verses)) for _ in range(count)] if len(verses) else []
+
+    decoded = {}
+    def verse_at(i):
+        v = decoded.get(i)
+        if v is None:
+            v = decoded[i] = as_verse(verses[i])
+        return v
+
+    if mode == 4:
+        made = {i: iter(create_mode4_batch(verse_at(i), c, whole_level_num, rng))
+                for i, c in Counter(picks).items()}
+        return [(i, next(made[i])) for i in picks]
+    return [(i, create_problem(verse_at(i), mode, blank_num, whole_level_num, rng, stats)) for i in picks]
+
+# 문제를 생성하는 함수
+def create_blank_problem(scripture, mode, blank_num=5, whole_level_num=1, rng=random):
+    """create_problem 의 (문제 텍스트, 정답 리스트, 장절) 형태."""
+    p = create_problem(scripture, mode, blank_num, whole_level_num, rng)
+    return p.text, list(p.answers), p.reference
+
+
+# submit() 결과
+#   status: 'idle'(구절 없음) / 'next'(다음 문제로 넘어감) /
+#           'correct'(정답) / 'wrong'(오답) / 'revealed'(세 번 틀려 정답 공개)
+#   answer: 빈칸에 채워 넣은 정답 (correct/revealed 일 때)
+#   index : current_problem 안에서 채워 넣은 빈칸의 시작 위치 (Tk 인덱스 '1.<index>')
+#   blank_len: 정답으로 바뀐 빈칸의 길이 (그 구간만 지우고 정답을 넣으면 된다)
+SubmitResult = namedtuple("SubmitResult", ["status", "answer", "index", "blank_len"], defaults=(0,))
+
+class QuizEngine:
+    """
+    암송 세션 하나의 상태와 문제 생성/채점.
+    Tk 없이 동작하므로 여러 세션을 동시에 돌리거나 벤치마크할 수 있다.
+    """
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, blank_num=5, whole_level_num=1, mode=1, rng=None, seed=None, review=None, grader=None,
+                 events=None, stats=None, clock=None):
+        # 문제 설정
+        self.mode = mode
+        self.blank_num = blank_num
+        self.whole_level_num = whole_level_num
+        # 채점 기준 (grading.Grader). 기본은 정확히 일치
+        self.grader = grader if grader is not None else Grader()
+        # seed 를 남겨 두면 같은 세션을 그대로 재현할 수 있다
+        if rng is None:
+            if seed is None:
+                seed = random.randrange(1 << 63)
+            rng = random.Random(seed)
+        self.seed = seed
+        self.rng = rng
+
+        # 일차가 선택된 구절들: source 는 구절 시퀀스(list 또는 mmap 코퍼스),
+        # pool 은 아직 남은 구절의 source 인덱스 (O(1) 추첨/제거)
+        self.source = []
+        self.pool = DrawPool(rng=self.rng)
+        # 틀린 구절들: 각 항목 {'reference': str, 'verse': str, 'full_text': str, 'item': Verse,
+        #                       'book': str, 'modes': set, 'fails': int}
+        self.wrong_verses = []
+        self._wrong_keys = {}  # full_text -> 항목 (중복 확인/실패 횟수 갱신용)
+        self.left_verse = 0
+        self.fail_num = 0
+        # 복습 일정 저장소(review_store.ReviewStore). 없으면 기록하지 않는다
+        self.review = review
+        # 구절/어절별 통계(verse_stats.VerseStats). 있으면 답마다 기록하고 모드1 빈칸을 맞춘다
+        self.stats = stats
+        # 응답 시간을 재는 시계(초). 시뮬레이션은 가상 시계를 넣는다
+        self.clock = clock if clock is not None else time.monotonic
+        # 다음 문제 미리 만들기 (enable_prefetch)
+        self.prefetcher = None
+        # 이벤트 로그(event_log.EventLog). 없으면 남기지 않는다
+        self.session_id = uuid.uuid4().hex[:12]
+        self.events = None
+        self._last_event = self.clock()
+        if events is not None:
+            self.set_event_log(events)
+
+        # 현재 문제
+        self.clear_problem()
+
+    # ---- 이벤트 로그 ----
+    def set_event_log(self, events):
+        self.events = events
+        self._log('session', seed=self.seed, mode=self.mode)
+
+    def _log(self, kind, **fields):
+        if self.events is None:
+            return
+        self._last_event = self.clock()
+        self.events.log(self.session_id, kind, **fields)
+
+    # ---- 구절 목록 ----
+    def load(self, verses, weights=None):
+        """
+        암송할 구절 목록을 교체한다.
+        list/tuple(Verse 또는 '(ref)^본문' 문자열)은 바로 컴파일하고,
+        그 밖의 시퀀스(CompiledCorpus 등)는 뽑힐 때 구절을 디코드한다.
+        weights 를 주면 구절별 가중치로 뽑는다.
+        """
+        if isinstance(verses, (list, tuple)) or not hasattr(verses, "__getitem__"):
+            verses = [as_verse(v) for v in verses]
+        self.source = verses
+        self.pool = DrawPool(range(len(verses)), weights=weights, rng=self.rng)
+        self.left_verse = len(self.pool)
+        self._log('load', count=len(verses))
+        self.clear_problem()
+        if self.prefetcher is not None:
+            self.prefetcher.clear()
+
+    def reset(self):
+        """일차 초기화: 구절/틀린 갯수/틀린 구절 모두 비움."""
+        self.source = []
+        self.pool = DrawPool(rng=self.rng)
+        self.left_verse = 0
+        self.fail_num = 0
+        self._log('reset')
+        self.clear_wrong_verses()
+        self.clear_problem()
+        if self.prefetcher is not None:
+            self.prefetcher.clear()
+
+    def clear_problem(self):
+        self.problem_num = None
+        self._current_verse = None
+        self.problem = None
+        self.current_answers = deque()
+        self.current_reference = ""
+        self.attempts = 0
+        self.problem_completed = False
+        self.problem_total = 0
+        self.problem_wrong = 0
+        self.problem_revealed = 0
+        self._answer_started = self.clock()
+
+    # ---- 문제 ----
+    def next_problem(self, mode=None):
+        """남은 구절 중 하나를 골라 문제를 만든다. 구절이 없으면 None."""
+        if mode is not None:
+            self.mode = mode
+        if not self.pool:
+            return None
+        problem_num, problem = self._take_prefetched()
+        if problem is None:
+            problem_num = self._draw()
+            if problem_num is None:
+                return None
+            problem = create_problem(
+                as_verse(self.source[problem_num]), self.mode,
+                self.blank_num, self.whole_level_num, self.rng, self.stats
+            )
+        self.problem_num = problem_num
+        self._current_verse = as_verse(self.source[problem_num])
+        self.problem = problem
+        self._fill_prefetch()
+        self.current_answers = deque(self.problem.answers)
+        self.current_reference = self.problem.reference
+        self.attempts = 0
+        self.problem_completed = False
+        self.problem_total = len(self.current_answers)
+        self.problem_wrong = 0
+        self.problem_revealed = 0
+        self._log('shown', reference=self._current_verse.reference, line=self._current_verse.line,
+                  mode=self.mode, blanks=self.problem_total)
+        self._answer_started = self.clock()
+        return self.current_problem
+
+    def _draw(self):
+        """
+        풀에서 다음 구절 인덱스를 뽑는다. 장절 모드에서는 장절 형식이 틀린 구절(ref_error)을 건너뛴다:
+        그런 구절이 뽑히면 남은 구절 중 장절이 맞는 것에서 고르게 다시 뽑고, 없으면 None.
+        건너뛴 구절은 풀에 남아 모드1/2 에서는 그대로 나온다.
+        """
+        idx = self.pool.draw()
+        if self.mode not in REFERENCE_MODES or self._reference_ok(idx):
+            return idx
+        ok = [i for i in self.pool if self._reference_ok(i)]
+        return self.rng.choice(ok) if ok else None
+
+    def _reference_ok(self, idx):
+        return as_verse(self.source[idx]).ref_error is None
+
+    # ---- 미리 만들기 ----
+    def enable_prefetch(self, depth=1):
+        """다음 문제 depth 개를 작업 스레드에서 미리 만들어 둔다."""
+        from prefetch import ProblemPrefetcher
+        self.disable_prefetch()
+        self.prefetcher = ProblemPrefetcher(depth)
+
+    def disable_prefetch(self):
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+            self.prefetcher = None
+
+    def _prefetch_key(self):
+        # 설정이나 구절 목록이 바뀌면 미리 만든 문제는 버린다
+        return (self.mode, self.blank_num, self.whole_level_num, id(self.source), id(self.stats))
+
+    def _take_prefetched(self):
+        """미리 만든 문제 중 아직 유효한 첫 번째 (구절 인덱스, Problem). 없으면 (None, None)."""
+        if self.prefetcher is None:
+            return None, None
+        key = self._prefetch_key()
+        while len(self.prefetcher):
+            (k, idx), problem = self.prefetcher.take()
+            if k == key and idx in self.pool:
+                return idx, problem
+        return None, None
+
+    def _fill_prefetch(self):
+        """구절과 시드는 여기(호출 스레드)서 정하고, 문제 생성만 작업 스레드에 맡긴다."""
+        if self.prefetcher is None:
+            return
+        key = self._prefetch_key()
+        while not self.prefetcher.full():
+            idx = self._draw()
+            if idx is None:
+                break
+            self.prefetcher.put((key, idx), as_verse(self.source[idx]), self.mode,
+                                self.blank_num, self.whole_level_num, self.rng.getrandbits(64), self.stats)
+
+    def current_verse(self):
+        """현재 문제의 구절(Verse)."""
+        return self._current_verse
+
+    @property
+    def current_problem(self):
+        """현재 문제의 화면 텍스트 (채운 정답 포함)."""
+        return self.problem.text if self.problem is not None else ""
+
+    def fill_blank(self, answer):
+        """다음 빈칸을 answer 로 채우고 (시작 위치, 원래 빈칸 길이)를 돌려준다(빈칸 없으면 (-1, 0))."""
+        if self.problem is None:
+            return -1, 0
+        return self.problem.fill(answer)
+
+    # ---- 채점 ----
+    def submit(self, user_answer):
+        """답 하나를 채점하고 SubmitResult 를 돌려준다."""
+        result = self._grade(user_answer)
+        if self.events is not None and result.status in ('correct', 'wrong', 'revealed'):
+            ms = round((self.clock() - self._last_event) * 1000.0, 1)
+            self._log('submit', answer=user_answer, status=result.status, ms=ms)
+        return result
+
+    def _grade(self, user_answer):
+        if not self.left_verse:
+            return SubmitResult('idle', None, -1)
+
+        if self.problem_completed or not self.current_answers:
+            # 완료/소진 시 다음 문제로. 뽑은 구절 자체를 빼므로 그 사이 목록이 바뀌어도 안전
+            if self.problem_num is not None and self.pool.remove(self.problem_num):
+                self.left_verse -= 1
+            self.next_problem()
+            return SubmitResult('next', None, -1)
+
+        answer = self.current_answers[0]
+        if self.grader.match(user_answer, self.problem.keys[self.problem.filled]):
+            self._record_stats('correct')
+            index, blank_len = self.fill_blank(answer)
+            self.current_answers.popleft()
+            self.attempts = 0
+            if not self.current_answers:
+                self.finish_problem()
+            return SubmitResult('correct', answer, index, blank_len)
+
+        self.attempts += 1
+        self.problem_wrong += 1
+        if self.attempts < self.MAX_ATTEMPTS:
+            self._record_stats('wrong')
+            return SubmitResult('wrong', None, -1)
+
+        # 세 번 틀리면 틀린 구절로 저장하고 정답 공개
+        self._record_stats('revealed')
+        self.record_wrong_verse()
+        index, blank_len = self.fill_blank(answer)
+        self.current_answers.popleft()
+        self.fail_num += 1
+        self.problem_revealed += 1
+        self.attempts = 0
+        if not self.current_answers:
+            self.finish_problem()
+        return SubmitResult('revealed', answer, index, blank_len)
+
+    def _record_stats(self, status):
+        """지금 빈칸(아직 채우기 전)의 결과와 응답 시간을 통계에 남긴다."""
+        if self.stats is None:
+            return
+        now = self.clock()
+        ms = (now - self._answer_started) * 1000.0
+        self._answer_started = now
+        self.stats.record(self._current_verse, self.problem.word_index[self.problem.filled], status, ms)
+
+    def submit_many(self, text):
+        """
+        띄어 쓴 여러 어절(구절 전체 붙여넣기 포함)을 남은 빈칸에 차례로 맞춰 한 번에 채점한다.
+        (SubmitResult 리스트, 남은 입력) 을 돌려준다.
+        틀린 어절에서 멈추고, 그 앞 어절이 하나라도 채점되어 들어갔으면 틀린 어절부터를 남은 입력으로
+        돌려준다(고쳐서 다시 내도록). 첫 어절부터 틀렸으면 남은 입력은 "" (입력창을 비운다).
+        정답이 공개되면 다음 어절부터 이어서 맞춘다. 문제를 다 채우면 나머지 어절은 버린다.
+        """
+        tokens = text.split()
+        if not tokens:
+            return [self.submit("")], ""
+        if len(tokens) > 1 and self._matches_current(text):
+            # 한 어절을 띄어 쓴 것 (LOOSE/FUZZY 는 띄어쓰기를 무시한다): 나누지 않고 지금 빈칸 하나로
+            return [self.submit(text)], ""
+        results = []
+        for i, token in enumerate(tokens):
+            result = self.submit(token)
+            results.append(result)
+            if result.status == 'wrong':
+                return results, " ".join(tokens[i:]) if i else ""
+            if result.status in ('next', 'idle') or self.problem_completed:
+                break
+        return results, ""
+
+    def _matches_current(self, user_answer):
+        """user_answer 가 지금 빈칸의 정답으로 채점되는지 (상태는 바꾸지 않는다)."""
+        if not self.left_verse or self.problem is None or self.problem_completed or not self.current_answers:
+            return False
+        return self.grader.match(user_answer, self.problem.keys[self.problem.filled])
+
+    def finish_problem(self):
+        """마지막 빈칸까지 끝났을 때: 완료 표시 + 복습 일정 기록."""
+        self.problem_completed = True
+        if self.review is not None and self.problem_total:
+            self.review.record(self._current_verse, self.mode, self.problem_total,
+                               self.problem_wrong, self.problem_revealed)
+
+    def skip(self):
+        """현재 구절을 남겨둔 채 다른 문제로."""
+        if self.problem is not None:
+            self._log('skip', reference=self._current_verse.reference)
+        return self.next_problem()
+
+    # ---- 틀린 구절 ----
+    def record_wrong_verse(self):
+        v = self.current_verse()
+        # 이미 있으면 실패 횟수/모드만 갱신 (O(1))
+        wrong = self._wrong_keys.get(v.line)
+        if wrong is not None:
+            wrong['fails'] += 1
+            wrong['modes'].add(self.mode)
+            return
+        wrong = {
+            'reference': v.reference,
+            'verse': v.text,
+            'full_text': v.line,  # 전체 텍스트 저장
+            'item': v,            # 복습 시 다시 컴파일하지 않도록
+            'book': v.book,
+            'modes': {self.mode},
+            'fails': 1,           # 정답이 공개된 빈칸 수
+        }
+        self._wrong_keys[v.line] = wrong
+        self.wrong_verses.append(wrong)
+
+    def filter_wrong_verses(self, book=None, mode=None, min_fails=1):
+        """틀린 구절 중 book(책 약어)/mode 가 맞고 실패가 min_fails 번 이상인 것."""
+        return [
+            w for w in self.wrong_verses
+            if (book is None or w['book'] == book)
+            and (mode is None or mode in w['modes'])
+            and w['fails'] >= min_fails
+        ]
+
+    def wrong_books(self):
+        """틀린 구절에 나온 책들 (처음 나온 순서)."""
+        return list(dict.fromkeys(w['book'] for w in self.wrong_verses if w['book']))
+
+    def due_verses(self, limit=None):
+        """
+        지금 복습할 구절들: 이번 세션의 틀린 구절 + 복습 저장소에서 due 인 구절 (중복 없이).
+        정답이 공개됐어도 문제를 끝내지 않고 넘어간 구절은 저장소에 없으므로 세션 목록을 먼저 넣는다.
+        """
+        verses = [w['item'] for w in self.wrong_verses]
+        if self.review is None:
+            return verses[:limit] if limit is not None else verses
+        seen = set(self._wrong_keys)
+        for line in self.review.due_lines():
+            if limit is not None and len(verses) >= limit:
+                break
+            if line not in seen:
+                seen.add(line)
+                verses.append(line)
+        return verses[:limit] if limit is not None else verses
+
+    def review_wrong_verses(self):
+        """틀린 구절과 복습할 구절(due now)을 암송 목록으로 옮기고 틀린 구절/틀린 갯수 초기화."""
+        self.load(self.due_verses())
+        self.fail_num = 0
+        self._log('review')
+        self.clear_wrong_verses()
+
+    def clear_wrong_verses(self):
+        if self.wrong_verses:
+            self._log('clear_wrong')
+        self.wrong_verses = []
+        self._wrong_keys = {}
+
+    def trim_wrong_verses(self, limit):
+        """틀린 구절을 최근 limit 개만 남긴다 (오래된 것부터 버림)."""
+        drop = len(self.wrong_verses) - limit
+        if drop <= 0:
+            return 0
+        for wrong in self.wrong_verses[:drop]:
+            del self._wrong_keys[wrong['full_text']]
+        del self.wrong_verses[:drop]
+        return drop
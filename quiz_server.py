@@ -0,0 +1,382 @@
+"""
+여러 사람이 함께 쓰는 로컬 암송 서버 (asyncio, 표준 라이브러리만).
+
+세션마다 QuizEngine 을 하나씩 두고(Tk 앱의 전역 상태 대신), 코퍼스는 모든 세션이 같이 쓴다.
+HTTP/1.1 keep-alive 연결 위에서 JSON 으로 주고받는다.
+
+    python quiz_server.py --port 8765
+    python quiz_server.py --port 0 --synthetic 10000   # 부하 시험용 합성 코퍼스
+
+    POST   /sessions               {"mode": 2, "day": 1, "blank_num": 5, "whole_level_num": 1,
+                                    "seed": 1, "grading": 0}      day 가 null 이면 전체 일차
+    POST   /sessions/<id>/next     {"mode": 3}                    다른 문제 (스킵/모드 변경)
+    POST   /sessions/<id>/submit   {"answer": "태초에 하나님이"}   띄어 쓴 여러 어절 가능
+    DELETE /sessions/<id>
+    GET    /stats
+
+세션마다 메모리 예산(--session-budget)이 있어서 넘으면 오래된 틀린 구절부터 버리고,
+구절 목록 자체가 예산을 넘으면 413 으로 거절한다. 오래 쓰지 않은 세션은 정리한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+
+from corpus_library import CorpusLibrary
+from grading import Grader, LEVEL_NAMES
+from quiz_engine import QuizEngine
+
+MAX_BODY = 64 * 1024
+MAX_HEADERS = 100
+POOL_ITEM_BYTES = 120    # DrawPool 항목 하나 (리스트 칸 + 위치 dict, 실측 약 110)
+HISTORY_ITEM_BYTES = 64  # DrawPool.history 한 줄 (튜플 + 리스트 칸, record_history 일 때만)
+WRONG_ITEM_BYTES = 600   # 틀린 구절 항목 하나 (dict + 모드 set)
+# 전체 일차(성경 전체 약 31k 구절 x 120B = 3.7MB)도 한 세션에 담기도록
+DEFAULT_SESSION_BUDGET = 8 * 1024 * 1024
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Session:
+    __slots__ = ("id", "engine", "last_seen")
+
+    def __init__(self, sid, engine):
+        self.id = sid
+        self.engine = engine
+        self.last_seen = time.monotonic()
+
+    def approx_bytes(self):
+        """세션이 잡고 있는 메모리 어림값 (코퍼스는 공유하므로 빼고)."""
+        e = self.engine
+        n = (len(e.pool) * POOL_ITEM_BYTES + len(e.pool.history) * HISTORY_ITEM_BYTES
+             + len(e.wrong_verses) * WRONG_ITEM_BYTES)
+        if e.problem is not None:
+            n += sum(sys.getsizeof(p) for p in e.problem.parts)
+        # 남은 정답 deque (문자열은 Problem 과 같이 쓰므로 칸만)
+        n += sys.getsizeof(e.current_answers)
+        return n
+
+
+def int_field(body, name, default=None):
+    """본문의 정수 값. 정수로 바꿀 수 없으면 400."""
+    value = body.get(name, default)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HttpError(400, f"{name} 는 정수여야 합니다")
+
+def problem_payload(engine, expose_answers=False):
+    payload = {
+        "mode": engine.mode,
+        "text": engine.current_problem,
+        "blanks": len(engine.current_answers),
+        "left": engine.left_verse,
+        "fail_num": engine.fail_num,
+    }
+    if expose_answers:
+        payload["answers"] = list(engine.current_answers)
+    return payload
+
+
+class QuizServer:
+    def __init__(self, library, max_sessions=1000, max_connections=2000,
+                 session_budget=DEFAULT_SESSION_BUDGET, idle_timeout=1800.0,
+                 keepalive=30.0, expose_answers=False):
+        self.library = library
+        self.max_sessions = max_sessions
+        self.max_connections = max_connections
+        self.session_budget = session_budget
+        self.idle_timeout = idle_timeout
+        self.keepalive = keepalive
+        self.expose_answers = expose_answers
+        self.sessions = OrderedDict()  # id -> Session (최근에 쓴 것이 뒤)
+        self._corpora = {}             # day -> 공유 구절 시퀀스
+        self.connections = 0
+        self.requests = 0
+        self.errors = 0
+        self.evicted = 0
+
+    # ---- 세션 ----
+    def corpus_for(self, day):
+        corpus = self._corpora.get(day)
+        if corpus is None:
+            if day is None:
+                corpus = self.library.load_all()
+            else:
+                entry = self.library.day_entry(day)
+                if entry is None:
+                    raise HttpError(404, f"{day}일차가 없습니다")
+                corpus = self.library.load(entry.name)
+            self._corpora[day] = corpus
+        return corpus
+
+    def create_session(self, body):
+        mode = int_field(body, "mode", 1)
+        if mode not in (1, 2, 3, 4):
+            raise HttpError(400, "mode 는 1~4")
+        blank_num = int_field(body, "blank_num", 5)
+        if blank_num not in range(0, 11):
+            raise HttpError(400, "blank_num 은 0~10")
+        whole_level_num = int_field(body, "whole_level_num", 1)
+        if whole_level_num is None or whole_level_num < 1:
+            raise HttpError(400, "whole_level_num 은 1 이상")
+        grading = int_field(body, "grading", 0)
+        if grading not in LEVEL_NAMES:
+            raise HttpError(400, f"grading 은 {sorted(LEVEL_NAMES)} 중 하나")
+        corpus = self.corpus_for(int_field(body, "day", 1))
+        if len(corpus) * POOL_ITEM_BYTES > self.session_budget:
+            raise HttpError(413, "구절 목록이 세션 메모리 예산을 넘습니다")
+        if len(self.sessions) >= self.max_sessions:
+            self.evict_idle(force_one=True)
+        engine = QuizEngine(
+            blank_num=blank_num, whole_level_num=whole_level_num,
+            mode=mode, seed=int_field(body, "seed"),
+            grader=Grader(grading),
+        )
+        engine.load(corpus)
+        session = Session(secrets.token_hex(8), engine)
+        self.sessions[session.id] = session
+        engine.next_problem()
+        payload = problem_payload(engine, self.expose_answers)
+        payload["session"] = session.id
+        return 201, payload
+
+    def get_session(self, sid):
+        session = self.sessions.get(sid)
+        if session is None:
+            raise HttpError(404, "세션이 없습니다")
+        session.last_seen = time.monotonic()
+        self.sessions.move_to_end(sid)
+        return session
+
+    def enforce_budget(self, session):
+        """예산을 넘으면 오래된 틀린 구절부터 버린다."""
+        over = session.approx_bytes() - self.session_budget
+        if over > 0:
+            engine = session.engine
+            drop = -(-over // WRONG_ITEM_BYTES)
+            engine.trim_wrong_verses(max(0, len(engine.wrong_verses) - drop))
+
+    def evict_idle(self, force_one=False):
+        """idle_timeout 넘게 쓰지 않은 세션 정리. force_one 이면 가장 오래된 하나는 무조건."""
+        now = time.monotonic()
+        while self.sessions:
+            sid, session = next(iter(self.sessions.items()))
+            if not force_one and now - session.last_seen < self.idle_timeout:
+                break
+            del self.sessions[sid]
+            self.evicted += 1
+            force_one = False
+
+    # ---- 요청 처리 ----
+    def dispatch(self, method, path, body):
+        parts = [p for p in path.split("?", 1)[0].split("/") if p]
+        if parts == ["stats"] and method == "GET":
+            return 200, self.stats()
+        if parts == ["sessions"] and method == "POST":
+            return self.create_session(body)
+        if len(parts) >= 2 and parts[0] == "sessions":
+            session = self.get_session(parts[1])
+            engine = session.engine
+            if len(parts) == 2 and method == "DELETE":
+                del self.sessions[session.id]
+                return 200, {"deleted": session.id}
+            if len(parts) == 3 and method == "POST":
+                if parts[2] == "next":
+                    mode = int_field(body, "mode")
+                    if mode is not None and mode not in (1, 2, 3, 4):
+                        raise HttpError(400, "mode 는 1~4")
+                    engine.next_problem(mode)
+                    return 200, problem_payload(engine, self.expose_answers)
+                if parts[2] == "submit":
+                    return 200, self.submit(session, str(body.get("answer", "")))
+            raise HttpError(405, "지원하지 않는 요청")
+        raise HttpError(404, "없는 경로")
+
+    def submit(self, session, answer):
+        engine = session.engine
+        results, rest = engine.submit_many(answer)
+        payload = {
+            "results": [r._asdict() for r in results],
+            "rest": rest,
+            "completed": engine.problem_completed,
+            "left": engine.left_verse,
+            "fail_num": engine.fail_num,
+        }
+        if any(r.status == 'next' for r in results):
+            payload["problem"] = problem_payload(engine, self.expose_answers)
+        if any(r.status == 'revealed' for r in results):
+            self.enforce_budget(session)
+        return payload
+
+    def stats(self):
+        return {
+            "sessions": len(self.sessions),
+            "connections": self.connections,
+            "requests": self.requests,
+            "errors": self.errors,
+            "evicted": self.evicted,
+            "session_bytes": sum(s.approx_bytes() for s in self.sessions.values()),
+        }
+
+    # ---- HTTP ----
+    async def handle(self, reader, writer):
+        if self.connections >= self.max_connections:
+            writer.write(encode_response(503, {"error": "연결이 너무 많습니다"}, keep_alive=False))
+            await close_writer(writer)
+            return
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), self.keepalive)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except HttpError as e:
+                    writer.write(encode_response(e.status, {"error": str(e)}, keep_alive=False))
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self.requests += 1
+                try:
+                    status, payload = self.dispatch(method, path, body)
+                except HttpError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    self.errors += 1
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            self.connections -= 1
+            await close_writer(writer)
+
+    async def sweep(self, interval=60.0):
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle()
+
+
+async def read_request(reader):
+    """(method, path, headers, body). 연결이 끝났으면 None."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "잘못된 요청 줄")
+    headers = {}
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HttpError(400, "헤더가 너무 많습니다")
+        name, _, value = h.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HttpError(400, "잘못된 Content-Length")
+    if length < 0:
+        raise HttpError(400, "잘못된 Content-Length")
+    if length > MAX_BODY:
+        raise HttpError(413, "본문이 너무 큽니다")
+    body = {}
+    if length:
+        raw = await reader.readexactly(length)
+        try:
+            body = json.loads(raw.decode("utf-8"))
+        except ValueError:
+            raise HttpError(400, "JSON 본문이 아닙니다")
+        if not isinstance(body, dict):
+            raise HttpError(400, "JSON 객체가 아닙니다")
+    return method.upper(), path, headers, body
+
+def encode_response(status, payload, keep_alive=True):
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + data
+
+async def close_writer(writer):
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except Exception:
+        pass
+
+
+def synthetic_library(n, days=4):
+    """부하 시험용: 합성 구절 n 개를 days 개 일차 파일로 나눠 임시 폴더에."""
+    from bench import synth_lines
+    d = tempfile.mkdtemp(prefix="quiz-server-")
+    lines = synth_lines(n)
+    per_day = max(1, len(lines) // days)
+    for day in range(days):
+        chunk = lines[day * per_day:(day + 1) * per_day if day < days - 1 else None]
+        with open(os.path.join(d, f"day{day + 1}.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(chunk) + "\n")
+    return CorpusLibrary(d, budget_bytes=1 << 40)
+
+async def serve(server, host, port):
+    srv = await asyncio.start_server(server.handle, host, port, backlog=1024)
+    host, port = srv.sockets[0].getsockname()[:2]
+    # load_test.py 가 이 줄에서 포트를 읽는다
+    print(f"listening on {host}:{port}", flush=True)
+    sweeper = asyncio.ensure_future(server.sweep())
+    try:
+        async with srv:
+            await srv.serve_forever()
+    finally:
+        sweeper.cancel()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="여러 사람용 암송 서버")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765, help="0 이면 빈 포트")
+    ap.add_argument("--data", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+    ap.add_argument("--synthetic", type=int, default=0, help="data 대신 합성 구절 n 개")
+    ap.add_argument("--max-sessions", type=int, default=1000)
+    ap.add_argument("--max-connections", type=int, default=2000)
+    ap.add_argument("--session-budget", type=int, default=DEFAULT_SESSION_BUDGET, help="세션당 메모리 예산(바이트)")
+    ap.add_argument("--idle-timeout", type=float, default=1800.0, help="이 시간(초) 넘게 안 쓴 세션 정리")
+    ap.add_argument("--expose-answers", action="store_true", help="문제에 정답 목록을 포함 (부하 시험용)")
+    args = ap.parse_args(argv)
+
+    library = synthetic_library(args.synthetic) if args.synthetic else CorpusLibrary(args.data, budget_bytes=1 << 40)
+    server = QuizServer(library, args.max_sessions, args.max_connections, args.session_budget,
+                        args.idle_timeout, expose_answers=args.expose_answers)
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+간격 반복(SM-2) 복습 일정과 채점 기록을 로컬 SQLite 에 저장한다.
+
+review_items : (구절 ID, 모드)별 현재 일정. due 인덱스로 "지금 복습할 구절"을 바로 찾는다.
+outcomes     : 문제 하나를 끝낼 때마다 한 줄씩 추가만 하는 기록.
+"""
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+
+DAY_SECONDS = 86400.0
+MIN_EASE = 1.3
+START_EASE = 2.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS review_items (
+    verse_id    TEXT    NOT NULL,
+    mode        INTEGER NOT NULL,
+    reference   TEXT    NOT NULL,
+    line        TEXT    NOT NULL,
+    reps        INTEGER NOT NULL DEFAULT 0,
+    lapses      INTEGER NOT NULL DEFAULT 0,
+    ease        REAL    NOT NULL DEFAULT 2.5,
+    interval    REAL    NOT NULL DEFAULT 0,
+    due         REAL    NOT NULL,
+    last_review REAL,
+    PRIMARY KEY (verse_id, mode)
+);
+CREATE INDEX IF NOT EXISTS review_items_due ON review_items (due);
+CREATE TABLE IF NOT EXISTS outcomes (
+    id       INTEGER PRIMARY KEY,
+    verse_id TEXT    NOT NULL,
+    mode     INTEGER NOT NULL,
+    ts       REAL    NOT NULL,
+    quality  INTEGER NOT NULL,
+    total    INTEGER NOT NULL,
+    wrong    INTEGER NOT NULL,
+    revealed INTEGER NOT NULL
+);
+"""
+
+
+def default_store_path():
+    """사용자별 데이터 폴더의 review.sqlite3 (Windows: %APPDATA%, 그 외: ~/.local/share)."""
+    if sys.platform == "win32" and os.environ.get("APPDATA"):
+        base = os.environ["APPDATA"]
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "bible-memorization", "review.sqlite3")
+
+def verse_id(line: str) -> str:
+    """구절 원문('(ref)^본문')으로 만든 고정 ID."""
+    return hashlib.sha1(line.encode("utf-8")).hexdigest()[:16]
+
+def quality_of(total, wrong, revealed):
+    """
+    문제 결과를 SM-2 점수(0~5)로.
+    공개된 빈칸이 없으면 3~5(틀린 시도 수에 따라), 있으면 공개 비율에 따라 0~2.
+    """
+    if revealed == 0:
+        if wrong == 0:
+            return 5
+        return 4 if wrong <= 2 else 3
+    if revealed * 4 <= total:
+        return 2
+    return 1 if revealed * 2 <= total else 0
+
+def sm2_next(reps, lapses, ease, interval, quality, now):
+    """SM-2 한 단계. (reps, lapses, ease, interval_days, due) 를 돌려준다."""
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    if quality < 3:
+        # 실패: 처음부터 다시, 바로 복습 대상
+        return 0, lapses + 1, ease, 0.0, now
+    reps += 1
+    if reps == 1:
+        interval = 1.0
+    elif reps == 2:
+        interval = 6.0
+    else:
+        interval = round(interval * ease, 2)
+    return reps, lapses, ease, interval, now + interval * DAY_SECONDS
+
+
+class ReviewStore:
+    """SQLite 복습 저장소. record() 로 결과를 남기고 due_lines() 로 복습할 구절을 꺼낸다."""
+
+    def __init__(self, path=None, clock=None):
+        self.path = path or default_store_path()
+        # now 를 주지 않을 때 쓰는 시계 (시뮬레이션은 가상 시계를 넣는다)
+        self.clock = clock if clock is not None else time.time
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, verse, mode, total, wrong, revealed, now=None):
+        """문제 하나의 결과를 기록하고 그 (구절, 모드)의 다음 복습 시각을 돌려준다."""
+        now = self.clock() if now is None else now
+        vid = verse_id(verse.line)
+        quality = quality_of(total, wrong, revealed)
+        row = self.conn.execute(
+            "SELECT reps, lapses, ease, interval FROM review_items WHERE verse_id=? AND mode=?",
+            (vid, mode),
+        ).fetchone()
+        reps, lapses, ease, interval = row if row else (0, 0, START_EASE, 0.0)
+        reps, lapses, ease, interval, due = sm2_next(reps, lapses, ease, interval, quality, now)
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO outcomes (verse_id, mode, ts, quality, total, wrong, revealed)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (vid, mode, now, quality, total, wrong, revealed),
+            )
+            self.conn.execute(
+                "INSERT INTO review_items"
+                " (verse_id, mode, reference, line, reps, lapses, ease, interval, due, last_review)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (verse_id, mode) DO UPDATE SET"
+                " reps=excluded.reps, lapses=excluded.lapses, ease=excluded.ease,"
+                " interval=excluded.interval, due=excluded.due, last_review=excluded.last_review",
+                (vid, mode, verse.reference, verse.line, reps, lapses, ease, interval, due, now),
+            )
+        return due
+
+    def due_lines(self, now=None, limit=None):
+        """지금(now) 복습할 구절 원문들. 가장 오래 밀린 것부터, 구절당 한 번."""
+        now = self.clock() if now is None else now
+        # due 인덱스 순서대로 읽고 모드별 중복만 여기서 거른다
+        seen = set()
+        lines = []
+        for vid, line in self.conn.execute(
+                "SELECT verse_id, line FROM review_items WHERE due <= ? ORDER BY due", (now,)):
+            if vid in seen:
+                continue
+            seen.add(vid)
+            lines.append(line)
+            if limit is not None and len(lines) >= limit:
+                break
+        return lines
+
+    def due_count(self, now=None):
+        now = self.clock() if now is None else now
+        (n,) = self.conn.execute(
+            "SELECT COUNT(DISTINCT verse_id) FROM review_items WHERE due <= ?", (now,)
+        ).fetchone()
+        return n
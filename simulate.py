@@ -0,0 +1,390 @@
+"""
+가상 학습자 시뮬레이션: 암송 정책(빈칸 비율, 공개 어절 수, 시도 횟수, 채점 단계, 복습 일정)을 비교한다.
+
+    python simulate.py                                   # 기본 정책, 학습자 1000명 x 30일
+    python simulate.py --blank-num 3 5 7 --attempts 2 3  # 정책 격자 (곱집합) 비교
+    python simulate.py --review sm2 wrong none --days 60 --learners 4000 -j 8
+    python simulate.py --synthetic 2000 --new-per-day 8  # 합성 코퍼스로
+    python simulate.py --summarize sim_results.jsonl     # 저장한 결과로 보고서만 다시
+
+학습자는 실제 QuizEngine 으로 문제를 받고 실제 Grader 로 채점받는다. 학습자 모형은
+  - 기억: 어절(과 장절)마다 안정도 S(일). 회상 확률 p = exp(-경과 일수 / S)
+          빈칸을 맞히면 S 가 늘고(오래 잊고 있던 것을 떠올릴수록 많이), 정답이 공개되면 줄어든다.
+          보이는 어절은 읽기만 해도 조금 는다.
+  - 답  : 떠올리면 정답(가끔 오타: 문장부호 실수 또는 자모 하나), 못 떠올리면 구절의 다른 어절.
+          다시 시도할수록 조금 더 잘 떠올린다.
+  - 하루: 정해진 분 만큼만 푼다 (답마다 생각 + 타자 시간). 가끔 하루를 건너뛴다.
+학습자 성향은 시드로만 정해지므로 모든 정책이 같은 학습자들로 비교된다.
+
+학습자 결과는 끝나는 대로 --out 에 JSON Lines 로 한 줄씩 쓰고, 정책별 요약을 표로 보여 준다.
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from corpus import as_verse, load_verses
+from grading import EXACT, LOOSE, FUZZY, Grader
+from quiz_engine import QuizEngine
+from review_store import DAY_SECONDS, ReviewStore
+from verse_stats import VerseStats
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GRADING_LEVELS = {"exact": EXACT, "loose": LOOSE, "fuzzy": FUZZY}
+REVIEW_POLICIES = ("sm2", "wrong", "none")
+KNOWN_RECALL = 0.8      # 구절 어절들의 평균 회상 확률이 이 이상이면 '암송한 구절'
+READ_GAIN = 0.1         # 보이는 어절을 읽을 때 안정도 증가 비율
+HANGUL_BASE = 0xAC00
+HANGUL_COUNT = 11172
+
+
+# ---- 학습자 ----
+class Learner:
+    """시드 하나로 정해지는 가상 학습자 (성향 + 어절별 기억)."""
+
+    def __init__(self, seed):
+        traits = random.Random(f"{seed}:traits")
+        self.rng = random.Random(f"{seed}:answers")
+        self.engine_seed = traits.getrandbits(63)
+        self.s_init = traits.lognormvariate(math.log(1.5), 0.4)   # 처음 외운 뒤 안정도 (일)
+        self.first_recall = traits.uniform(0.5, 0.85)             # 처음 본 날 떠올릴 확률
+        self.growth = traits.uniform(2.0, 3.5)                    # 맞힐 때 안정도 최대 배율
+        self.lapse = traits.uniform(0.3, 0.6)                     # 공개될 때 안정도 배율
+        self.retry_gain = traits.uniform(0.1, 0.35)               # 다시 시도할 때 회상 보정
+        self.typo_rate = traits.uniform(0.02, 0.15)
+        self.think_s = traits.uniform(1.5, 4.0)                   # 답 하나 생각하는 시간
+        self.char_s = traits.uniform(0.25, 0.6)                   # 한 글자 타자 시간
+        self.read_s = traits.uniform(0.15, 0.35)                  # 보이는 어절 하나 읽는 시간
+        self.minutes = traits.uniform(8.0, 25.0)                  # 하루 공부 시간
+        self.skip_rate = traits.uniform(0.0, 0.2)                 # 하루를 건너뛸 확률
+        self.memory = {}  # 구절 원문 -> [안정도 리스트, 마지막 복습 시각 리스트] (마지막 칸은 장절)
+        self.now = 0.0    # 가상 시각 (일)
+
+    def clock(self):
+        """QuizEngine 용 가상 시계 (초)."""
+        return self.now * DAY_SECONDS
+
+    def recall(self, line, slot, at=None):
+        stab, last = self.memory[line]
+        at = self.now if at is None else at
+        return math.exp(-max(0.0, at - last[slot]) / stab[slot])
+
+    def show(self, verse, problem):
+        """문제를 처음 볼 때: 새 구절이면 기억을 만들고, 보이는 어절은 읽은 만큼 강화."""
+        n = len(verse.words)
+        mem = self.memory.get(verse.line)
+        if mem is None:
+            # 처음 본 날 회상 확률이 first_recall 이 되도록 마지막 복습 시각을 앞당겨 둔다
+            back = self.s_init * -math.log(self.first_recall)
+            mem = self.memory[verse.line] = [[self.s_init] * (n + 1), [self.now - back] * (n + 1)]
+        stab, last = mem
+        blanks = {n if i < 0 else i for i in problem.word_index}
+        for i in range(n + 1):
+            if i in blanks:
+                continue
+            p = math.exp(-max(0.0, self.now - last[i]) / stab[i])
+            stab[i] *= 1.0 + READ_GAIN * (1.0 - p)
+            last[i] = self.now
+        self.spend(self.read_s * (n - len(blanks)))
+
+    def spend(self, seconds):
+        self.now += seconds / DAY_SECONDS
+
+    def answer(self, engine, verse):
+        """지금 빈칸에 낼 답과 그때의 회상 확률."""
+        problem = engine.problem
+        k = problem.filled
+        i = problem.word_index[k]
+        slot = len(verse.words) if i < 0 else i
+        p = self.recall(verse.line, slot)
+        p_try = p + (1.0 - p) * min(1.0, self.retry_gain * engine.attempts)
+        rng = self.rng
+        if rng.random() < p_try:
+            text = problem.answers[k]
+            if rng.random() < self.typo_rate:
+                text = typo(text, rng)
+        else:
+            text = rng.choice(verse.norms) if verse.norms else "?"
+        self.spend(self.think_s + self.char_s * len(text))
+        return text, slot, p
+
+    def learn(self, line, slot, p, status, attempts):
+        stab, last = self.memory[line]
+        if status == 'correct':
+            # 잊어 가던 것을 떠올릴수록 많이 는다 (바로 다시 본 것은 거의 그대로). 재시도 끝에 맞히면 절반
+            gain = (self.growth - 1.0) * math.sqrt(1.0 - p)
+            stab[slot] *= 1.0 + (gain if attempts == 0 else gain * 0.5)
+        elif status == 'revealed':
+            stab[slot] = max(self.s_init, stab[slot] * self.lapse)
+        else:
+            return
+        last[slot] = self.now
+
+    def retention(self, at):
+        """at 시각의 (평균 회상 확률, 암송한 구절 수, 만난 구절 수)."""
+        total = 0.0
+        count = 0
+        known = 0
+        for stab, last in self.memory.values():
+            verse = sum(math.exp(-max(0.0, at - t) / s) for s, t in zip(stab, last))
+            total += verse
+            count += len(stab)
+            known += verse >= KNOWN_RECALL * len(stab)
+        return (total / count if count else 0.0), known, len(self.memory)
+
+
+def typo(word, rng):
+    """문장부호 실수(LOOSE 부터 통과) 또는 한글 음절 하나의 받침 바꾸기(FUZZY 에서 자모 하나)."""
+    syllables = [i for i, ch in enumerate(word) if 0 <= ord(ch) - HANGUL_BASE < HANGUL_COUNT]
+    if not syllables or rng.random() < 0.5:
+        return word + "."
+    i = rng.choice(syllables)
+    code = ord(word[i]) - HANGUL_BASE
+    final = code % 28
+    code += (final + rng.randrange(1, 28)) % 28 - final
+    return word[:i] + chr(HANGUL_BASE + code) + word[i + 1:]
+
+
+# ---- 정책 ----
+def policy_key(policy):
+    return (f"m{policy['mode']} b{policy['blank_num']} w{policy['whole_level_num']} a{policy['attempts']}"
+            f" {policy['grading']} {policy['review']} n{policy['new_per_day']}"
+            + (" adaptive" if policy["adaptive"] else ""))
+
+def policy_grid(args):
+    """CLI 값들의 곱집합 -> 정책 dict 리스트."""
+    names = ("mode", "blank_num", "whole_level_num", "attempts", "grading", "review", "new_per_day", "adaptive")
+    values = (args.mode, args.blank_num, args.whole_level, args.attempts, args.grading, args.review,
+              args.new_per_day, args.adaptive)
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def simulate_learner(verses, policy, learner_id, seed, days, test_delay):
+    """학습자 한 명이 정책 하나로 days 일 공부한 결과 dict."""
+    learner = Learner(f"{seed}:{learner_id}")
+    review = ReviewStore(":memory:", clock=learner.clock) if policy["review"] == "sm2" else None
+    engine = QuizEngine(policy["blank_num"], policy["whole_level_num"], policy["mode"],
+                        seed=learner.engine_seed, review=review, grader=Grader(GRADING_LEVELS[policy["grading"]]),
+                        stats=VerseStats() if policy["adaptive"] else None, clock=learner.clock)
+    engine.MAX_ATTEMPTS = policy["attempts"]
+    by_line = {v.line: v for v in verses}
+    fresh = deque(range(len(verses)))  # 아직 한 번도 안 본 구절
+    totals = {"days": 0, "problems": 0, "answers": 0, "correct": 0, "wrong": 0, "revealed": 0,
+              "reviews": 0, "minutes": 0.0}
+    curve = []
+
+    for day in range(days):
+        learner.now = float(day)
+        if learner.rng.random() >= learner.skip_rate:
+            # 오늘 목록: 복습할 구절 + 새 구절 new_per_day 개
+            if policy["review"] == "none":
+                due = []
+            else:
+                due = [by_line[x] if isinstance(x, str) else x for x in engine.due_verses()]
+                engine.clear_wrong_verses()
+            while fresh and verses[fresh[0]].line in learner.memory:
+                fresh.popleft()
+            new = [verses[i] for i in itertools.islice(fresh, policy["new_per_day"])]
+            totals["reviews"] += len(due)
+            totals["days"] += 1
+            run_session(learner, engine, due + new, learner.minutes * 60.0, totals)
+            totals["minutes"] += (learner.now - day) * 1440.0
+        curve.append(round(learner.retention(day + 1.0)[0], 4))
+
+    if review is not None:
+        review.close()
+    end = float(days)
+    retention, known, seen = learner.retention(end)
+    retention_later, known_later, _ = learner.retention(end + test_delay)
+    answers = totals["answers"] or 1
+    hours = totals["minutes"] / 60.0
+    return {
+        "learner": learner_id, **totals, "minutes": round(totals["minutes"], 1),
+        "seen": seen, "retention": round(retention, 4), "known": known,
+        "retention_later": round(retention_later, 4), "known_later": known_later,
+        "reveal_rate": round(totals["revealed"] / answers, 4), "wrong_rate": round(totals["wrong"] / answers, 4),
+        "known_per_hour": round(known_later / hours, 3) if hours else 0.0,
+        "curve": curve,
+    }
+
+def run_session(learner, engine, verses, budget_s, totals):
+    """오늘 구절들을 시간이 다 될 때까지 푼다."""
+    if not verses:
+        return
+    engine.load(verses)
+    if engine.next_problem() is None:
+        return
+    end = learner.now + budget_s / DAY_SECONDS
+    shown = None
+    while engine.left_verse and learner.now < end:
+        if engine.problem is not shown:
+            shown = engine.problem
+            verse = engine.current_verse()
+            learner.show(verse, shown)
+            totals["problems"] += 1
+        if engine.problem_completed or not engine.current_answers:
+            engine.submit("")  # 다음 문제로
+            continue
+        attempts = engine.attempts
+        text, slot, p = learner.answer(engine, verse)
+        status = engine.submit(text).status
+        totals["answers"] += 1
+        totals[status] += 1
+        learner.learn(verse.line, slot, p, status, attempts)
+
+
+# ---- 작업 프로세스 ----
+_verses = None
+
+def _init_worker(lines):
+    global _verses
+    _verses = [as_verse(line) for line in lines]
+
+def run_chunk(job):
+    """(정책 번호, 정책, 학습자 번호들, seed, days, test_delay) -> (정책 번호, 결과 리스트)."""
+    index, policy, learner_ids, seed, days, test_delay = job
+    return index, [simulate_learner(_verses, policy, i, seed, days, test_delay) for i in learner_ids]
+
+
+# ---- 요약 ----
+def _mean(vals):
+    return sum(vals) / len(vals) if vals else 0.0
+
+def _pct(sorted_vals, q):
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+def summarize(rows):
+    """학습자 결과 줄들 -> 정책별 요약 (정책 키 -> dict, 처음 나온 순서)."""
+    groups = {}
+    for r in rows:
+        groups.setdefault(r["policy"], []).append(r)
+    out = {}
+    for key, rs in groups.items():
+        later = sorted(r["retention_later"] for r in rs)
+        active = [r["days"] or 1 for r in rs]
+        curves = [r["curve"] for r in rs]
+        out[key] = {
+            "params": rs[0]["params"],
+            "learners": len(rs),
+            "retention": round(_mean([r["retention"] for r in rs]), 4),
+            "retention_later": round(_mean(later), 4),
+            "retention_later_p10": _pct(later, 0.1),
+            "retention_later_p90": _pct(later, 0.9),
+            "known_later": round(_mean([r["known_later"] for r in rs]), 2),
+            "seen": round(_mean([r["seen"] for r in rs]), 2),
+            "known_per_hour": round(_mean([r["known_per_hour"] for r in rs]), 3),
+            "minutes_per_day": round(_mean([r["minutes"] / d for r, d in zip(rs, active)]), 2),
+            "answers_per_day": round(_mean([r["answers"] / d for r, d in zip(rs, active)]), 2),
+            "reveal_rate": round(_mean([r["reveal_rate"] for r in rs]), 4),
+            "wrong_rate": round(_mean([r["wrong_rate"] for r in rs]), 4),
+            "curve": [round(_mean(day), 4) for day in zip(*curves)],
+        }
+    return out
+
+def print_report(summary, test_delay):
+    print(f"{'정책':<40} {'학습자':>6} {'기억률':>6} {f'+{test_delay}일':>6} {'(p10~p90)':>13}"
+          f" {'암송':>6} {'/시간':>6} {'분/일':>6} {'답/일':>6} {'공개':>6} {'오답':>6}")
+    for key, s in summary.items():
+        print(f"{key:<40} {s['learners']:>6} {s['retention']:>6.3f} {s['retention_later']:>6.3f}"
+              f" {s['retention_later_p10']:>6.3f}~{s['retention_later_p90']:<6.3f}"
+              f" {s['known_later']:>6.1f} {s['known_per_hour']:>6.2f} {s['minutes_per_day']:>6.1f}"
+              f" {s['answers_per_day']:>6.1f} {s['reveal_rate']:>6.3f} {s['wrong_rate']:>6.3f}")
+
+def read_rows(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="가상 학습자로 암송 정책 비교")
+    ap.add_argument("corpus", nargs="*", default=[os.path.join(HERE, "data", "day1.txt")],
+                    help="txt 코퍼스 파일들 (기본 data/day1.txt)")
+    ap.add_argument("--synthetic", type=int, default=0, help="코퍼스 대신 합성 구절 N 개")
+    ap.add_argument("--learners", type=int, default=1000)
+    ap.add_argument("--days", type=int, default=30)
+    ap.add_argument("--test-delay", type=int, default=7, help="끝난 뒤 며칠 후 기억률을 볼지")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="작업 프로세스 수 (기본 CPU 수)")
+    ap.add_argument("--chunk", type=int, default=25, help="작업 하나에 넣을 학습자 수")
+    ap.add_argument("--mode", type=int, nargs="+", default=[1], choices=[1, 2, 3, 4])
+    ap.add_argument("--blank-num", type=int, nargs="+", default=[5])
+    ap.add_argument("--whole-level", type=int, nargs="+", default=[1])
+    ap.add_argument("--attempts", type=int, nargs="+", default=[QuizEngine.MAX_ATTEMPTS])
+    ap.add_argument("--grading", nargs="+", default=["exact"], choices=sorted(GRADING_LEVELS))
+    ap.add_argument("--review", nargs="+", default=["sm2"], choices=REVIEW_POLICIES)
+    ap.add_argument("--new-per-day", type=int, nargs="+", default=[5])
+    ap.add_argument("--adaptive", type=int, nargs="+", default=[0], choices=[0, 1],
+                    help="1 이면 구절 통계로 모드1 빈칸을 맞춘다")
+    ap.add_argument("--out", default="sim_results.jsonl", help="학습자 결과를 쓸 JSON Lines 파일")
+    ap.add_argument("--report", help="정책별 요약을 이 JSON 파일에도")
+    ap.add_argument("--summarize", metavar="JSONL", help="시뮬레이션 없이 저장한 결과로 보고서만")
+    args = ap.parse_args(argv)
+
+    if args.summarize:
+        summary = summarize(read_rows(args.summarize))
+    else:
+        if args.synthetic:
+            from bench import synth_lines
+            lines = synth_lines(args.synthetic, args.seed)
+        else:
+            lines = [v.line for path in args.corpus for v in load_verses(path)]
+        if not lines:
+            print("구절이 없습니다.", file=sys.stderr)
+            return 1
+
+        policies = policy_grid(args)
+        jobs = args.jobs or os.cpu_count() or 1
+        work = [(p, policy, range(lo, min(lo + args.chunk, args.learners)), args.seed, args.days, args.test_delay)
+                for p, policy in enumerate(policies) for lo in range(0, args.learners, args.chunk)]
+        keys = [policy_key(p) for p in policies]
+        rows = []
+        t0 = time.perf_counter()
+        with open(args.out, "w", encoding="utf-8") as out:
+            if jobs == 1:
+                _init_worker(lines)
+                results = map(run_chunk, work)
+            else:
+                pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(lines,))
+                results = (f.result() for f in as_completed([pool.submit(run_chunk, w) for w in work]))
+            try:
+                done = 0
+                for index, chunk in results:
+                    for r in chunk:
+                        r["policy"] = keys[index]
+                        r["params"] = policies[index]
+                        out.write(json.dumps(r, ensure_ascii=False) + "\n")
+                        rows.append(r)
+                    out.flush()
+                    done += 1
+                    print(f"\r{done}/{len(work)} 작업  {time.perf_counter() - t0:.1f}초", end="", file=sys.stderr)
+            finally:
+                if jobs != 1:
+                    pool.shutdown(cancel_futures=True)
+        print(file=sys.stderr)
+        # 끝난 순서와 상관없이 정책 순서로 요약한다
+        rows.sort(key=lambda r: (keys.index(r["policy"]), r["learner"]))
+        summary = summarize(rows)
+        print(f"구절 {len(lines)}  정책 {len(policies)}  학습자 {args.learners}  {args.days}일"
+              f"  {time.perf_counter() - t0:.1f}초  -> {args.out}")
+
+    print_report(summary, args.test_delay)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+시작 단계별 시간 측정 (--startup-profile).
+
+    python bible.py --startup-profile            # 표준 출력으로 보고
+    python bible.py --startup-profile=start.txt  # 파일로 보고 (콘솔 없는 exe 용)
+    python bible.py --startup-profile --startup-exit  # 보고 후 바로 종료 (measure_launch.py 용)
+
+측정할 때는 첫 일차를 골라 첫 문제까지 띄운 시간을 잰다.
+
+mark(이름) 을 부를 때마다 앞 mark 이후 걸린 시간을 그 단계로 기록한다.
+시작 작업이 끝나고(finish) 창도 뜨면(window_shown) 단계별 시간과
+창이 뜨기까지 걸린 시간을 목표와 함께 적는다.
+"""
+import sys
+import time
+
+STARTUP_TARGET_MS = 1500.0  # 실습실 저사양 PC 기준 창이 뜨기까지 목표
+OPTION = "--startup-profile"
+EXIT_OPTION = "--startup-exit"
+
+
+class StartupProfile:
+    def __init__(self, enabled=False, out=None, t0=None, target_ms=STARTUP_TARGET_MS, exit_when_done=False):
+        self.enabled = enabled
+        self.exit_when_done = exit_when_done
+        self.out = out          # 보고 파일 경로 (None 이면 표준 출력)
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.target_ms = target_ms
+        self.phases = []        # (이름, ms)
+        self.window_ms = None   # 창이 뜬 시각 (시작부터)
+        self.finished = False
+        self.reported = False
+        self._last = self.t0
+
+    @classmethod
+    def from_argv(cls, argv, t0=None):
+        """argv 에서 --startup-profile[=파일], --startup-exit 을 찾아 꺼낸다 (Tk 에 넘어가지 않도록 argv 에서 뺀다)."""
+        enabled, out, exit_when_done = False, None, False
+        for arg in list(argv[1:]):
+            if arg == OPTION or arg.startswith(OPTION + "="):
+                enabled = True
+                out = arg.partition("=")[2] or None
+                argv.remove(arg)
+            elif arg == EXIT_OPTION:
+                exit_when_done = True
+                argv.remove(arg)
+        return cls(enabled, out, t0, exit_when_done=exit_when_done and enabled)
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, (now - self._last) * 1000.0))
+        self._last = now
+
+    def window_shown(self):
+        """창이 처음 그려졌을 때 한 번 부른다."""
+        if self.window_ms is None:
+            self.mark("window")
+            self.window_ms = (self._last - self.t0) * 1000.0
+            if self.finished:
+                self.report()
+
+    def finish(self):
+        """시작 작업이 모두 끝났을 때. 창이 이미 떴으면 바로 보고한다."""
+        self.finished = True
+        if self.window_ms is not None:
+            self.report()
+
+    def total_ms(self):
+        return (self._last - self.t0) * 1000.0
+
+    def report(self):
+        if not self.enabled:
+            return
+        self.reported = True
+        lines = [f"{name:20s} {ms:9.1f} ms" for name, ms in self.phases]
+        lines.append(f"{'total':20s} {self.total_ms():9.1f} ms")
+        if self.window_ms is not None:
+            status = "OK" if self.window_ms <= self.target_ms else "목표 초과"
+            lines.append(f"창 표시까지 {self.window_ms:.1f} ms (목표 {self.target_ms:.0f} ms) {status}")
+        text = "\n".join(lines) + "\n"
+        if self.out:
+            with open(self.out, "w", encoding="utf-8") as f:
+                f.write(text)
+        elif sys.stdout is not None:
+            sys.stdout.write(text)
+            sys.stdout.flush()
@@ -0,0 +1,176 @@
+"""
+코퍼스 검색 색인: 단어/장절로 구절을 찾아 바로 암송 목록으로.
+
+단어 색인 : 어절의 느슨한 형태(grading.loose_token, 소문자) -> 그 어절이 나오는 구절 번호들 (오름차순 array).
+            검색어는 접두어로 맞춘다 ('하나님' -> 하나님이/하나님의/하나님께서 ...).
+            정렬된 어휘 목록에서 bisect 로 접두어 범위를 찾으므로 어휘가 커도 검색어당 O(log V + 결과).
+장절 색인 : (책, 장) -> [(첫 절, 끝 절, 구절 번호)]. parse_ref_parts / split_verse_parts 로 푼다.
+
+검색어 예
+    하나님 창조          두 단어가 모두 들어 있는 구절
+    요 5:*  /  요 5      요 5장 전체
+    요 5:38  /  요 5:38-40
+    요 5:* 사랑          장절 + 단어
+    요 *                 요 전체
+
+.bvc 코퍼스는 어절을 문자열 id 로 읽어 같은 어절은 한 번만 정규화하므로 전체 성경도 한 번에 색인한다.
+"""
+import re
+from array import array
+from bisect import bisect_left
+
+from corpus import as_verse, parse_ref_parts, split_verse_parts
+from corpus_cache import CompiledCorpus
+from corpus_library import ChainedCorpus, Selection
+from grading import loose_token
+
+# 장/절 지정: '5', '5:*', '5:38', '5:38-40', '*'
+REF_SPEC_RE = re.compile(r'^(\*|\d+)(?::(\*|\d+(?:-\d+)?))?$')
+NUMBER_RE = re.compile(r'\d+')
+PREFIX_END = "\U0010ffff"  # 접두어 범위의 끝 (어떤 글자보다 뒤)
+
+
+def search_key(word):
+    """색인/검색어 공통 정규화: NFC, 띄어쓰기/문장부호 제거, 소문자."""
+    return loose_token(word).lower()
+
+def verse_range(verse):
+    """'38-39' -> (38, 39), '37,39' -> (37, 39), '39' -> (39, 39). 숫자가 없으면 None."""
+    _, parts = split_verse_parts(verse)
+    nums = [int(n) for p in parts for n in NUMBER_RE.findall(p)]
+    if not nums:
+        return None
+    return min(nums), max(nums)
+
+
+class VerseIndex:
+    """
+    구절 시퀀스(list / CompiledCorpus / ChainedCorpus) 하나의 검색 색인.
+    검색 결과는 그 시퀀스의 구절 번호(오름차순)다.
+    """
+
+    def __init__(self, verses):
+        self.source = verses
+        self.postings = {}   # 검색 키 -> array('I') 구절 번호
+        self.refs = {}       # (책, 장) -> [(첫 절, 끝 절, 구절 번호)]
+        self.books = {}      # 책 -> [구절 번호]
+        self.bad_refs = 0    # 장절을 풀 수 없는 구절 수 (단어 검색은 된다)
+        base = 0
+        for part in (verses.parts if isinstance(verses, ChainedCorpus) else [verses]):
+            self._add_part(part, base)
+            base += len(part)
+        self.size = base
+        self.vocab = sorted(self.postings)
+
+    def __len__(self):
+        return self.size
+
+    # ---- 만들기 ----
+    def _add_part(self, part, base):
+        if isinstance(part, CompiledCorpus):
+            # 문자열 id 별로 먼저 모으고, 정규화는 서로 다른 어절마다 한 번만
+            strings = part.strings()
+            by_sid = {}
+            for vid, (ref_id, ids) in enumerate(part.raw_verses(), base):
+                self._add_reference(strings[ref_id], vid)
+                for sid in set(ids):
+                    vids = by_sid.get(sid)
+                    if vids is None:
+                        vids = by_sid[sid] = array('I')
+                    vids.append(vid)
+            for sid, vids in by_sid.items():
+                self._merge(search_key(strings[sid]), vids)
+        else:
+            by_key = {}
+            for vid, item in enumerate(part, base):
+                v = as_verse(item)
+                self._add_reference(v.reference, vid)
+                for key in {search_key(w) for w in v.words}:
+                    vids = by_key.get(key)
+                    if vids is None:
+                        vids = by_key[key] = array('I')
+                    vids.append(vid)
+            for key, vids in by_key.items():
+                self._merge(key, vids)
+
+    def _merge(self, key, vids):
+        """key 의 구절 번호들에 vids(오름차순)를 합친다. 앞 코퍼스의 번호가 항상 작다."""
+        if not key:
+            return
+        ids = self.postings.get(key)
+        if ids is None:
+            self.postings[key] = vids
+        elif ids[-1] < vids[0]:
+            ids.extend(vids)
+        else:
+            # 어절은 달라도 검색 키가 같은 경우 (문장부호만 다름 등)
+            self.postings[key] = array('I', sorted(set(ids).union(vids)))
+
+    def _add_reference(self, reference, vid):
+        try:
+            book, chap, verse = parse_ref_parts(reference)
+            chap = int(chap)
+        except ValueError:
+            self.bad_refs += 1
+            return
+        span = verse_range(verse)
+        if span is None:
+            self.bad_refs += 1
+            return
+        self.refs.setdefault((book, chap), []).append((span[0], span[1], vid))
+        self.books.setdefault(book, []).append(vid)
+
+    # ---- 찾기 ----
+    def word_ids(self, word):
+        """word 로 시작하는 어절이 있는 구절 번호들 (set)."""
+        key = search_key(word)
+        if not key:
+            return set(range(self.size))
+        lo = bisect_left(self.vocab, key)
+        hi = bisect_left(self.vocab, key + PREFIX_END, lo)
+        if hi - lo == 1:
+            return set(self.postings[self.vocab[lo]])
+        return set().union(*(self.postings[k] for k in self.vocab[lo:hi]))
+
+    def reference_ids(self, book, chap=None, first=None, last=None):
+        """book (장 chap, 절 first~last 와 겹치는) 구절 번호들. None 은 전체."""
+        if chap is None:
+            return list(self.books.get(book, ()))
+        rows = self.refs.get((book, chap), ())
+        if first is None:
+            return [vid for _, _, vid in rows]
+        return [vid for lo, hi, vid in rows if lo <= last and first <= hi]
+
+    def parse_query(self, query):
+        """검색어 -> (장절 조건 (책, 장, 첫 절, 끝 절) 또는 None, 단어 목록)."""
+        tokens = query.replace("(", " ").replace(")", " ").split()
+        if len(tokens) >= 2:
+            m = REF_SPEC_RE.match(tokens[1])
+            if m and tokens[0] in self.books:
+                chap = None if m.group(1) == "*" else int(m.group(1))
+                verse = m.group(2)
+                first = last = None
+                if chap is not None and verse not in (None, "*"):
+                    first, last = verse_range(verse)
+                return (tokens[0], chap, first, last), tokens[2:]
+        return None, tokens
+
+    def search(self, query):
+        """검색어에 맞는 구절 번호들 (오름차순 리스트). 조건이 없으면 빈 리스트."""
+        ref, words = self.parse_query(query)
+        if ref is None and not words:
+            return []
+        sets = [self.word_ids(w) for w in words]
+        if ref is not None:
+            sets.append(set(self.reference_ids(*ref)))
+        sets.sort(key=len)
+        result = sets[0]
+        for s in sets[1:]:
+            if not result:
+                break
+            result = result & s
+        return sorted(result)
+
+    def select(self, ids):
+        """구절 번호들을 QuizEngine.load 에 바로 넣을 수 있는 시퀀스로."""
+        return Selection(self.source, ids)
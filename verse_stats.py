@@ -0,0 +1,204 @@
+"""
+구절/어절별 누적 통계와 모드1 적응형 빈칸.
+
+답 하나를 낼 때마다(record) 그 구절과 그 어절의 시도/오답/공개 수와
+응답 시간(지수 이동 평균)을 O(1)로 갱신한다. 값은 array 에 담아 구절이 많아도 작게 유지한다.
+구절 번호는 처음 나올 때 붙이고, 그 구절의 어절들은 연속된 번호 구간(token_base 부터)을 받는다.
+
+모드1 은 이 통계로
+  - 빈칸 수: 잘 아는 구절일수록 많이, 자주 틀리는 구절일수록 적게 (0.5 ~ 1.5 배)
+  - 빈칸 위치: 약한 어절일수록 자주 (Fenwick 트리 가중 추첨, 어절당 O(log n))
+를 정한다. 한 번도 안 풀어 본 구절은 지금까지처럼 균등하게 고른다.
+빈칸 후보(maskable) 가중치 트리는 구절마다 처음 뽑을 때 한 번 만들고, record() 가 그 어절 칸만
+O(log n) 으로 고친다. 그래서 문제 하나의 빈칸 k 개는 O(k log n) 에 뽑힌다.
+"""
+import json
+import os
+import struct
+import threading
+from array import array
+
+from draw_pool import FenwickTree
+
+RT_ALPHA = 0.3          # 응답 시간 이동 평균 가중치
+RT_SLOW_MS = 8000.0     # 이보다 오래 걸리면 가장 약한 것으로 본다
+MAGIC = b"BVS1"
+_HEADER = struct.Struct("<4sI")  # MAGIC, JSON 길이
+_ARRAYS = ("token_base", "v_attempts", "v_errors", "v_reveals", "v_rt",
+           "t_attempts", "t_errors", "t_reveals", "t_rt")
+
+
+class VerseStats:
+    def __init__(self):
+        self._slots = {}               # 구절 원문 -> 구절 번호
+        self.lines = []                # 구절 번호 -> 원문
+        self.token_base = array('I')   # 구절 번호 -> 첫 어절 번호
+        # 구절별
+        self.v_attempts = array('I')
+        self.v_errors = array('I')
+        self.v_reveals = array('I')
+        self.v_rt = array('f')
+        # 어절별
+        self.t_attempts = array('I')
+        self.t_errors = array('I')
+        self.t_reveals = array('I')
+        self.t_rt = array('f')
+        # 구절 번호 -> (maskable 어절 가중치 FenwickTree, {어절 번호: 트리 위치}). pick_blanks 가 처음 만든다
+        self._trees = {}
+        # 미리 만들기 스레드의 pick_blanks 와 화면 스레드의 record/slot 이 배열과 트리를 같이 고치므로
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.lines)
+
+    def slot(self, verse, create=True):
+        """구절 번호 (처음 보는 구절이면 새로 붙인다). create=False 면 없을 때 None."""
+        s = self._slots.get(verse.line)
+        if s is not None or not create:
+            return s
+        with self._lock:
+            s = self._slots.get(verse.line)
+            if s is not None:
+                return s
+            s = len(self.lines)
+            self.lines.append(verse.line)
+            self.token_base.append(len(self.t_attempts))
+            for a in (self.v_attempts, self.v_errors, self.v_reveals):
+                a.append(0)
+            self.v_rt.append(0.0)
+            n = len(verse.words)
+            for a in (self.t_attempts, self.t_errors, self.t_reveals, self.t_rt):
+                a.frombytes(bytes(a.itemsize * n))  # 0 으로 n 칸
+            # 배열을 다 늘린 뒤에 번호를 보이게 한다 (다른 스레드가 번호만 보고 배열을 읽지 않도록)
+            self._slots[verse.line] = s
+            return s
+
+    # ---- 갱신 ----
+    def record(self, verse, word_index, status, ms=None):
+        """
+        답 하나의 결과. status: 'correct' | 'wrong' | 'revealed'.
+        word_index 는 빈칸 어절 번호(장절 빈칸이면 -1, 어절 통계는 건너뜀), ms 는 응답 시간.
+        """
+        miss = status != 'correct'
+        reveal = status == 'revealed'
+        with self._lock:
+            s = self.slot(verse)
+            self.v_attempts[s] += 1
+            self.v_errors[s] += miss
+            self.v_reveals[s] += reveal
+            if ms is not None:
+                self.v_rt[s] += RT_ALPHA * (ms - self.v_rt[s])
+            if word_index < 0:
+                return
+            t = self.token_base[s] + word_index
+            self.t_attempts[t] += 1
+            self.t_errors[t] += miss
+            self.t_reveals[t] += reveal
+            if ms is not None:
+                self.t_rt[t] += RT_ALPHA * (ms - self.t_rt[t])
+            hit = self._trees.get(s)
+            if hit is not None:
+                j = hit[1].get(word_index)
+                if j is not None:
+                    hit[0].set(j, self.token_weight(t))
+
+    # ---- 조회 ----
+    def error_rate(self, verse):
+        """오답 비율 (사전값을 섞어 한두 번의 결과로 튀지 않게). 처음 보는 구절은 None."""
+        s = self.slot(verse, create=False)
+        if s is None:
+            return None
+        return (self.v_errors[s] + 1) / (self.v_attempts[s] + 2)
+
+    def token_weight(self, t):
+        """어절의 약한 정도: 오답/공개가 많고 느릴수록 크다 (처음 보는 어절 0.5)."""
+        miss = (self.t_errors[t] + 2 * self.t_reveals[t] + 1) / (self.t_attempts[t] + 2)
+        return miss * (1.0 + min(self.t_rt[t] / RT_SLOW_MS, 1.0))
+
+    def blank_count(self, verse, blank_num):
+        """모드1 빈칸 수. 0% / 100% 는 사용자가 고른 그대로 둔다."""
+        num_words = len(verse.words)
+        base = num_words * max(blank_num, 0) * 0.1
+        rate = self.error_rate(verse) if 0 < blank_num < 10 else None
+        if rate is not None:
+            # 잘 알수록(오답률이 낮을수록) 빈칸을 늘린다: 0.5 ~ 1.5 배
+            base *= 1.5 - rate
+        return max(0, min(int(base), num_words, len(verse.maskable)))
+
+    def pick_blanks(self, verse, k, rng):
+        """maskable 어절 중 k 개를 약한 어절 위주로 (중복 없이). 오름차순."""
+        maskable = verse.maskable
+        s = self.slot(verse, create=False)
+        if s is None or not k:
+            return sorted(rng.sample(maskable, k)) if k else []
+        with self._lock:
+            tree = self._tree(s, maskable)
+            saved = tree.tree[:]  # 뽑은 뒤 한 번에 되돌리려고 (노드 배열 복사 한 번)
+            values = tree.values
+            total = tree.total()
+            picked = []
+            taken = []
+            for _ in range(min(k, len(maskable))):
+                j = tree.find(rng.random() * total)
+                w = values[j]
+                if not w:
+                    # 누적 오차로 이미 뽑은 칸(가중치 0)을 가리키면 합을 다시 구해 한 번 더
+                    total = tree.total()
+                    if total > 0:
+                        j = tree.find(rng.random() * total)
+                        w = values[j]
+                    if not w:
+                        # 그래도 뽑은 칸이면 아직 안 뽑은 칸에서 고르게 (같은 빈칸이 두 번 나오지 않게)
+                        rest = [i for i, v in enumerate(values) if v]
+                        if not rest:
+                            break
+                        j = rng.choice(rest)
+                        w = values[j]
+                taken.append((j, w))
+                tree.set(j, 0.0)  # 뽑은 어절은 다시 나오지 않게
+                total -= w
+                picked.append(maskable[j])
+            tree.tree = saved
+            for j, w in taken:
+                values[j] = w
+        return sorted(picked)
+
+    def _tree(self, s, maskable):
+        hit = self._trees.get(s)
+        if hit is None:
+            base = self.token_base[s]
+            hit = self._trees[s] = (FenwickTree([self.token_weight(base + i) for i in maskable]),
+                                    {i: j for j, i in enumerate(maskable)})
+        return hit[0]
+
+    # ---- 저장 ----
+    def save(self, path):
+        meta = json.dumps({"lines": self.lines}, ensure_ascii=False).encode("utf-8")
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(meta)))
+            f.write(meta)
+            for name in _ARRAYS:
+                a = getattr(self, name)
+                f.write(struct.pack("<Q", len(a)))
+                a.tofile(f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """저장한 통계. 파일이 없거나 형식이 다르면 빈 통계."""
+        stats = cls()
+        try:
+            with open(path, "rb") as f:
+                magic, meta_len = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != MAGIC:
+                    return stats
+                lines = json.loads(f.read(meta_len).decode("utf-8"))["lines"]
+                for name in _ARRAYS:
+                    (n,) = struct.unpack("<Q", f.read(8))
+                    getattr(stats, name).fromfile(f, n)
+        except (OSError, ValueError, KeyError, EOFError, struct.error):
+            return cls()
+        stats.lines = lines
+        stats._slots = {line: i for i, line in enumerate(lines)}
+        return stats